@@ -1,6 +1,10 @@
 import tkinter as tk
 from tkinter import messagebox
-import numpy as np
+from matrix_operations import classify_rank
+from matrix_grid import MatrixGrid, MAX_MATRIX_SIZE
+from matrix_import import add_import_buttons, grid_to_float_array
+from rank_engine import RANK_MODES, rank as matrix_rank
+from sparse_matrix import SparseMatrix, is_sparse_enough, rank as sparse_rank
 
 
 # Check matrix properties
@@ -9,39 +13,35 @@ def check_matrix_properties():
         rows = int(row_entry.get())
         cols = int(col_entry.get())
 
-        # Build the matrix from user input
-        matrix = []
-        for i in range(rows):
-            row = []
-            for j in range(cols):
-                value = entries[i][j].get()
-                row.append(float(value))
-            matrix.append(row)
-
-        # Convert to numpy array
-        np_matrix = np.array(matrix)
-
-        # Calculate rank
-        rank = np.linalg.matrix_rank(np_matrix)
+        mode = rank_mode_var.get()
+        tolerance_text = tolerance_entry.get().strip()
+        tolerance = float(tolerance_text) if tolerance_text else None
+
+        if mode == "numeric":
+            # Build the matrix from user input (parsed in one vectorized pass)
+            np_matrix = grid_to_float_array(entries)
+            # Mostly-zero matrices by sparse elimination instead of an SVD, unless a tolerance is set
+            if tolerance is None and is_sparse_enough(np_matrix):
+                rank = sparse_rank(SparseMatrix.from_array(np_matrix, exact=False))
+                note = "numeric: sparse elimination"
+            else:
+                rank, note = matrix_rank(np_matrix, mode, tolerance)
+        else:
+            # Exact modes read the entries as fractions, never through floats
+            source = entries.unedited_source()
+            rank, note = matrix_rank(source if source is not None else entries.values(), mode, confirm=confirm_var.get())
 
         # Determine properties
-        if rank == cols and rank == rows:
-            result = "The matrix is both one-to-one and onto."
-        elif rank == cols:
-            result = "The matrix is one-to-one but not onto."
-        elif rank == rows:
-            result = "The matrix is onto but not one-to-one."
-        else:
-            result = "The matrix is neither one-to-one nor onto."
+        result = classify_rank(rank, rows, cols)
 
         # Display results
-        result_label.config(text=f"Rank = {rank}\n{result}")
+        result_label.config(text=f"Rank = {rank}\n{result}\n({note})")
 
     except Exception as e:
         messagebox.showerror("Error", f"Invalid input: {e}")
 
 
-def create_matrix_inputs():
+def create_matrix_inputs(array=None):
     for widget in matrix_frame.winfo_children():
         widget.destroy()
 
@@ -49,26 +49,16 @@ def create_matrix_inputs():
         rows = int(row_entry.get())
         cols = int(col_entry.get())
 
-        if rows > 10 or cols > 10:
-            messagebox.showerror("Error", "Maximum matrix size is 10x10!")
+        if rows > MAX_MATRIX_SIZE or cols > MAX_MATRIX_SIZE:
+            messagebox.showerror("Error", f"Maximum matrix size is {MAX_MATRIX_SIZE}x{MAX_MATRIX_SIZE}!")
             return
 
+        # Only the visible cells get widgets, so large matrices stay responsive
         global entries
-        entries = []
-        for i in range(rows):
-            row_entries = []
-            for j in range(cols):
-                entry = tk.Entry(matrix_frame, width=8, font=("Arial", 16), justify="center")
-                entry.grid(row=i, column=j, padx=10, pady=10)
-
-                # Bind arrow keys for navigation
-                entry.bind("<Up>", lambda e, x=i, y=j: navigate_to_cell(x - 1, y))
-                entry.bind("<Down>", lambda e, x=i, y=j: navigate_to_cell(x + 1, y))
-                entry.bind("<Left>", lambda e, x=i, y=j: navigate_to_cell(x, y - 1))
-                entry.bind("<Right>", lambda e, x=i, y=j: navigate_to_cell(x, y + 1))
-
-                row_entries.append(entry)
-            entries.append(row_entries)
+        entries = MatrixGrid(matrix_frame, rows, cols, navigate=navigate_to_cell)
+        entries.pack()
+        if array is not None:
+            entries.load(array)
     except ValueError:
         messagebox.showerror("Error", "Please enter valid numbers for rows and columns.")
 
@@ -79,6 +69,16 @@ def navigate_to_cell(row, col):
         target_cell.focus_set()
 
 
+# Function to fill the grid with a pasted or imported matrix
+def load_imported_matrix(array):
+    rows, cols = array.shape
+    row_entry.delete(0, tk.END)
+    row_entry.insert(0, str(rows))
+    col_entry.delete(0, tk.END)
+    col_entry.insert(0, str(cols))
+    create_matrix_inputs(array)
+
+
 # Main window
 root = tk.Tk()
 root.title("Matrix Properties Checker")
@@ -135,6 +135,34 @@ generate_button = tk.Button(
 )
 generate_button.grid(row=0, column=4, padx=20)
 
+# Buttons to paste or import a whole matrix at once
+add_import_buttons(size_frame, load_imported_matrix, bg="#2c3e50").grid(row=1, column=0, columnspan=5, pady=(10, 0))
+
+# Rank mode: modular and exact read the entries as fractions, numeric uses an SVD
+options_frame = tk.Frame(root, bg="#2c3e50")
+options_frame.pack()
+
+tk.Label(options_frame, text="Rank mode:", bg="#2c3e50", fg="white", font=("Arial", 14)).grid(row=0, column=0, padx=5)
+rank_mode_var = tk.StringVar(value="modular")
+tk.OptionMenu(options_frame, rank_mode_var, *RANK_MODES).grid(row=0, column=1, padx=5)
+
+# Singular values at or below the tolerance count as zero (numeric mode; blank for NumPy's default)
+tk.Label(options_frame, text="Tolerance:", bg="#2c3e50", fg="white", font=("Arial", 14)).grid(row=0, column=2, padx=5)
+tolerance_entry = tk.Entry(options_frame, width=10, font=("Arial", 14), justify="center")
+tolerance_entry.grid(row=0, column=3, padx=5)
+
+# Check a modular rank that is not certain by exact elimination
+confirm_var = tk.BooleanVar(value=False)
+tk.Checkbutton(
+    options_frame,
+    text="Confirm exactly",
+    variable=confirm_var,
+    bg="#2c3e50",
+    fg="white",
+    selectcolor="#34495e",
+    font=("Arial", 14),
+).grid(row=0, column=4, padx=5)
+
 # Matrix input frame
 matrix_frame = tk.Frame(root, bg="#34495e")
 matrix_frame.pack(pady=20)
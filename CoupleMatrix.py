@@ -1,7 +1,16 @@
 import tkinter as tk
 from tkinter import messagebox
 import numpy as np
-from fractions import Fraction
+from matrix_grid import MatrixGrid, MAX_MATRIX_SIZE
+from matrix_expression import evaluate_expression
+from matrix_import import add_import_buttons, grid_to_float_array
+from pair_operations import apply as apply_pair_operation, result_shape
+from rational_matrix import RationalMatrix
+from result_view import MatrixResultView
+
+
+# Result titles for the operation buttons
+OPERATION_TITLES = {"AxB": "A x B", "BxA": "B x A", "A+B": "A + B", "A-B": "A - B"}
 
 
 def clear_result_frame():
@@ -10,66 +19,101 @@ def clear_result_frame():
         widget.destroy()
 
 
-def display_matrix(matrix, title="Matrix"):
-    """Display a matrix neatly in the result frame."""
+def display_matrix(matrix, title="Matrix", note=None):
+    """Display a result in the result frame; only its visible part is drawn, however large it is."""
     clear_result_frame()
     tk.Label(result_frame, text=title, font=("Arial", 16, "bold"), bg="#34495e", fg="white").pack(pady=10)
-
-    matrix_frame = tk.Frame(result_frame, bg="#2c3e50")
-    matrix_frame.pack(pady=10)
-
-    for row in matrix:
-        row_text = "   ".join(map(str, row))
-        tk.Label(matrix_frame, text=row_text, font=("Courier", 14), bg="#2c3e50", fg="white").pack(anchor="w")
+    if note:
+        tk.Label(result_frame, text=note, font=("Arial", 12), bg="#34495e", fg="#bdc3c7", wraplength=450).pack()
+    MatrixResultView(result_frame, matrix).pack(pady=10)
 
 
-def parse_fraction(value):
-    """Convert a string into a fraction or float."""
-    try:
-        if "/" in value:
-            return float(Fraction(value))
-        return float(value)
-    except ValueError:
-        raise ValueError(f"Invalid input: '{value}' is not a valid number or fraction.")
+def read_matrix(entries):
+    """Convert the entries in a grid into a 2D array of floats in one vectorized pass."""
+    return grid_to_float_array(entries)
 
 
-def read_matrix(entries):
-    """Convert the entries in a grid into a 2D list of floats."""
-    rows = len(entries)
-    cols = len(entries[0])
-    return [[parse_fraction(entries[i][j].get()) for j in range(cols)] for i in range(rows)]
+def read_exact_matrix(entries):
+    """Read the entries in a grid (or its unedited import) as exact rationals."""
+    source = entries.unedited_source()
+    return RationalMatrix.from_values(source if source is not None else entries.values())
 
 
 def calculate_operation(operation):
     """Perform the selected operation between Matrix A and Matrix B."""
     try:
-        rows_a = int(row_a_entry.get())
-        cols_a = int(col_a_entry.get())
-        rows_b = int(row_b_entry.get())
-        cols_b = int(col_b_entry.get())
-
-        matrix_a = np.array(read_matrix(entries_a))
-        matrix_b = np.array(read_matrix(entries_b))
-
-        if operation == "AxB" and cols_a == rows_b:
-            result = np.dot(matrix_a, matrix_b)
-            display_matrix(result, title="A x B")
-        elif operation == "BxA" and cols_b == rows_a:
-            result = np.dot(matrix_b, matrix_a)
-            display_matrix(result, title="B x A")
-        elif operation == "A+B" and rows_a == rows_b and cols_a == cols_b:
-            result = matrix_a + matrix_b
-            display_matrix(result, title="A + B")
-        elif operation == "A-B" and rows_a == rows_b and cols_a == cols_b:
-            result = matrix_a - matrix_b
-            display_matrix(result, title="A - B")
+        # Exact mode works on integer numerators and shows reduced fractions
+        if exact_var.get():
+            matrix_a = read_exact_matrix(entries_a)
+            matrix_b = read_exact_matrix(entries_b)
         else:
-            messagebox.showerror("Error", "Matrix dimensions are not compatible for this operation!")
+            matrix_a = np.array(read_matrix(entries_a))
+            matrix_b = np.array(read_matrix(entries_b))
+
+        try:
+            result_shape(operation, matrix_a.shape, matrix_b.shape)
+        except ValueError as e:
+            messagebox.showerror("Error", str(e))
+            return
+
+        result = apply_pair_operation(operation, matrix_a, matrix_b)
+        remember_result(result)
+        display_matrix(result, title=OPERATION_TITLES[operation])
     except Exception as e:
         messagebox.showerror("Error", f"Invalid input: {e}")
 
 
-def create_matrix_inputs():
+def convert_mode(value, exact):
+    """Convert a saved result to exact rationals or floats to match the current mode."""
+    if exact and not isinstance(value, RationalMatrix):
+        return RationalMatrix.from_values(value)
+    if not exact and isinstance(value, RationalMatrix):
+        return np.array(value.to_fractions(), dtype=np.float64)
+    return value
+
+
+def remember_result(result):
+    """Keep the latest result so it can be saved under a name for expressions."""
+    global last_result
+    last_result = result
+
+
+def calculate_expression():
+    """Evaluate the expression over A, B and the saved results, in the cheapest order."""
+    text = expression_entry.get().strip()
+    try:
+        exact = exact_var.get()
+        values = {name: convert_mode(value, exact) for name, value in saved_matrices.items()}
+        for name, entries in (("A", entries_a), ("B", entries_b)):
+            if entries is not None:
+                values[name] = read_exact_matrix(entries) if exact else np.array(read_matrix(entries))
+        result, note = evaluate_expression(text, values)
+    except ValueError as e:
+        messagebox.showerror("Error", str(e))
+        return
+    except Exception as e:
+        messagebox.showerror("Error", f"Invalid input: {e}")
+        return
+    remember_result(result)
+    display_matrix(result, title=text, note=note)
+
+
+def save_result():
+    """Save the latest result under a new name, for use in expressions."""
+    name = save_entry.get().strip()
+    if last_result is None:
+        messagebox.showerror("Error", "Calculate a result first!")
+        return
+    if not name.isidentifier() or name in ("A", "B"):
+        messagebox.showerror("Error", "Choose a name of letters, digits and _ other than A and B.")
+        return
+    saved_matrices[name] = last_result
+    saved_label.config(text="Saved: " + ", ".join(
+        f"{key} ({value.shape[0]}x{value.shape[1]})" for key, value in saved_matrices.items()
+    ))
+
+
+def create_matrix_inputs(array_a=None, array_b=None):
     """Create input fields for Matrix A and Matrix B."""
     for widget in matrix_frame.winfo_children():
         widget.destroy()
@@ -80,37 +124,63 @@ def create_matrix_inputs():
         rows_b = int(row_b_entry.get())
         cols_b = int(col_b_entry.get())
 
-        if rows_a > 10 or cols_a > 10 or rows_b > 10 or cols_b > 10:
-            messagebox.showerror("Error", "Maximum matrix size is 10x10!")
+        if max(rows_a, cols_a, rows_b, cols_b) > MAX_MATRIX_SIZE:
+            messagebox.showerror("Error", f"Maximum matrix size is {MAX_MATRIX_SIZE}x{MAX_MATRIX_SIZE}!")
             return
 
         # Create input fields for Matrix A
         global entries_a
-        tk.Label(matrix_frame, text="Matrix A", bg="#34495e", fg="white", font=("Arial", 16, "bold")).grid(row=0, column=0, columnspan=cols_a, pady=5)
-        entries_a = []
-        for i in range(rows_a):
-            row_entries = []
-            for j in range(cols_a):
-                entry = tk.Entry(matrix_frame, width=8, font=("Arial", 16), justify="center")
-                entry.grid(row=i + 1, column=j, padx=5, pady=5)
-                row_entries.append(entry)
-            entries_a.append(row_entries)
+        tk.Label(matrix_frame, text="Matrix A", bg="#34495e", fg="white", font=("Arial", 16, "bold")).grid(row=0, column=0, pady=5)
+        entries_a = MatrixGrid(matrix_frame, rows_a, cols_a, pad=10, bg="#2c3e50")
+        entries_a.grid(row=1, column=0)
+        if array_a is not None:
+            entries_a.load(array_a)
 
         # Create input fields for Matrix B
         global entries_b
-        tk.Label(matrix_frame, text="Matrix B", bg="#34495e", fg="white", font=("Arial", 16, "bold")).grid(row=rows_a + 1, column=0, columnspan=cols_b, pady=5)
-        entries_b = []
-        for i in range(rows_b):
-            row_entries = []
-            for j in range(cols_b):
-                entry = tk.Entry(matrix_frame, width=8, font=("Arial", 16), justify="center")
-                entry.grid(row=i + rows_a + 2, column=j, padx=5, pady=5)
-                row_entries.append(entry)
-            entries_b.append(row_entries)
+        tk.Label(matrix_frame, text="Matrix B", bg="#34495e", fg="white", font=("Arial", 16, "bold")).grid(row=2, column=0, pady=5)
+        entries_b = MatrixGrid(matrix_frame, rows_b, cols_b, pad=10, bg="#2c3e50")
+        entries_b.grid(row=3, column=0)
+        if array_b is not None:
+            entries_b.load(array_b)
     except ValueError:
         messagebox.showerror("Error", "Please enter valid numbers for rows and columns.")
 
 
+def current_values(grid, row_widget, col_widget):
+    """Return what is in an existing grid if its size fields still match it, else None."""
+    if grid is None or (row_widget.get().strip(), col_widget.get().strip()) != (str(grid.rows), str(grid.cols)):
+        return None
+    source = grid.unedited_source()
+    return source if source is not None else grid.values()
+
+
+def load_imported_matrix(array, name):
+    """Fill Matrix A or B with a pasted or imported matrix, keeping the other one."""
+    rows, cols = array.shape
+    row_widget, col_widget = (row_a_entry, col_a_entry) if name == "A" else (row_b_entry, col_b_entry)
+    row_widget.delete(0, tk.END)
+    row_widget.insert(0, str(rows))
+    col_widget.delete(0, tk.END)
+    col_widget.insert(0, str(cols))
+
+    # Keep what is already in the other matrix when both grids are rebuilt
+    values_a = current_values(entries_a, row_a_entry, col_a_entry)
+    values_b = current_values(entries_b, row_b_entry, col_b_entry)
+    if name == "A":
+        create_matrix_inputs(array_a=array, array_b=values_b)
+    else:
+        create_matrix_inputs(array_a=values_a, array_b=array)
+
+
+# Input grids, created by create_matrix_inputs
+entries_a = None
+entries_b = None
+
+# Results saved under a name for expressions, and the latest result
+saved_matrices = {}
+last_result = None
+
 # Main window
 root = tk.Tk()
 root.title("Matrix Operations Calculator")
@@ -147,6 +217,10 @@ col_b_entry.grid(row=3, column=3, padx=5)
 
 tk.Button(size_frame, text="Generate Matrices", command=create_matrix_inputs, bg="#16a085", font=("Arial", 14)).grid(row=5, column=0, columnspan=4, pady=10)
 
+# Buttons to paste or import Matrix A and Matrix B
+add_import_buttons(size_frame, lambda array: load_imported_matrix(array, "A")).grid(row=0, column=4, padx=5)
+add_import_buttons(size_frame, lambda array: load_imported_matrix(array, "B")).grid(row=3, column=4, padx=5)
+
 # Left frame for buttons
 button_frame = tk.Frame(root, bg="#34495e")
 button_frame.pack(side="left", padx=20, pady=10)
@@ -161,6 +235,35 @@ operations = [
 for text, command in operations:
     tk.Button(button_frame, text=text, command=command, bg="#3498db", font=("Arial", 14), width=15).pack(pady=10)
 
+# Exact mode: rational arithmetic on integer numerators instead of float64
+exact_var = tk.BooleanVar(value=False)
+tk.Checkbutton(
+    button_frame,
+    text="Exact fractions",
+    variable=exact_var,
+    bg="#34495e",
+    fg="white",
+    selectcolor="#2c3e50",
+    font=("Arial", 14),
+).pack(pady=10)
+
+# Expression over A, B and the saved results, e.g. (A*B + C)^T * B
+tk.Label(button_frame, text="Expression:", bg="#34495e", fg="white", font=("Arial", 14)).pack(pady=(10, 0))
+expression_entry = tk.Entry(button_frame, width=18, font=("Arial", 14))
+expression_entry.pack(pady=5)
+expression_entry.bind("<Return>", lambda event: calculate_expression())
+tk.Button(button_frame, text="Evaluate", command=calculate_expression, bg="#3498db", font=("Arial", 14), width=15).pack(pady=5)
+
+# Save the latest result under a name
+save_frame = tk.Frame(button_frame, bg="#34495e")
+save_frame.pack(pady=5)
+tk.Label(save_frame, text="Save as:", bg="#34495e", fg="white", font=("Arial", 12)).pack(side="left")
+save_entry = tk.Entry(save_frame, width=5, font=("Arial", 12))
+save_entry.pack(side="left", padx=5)
+tk.Button(save_frame, text="Save", command=save_result, bg="#16a085", font=("Arial", 12)).pack(side="left")
+saved_label = tk.Label(button_frame, text="", bg="#34495e", fg="#bdc3c7", font=("Arial", 11), wraplength=200)
+saved_label.pack(pady=5)
+
 # Matrix input frame
 matrix_frame = tk.Frame(root, bg="#2c3e50")
 matrix_frame.pack(pady=20, side="left")
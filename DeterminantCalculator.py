@@ -1,6 +1,12 @@
 import tkinter as tk
 from tkinter import messagebox
-import sympy as sp
+from lazy_import import LazyModule, warm_up
+from matrix_grid import MatrixGrid, MAX_MATRIX_SIZE
+from matrix_import import add_import_buttons
+from matrix_structure import analyze, determinant as structured_determinant
+
+# sympy is imported on first use and warmed up in the background once the window is shown
+sp = LazyModule("sympy")
 
 # Function to calculate determinant
 def calculate_determinant():
@@ -22,18 +28,20 @@ def calculate_determinant():
                 row.append(sp.Rational(value))  # Parse input as fraction
             matrix.append(row)
 
-        # Convert to sympy Matrix and calculate determinant
-        sympy_matrix = sp.Matrix(matrix)
-        determinant = sympy_matrix.det()
+        # Use an O(n) or O(n^2) kernel for structured matrices, else sympy's dense determinant
+        structure = analyze(matrix)
+        determinant = structured_determinant(matrix, structure, dense=lambda block: sp.Matrix(block).det())
+        if determinant is None:
+            determinant = sp.Matrix(matrix).det()
 
         # Display the result
-        result_label.config(text=f"Determinant = {determinant}")
+        result_label.config(text=f"Determinant = {determinant}\nStructure: {structure}")
     except Exception as e:
         messagebox.showerror("Error", f"Invalid input: {e}")
 
 
 # Function to create matrix inputs
-def create_matrix_inputs():
+def create_matrix_inputs(array=None):
     # Clear any previous inputs
     for widget in matrix_frame.winfo_children():
         widget.destroy()
@@ -43,29 +51,19 @@ def create_matrix_inputs():
         cols = int(col_entry.get())
 
         # Ensure the matrix is square and size is reasonable
-        if rows > 10 or cols > 10:
-            messagebox.showerror("Error", "Maximum matrix size is 10x10!")
+        if rows > MAX_MATRIX_SIZE or cols > MAX_MATRIX_SIZE:
+            messagebox.showerror("Error", f"Maximum matrix size is {MAX_MATRIX_SIZE}x{MAX_MATRIX_SIZE}!")
             return
         if rows != cols:
             messagebox.showerror("Error", "Matrix must be square!")
             return
 
+        # Only the visible cells get widgets, so large matrices stay responsive
         global entries
-        entries = []
-        for i in range(rows):
-            row_entries = []
-            for j in range(cols):
-                entry = tk.Entry(matrix_frame, width=8, font=("Arial", 16), justify="center")
-                entry.grid(row=i, column=j, padx=10, pady=10)
-
-                # Bind arrow keys for navigation
-                entry.bind("<Up>", lambda e, x=i, y=j: navigate_to_cell(x - 1, y))
-                entry.bind("<Down>", lambda e, x=i, y=j: navigate_to_cell(x + 1, y))
-                entry.bind("<Left>", lambda e, x=i, y=j: navigate_to_cell(x, y - 1))
-                entry.bind("<Right>", lambda e, x=i, y=j: navigate_to_cell(x, y + 1))
-
-                row_entries.append(entry)
-            entries.append(row_entries)
+        entries = MatrixGrid(matrix_frame, rows, cols, navigate=navigate_to_cell)
+        entries.pack()
+        if array is not None:
+            entries.load(array)
     except ValueError:
         messagebox.showerror("Error", "Please enter valid numbers for rows and columns.")
 
@@ -77,6 +75,16 @@ def navigate_to_cell(row, col):
         target_cell.focus_set()
 
 
+# Function to fill the grid with a pasted or imported matrix
+def load_imported_matrix(array):
+    rows, cols = array.shape
+    row_entry.delete(0, tk.END)
+    row_entry.insert(0, str(rows))
+    col_entry.delete(0, tk.END)
+    col_entry.insert(0, str(cols))
+    create_matrix_inputs(array)
+
+
 # Main window
 root = tk.Tk()
 root.title("Determinant Calculator")
@@ -133,6 +141,9 @@ generate_button = tk.Button(
 )
 generate_button.grid(row=0, column=4, padx=20)
 
+# Buttons to paste or import a whole matrix at once
+add_import_buttons(size_frame, load_imported_matrix, bg="#2c3e50").grid(row=1, column=0, columnspan=5, pady=(10, 0))
+
 # Frame for matrix input
 matrix_frame = tk.Frame(root, bg="#34495e")  # Slightly lighter gray-blue
 matrix_frame.pack(pady=20)
@@ -156,5 +167,8 @@ calculate_button.pack(pady=20)
 result_label = tk.Label(root, text="Determinant: ", bg="#2c3e50", fg="white", font=("Arial", 18, "bold"))
 result_label.pack(pady=20)
 
+# Load sympy while the user types in the first matrix
+warm_up(root, sp)
+
 # Run the application
 root.mainloop()
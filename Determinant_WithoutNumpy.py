@@ -1,6 +1,10 @@
 import tkinter as tk
 from tkinter import messagebox
 from fractions import Fraction
+from determinant_engine import determinant, LAPLACE_MAX_SIZE
+from matrix_grid import MatrixGrid, MAX_MATRIX_SIZE
+from matrix_import import add_import_buttons
+from matrix_structure import analyze, determinant as structured_determinant
 
 def calculate_determinant():
     try:
@@ -21,39 +25,23 @@ def calculate_determinant():
                 row.append(Fraction(value))  # Parse input as a fraction
             matrix.append(row)
 
-        # Calculate determinant using custom recursive method
-        determinant = determinant_recursive(matrix)
+        # Calculate determinant using Laplace expansion (teaching mode) or Bareiss elimination,
+        # with an O(n) or O(n^2) kernel for structured matrices outside teaching mode
+        structure = analyze(matrix)
+        if laplace_var.get():
+            result = determinant(matrix, method="laplace")
+        else:
+            result = structured_determinant(matrix, structure, dense=determinant)
+            if result is None:
+                result = determinant(matrix, method="bareiss")
 
         # Display the result as an exact fraction
-        result_label.config(text=f"Determinant = {determinant}")
+        result_label.config(text=f"Determinant = {result}\nStructure: {structure}")
     except Exception as e:
         messagebox.showerror("Error", f"Invalid input: {e}")
 
 
-def determinant_recursive(matrix):
-    """Calculate determinant recursively using Laplace expansion."""
-    size = len(matrix)
-
-    # Base case: 1x1 matrix
-    if size == 1:
-        return matrix[0][0]
-
-    # Base case: 2x2 matrix
-    if size == 2:
-        return matrix[0][0] * matrix[1][1] - matrix[0][1] * matrix[1][0]
-
-    # Recursive case
-    det = Fraction(0)
-    for col in range(size):
-        # Minor matrix
-        minor = [row[:col] + row[col+1:] for row in matrix[1:]]
-        # Laplace expansion
-        det += ((-1) ** col) * matrix[0][col] * determinant_recursive(minor)
-
-    return det
-
-
-def create_matrix_inputs():
+def create_matrix_inputs(array=None):
     # Clear any previous inputs
     for widget in matrix_frame.winfo_children():
         widget.destroy()
@@ -62,31 +50,21 @@ def create_matrix_inputs():
         rows = int(row_entry.get())
         cols = int(col_entry.get())
 
-        # Ensure matrix dimensions do not exceed 10x10
-        if rows > 10 or cols > 10:
-            messagebox.showerror("Error", "Maximum matrix size is 10x10!")
+        # Ensure matrix dimensions do not exceed the grid limit
+        if rows > MAX_MATRIX_SIZE or cols > MAX_MATRIX_SIZE:
+            messagebox.showerror("Error", f"Maximum matrix size is {MAX_MATRIX_SIZE}x{MAX_MATRIX_SIZE}!")
             return
         # Make sure the matrix is square
         if rows != cols:
             messagebox.showerror("Error", "Matrix must be square!")
             return
 
+        # Only the visible cells get widgets, so large matrices stay responsive
         global entries
-        entries = []
-        for i in range(rows):
-            row_entries = []
-            for j in range(cols):
-                entry = tk.Entry(matrix_frame, width=8, font=("Arial", 16), justify="center")
-                entry.grid(row=i, column=j, padx=10, pady=10)
-
-                # Bind arrow keys for navigation
-                entry.bind("<Up>", lambda e, x=i, y=j: navigate_to_cell(x - 1, y))
-                entry.bind("<Down>", lambda e, x=i, y=j: navigate_to_cell(x + 1, y))
-                entry.bind("<Left>", lambda e, x=i, y=j: navigate_to_cell(x, y - 1))
-                entry.bind("<Right>", lambda e, x=i, y=j: navigate_to_cell(x, y + 1))
-
-                row_entries.append(entry)
-            entries.append(row_entries)
+        entries = MatrixGrid(matrix_frame, rows, cols, navigate=navigate_to_cell)
+        entries.pack()
+        if array is not None:
+            entries.load(array)
     except ValueError:
         messagebox.showerror("Error", "Please enter valid numbers for rows and columns.")
 
@@ -98,6 +76,16 @@ def navigate_to_cell(row, col):
         target_cell.focus_set()
 
 
+# Function to fill the grid with a pasted or imported matrix
+def load_imported_matrix(array):
+    rows, cols = array.shape
+    row_entry.delete(0, tk.END)
+    row_entry.insert(0, str(rows))
+    col_entry.delete(0, tk.END)
+    col_entry.insert(0, str(cols))
+    create_matrix_inputs(array)
+
+
 # Main window
 root = tk.Tk()
 root.title("Determinant Calculator")
@@ -122,7 +110,7 @@ welcome_label.pack(pady=10)
 # Subtitle
 subtitle_label = tk.Label(
     top_frame,
-    text="Using Laplace Expansion",
+    text="Using Laplace Expansion or Bareiss Elimination",
     bg="#1abc9c",
     fg="black",
     font=("Arial", 20, "italic"),
@@ -155,10 +143,26 @@ generate_button = tk.Button(
 )
 generate_button.grid(row=0, column=4, padx=20)
 
+# Buttons to paste or import a whole matrix at once
+add_import_buttons(size_frame, load_imported_matrix, bg="#2c3e50").grid(row=1, column=0, columnspan=5, pady=(10, 0))
+
 # Frame for matrix input
 matrix_frame = tk.Frame(root, bg="#34495e")  # Slightly lighter gray-blue
 matrix_frame.pack(pady=20)
 
+# Teaching mode: use the Laplace expansion for small matrices
+laplace_var = tk.BooleanVar(value=False)
+laplace_check = tk.Checkbutton(
+    root,
+    text=f"Use Laplace Expansion (up to {LAPLACE_MAX_SIZE}x{LAPLACE_MAX_SIZE})",
+    variable=laplace_var,
+    bg="#2c3e50",
+    fg="white",
+    selectcolor="#34495e",
+    font=("Arial", 14),
+)
+laplace_check.pack()
+
 # Button to calculate determinant
 calculate_button = tk.Button(
     root,
@@ -1,16 +1,27 @@
+import os
+import re
+import time
 import tkinter as tk
-from tkinter import messagebox
-import sympy as sp
-import  numpy as np
-from sympy import Matrix
+from tkinter import filedialog, messagebox
+from compute_worker import BackgroundWorker, JobCancelled
+from instrumentation import OperationTrace, TraceLog, default_trace_dir
+from lazy_import import LazyModule, WARM_UP_DELAY_MS, warm_up
+from matrix_grid import MatrixGrid, MAX_MATRIX_SIZE
+from matrix_import import add_import_buttons
+from numeric_backend import BACKEND_MODES, format_number
+from result_view import MatrixResultView
 
+# sympy and the operations (which load sympy and NumPy) are imported on first use, so the
+# window opens at once; they are warmed up in the background after it is shown
+sp = LazyModule("sympy")
+dynamic_operations = LazyModule("dynamic_operations")
 
-# Function to parse input as float or fraction
-def parse_input(value):
-    try:
-        return sp.Rational(value)  # Use sympy's Rational for precise fraction handling
-    except ValueError:
-        raise ValueError(f"Invalid input: {value}")
+
+# Pause in typing before edited cells are applied in live mode
+LIVE_DEBOUNCE_MS = 300
+
+# Up to this many eigenvalues are drawn in pretty notation; more go into a scrollable view
+MAX_PRETTY_RESULTS = 10
 
 
 # Function to clear the previous result display
@@ -19,6 +30,104 @@ def clear_result_frame():
         widget.destroy()
 
 
+# Function to read the matrix grid, checking it matches the size fields
+def read_grid(grid, rows, cols):
+    global read_seconds
+    if (grid.rows, grid.cols) != (rows, cols):
+        raise ValueError("The matrix size changed; click Generate Matrix again.")
+    start = time.perf_counter()
+    # An unedited import goes to the worker as its array, not as n^2 formatted strings
+    source = grid.unedited_source()
+    values = source if hasattr(source, "dtype") else grid.values()
+    # Reported as the "read" phase of the operation this grid is sent to
+    read_seconds += time.perf_counter() - start
+    return values
+
+
+# Function to read the optional time budget in seconds
+def read_time_budget():
+    value = budget_entry.get().strip()
+    if not value:
+        return None
+    budget = float(value)
+    if budget <= 0:
+        raise ValueError("The time limit must be positive!")
+    return budget
+
+
+# Function to show an error from a background job
+def show_error(e):
+    if isinstance(e, JobCancelled):
+        return  # The status bar already says why the job stopped
+    if isinstance(e, dynamic_operations.OperationError):
+        messagebox.showerror("Error", str(e))
+    else:
+        messagebox.showerror("Error", f"Invalid input: {e}")
+
+
+# Function to run a computation on the background worker and display its result
+def run_in_background(label, function, args, show_result, on_error=show_error):
+    global read_seconds
+    # Phase timings, peak memory and matrix size of this operation, for the status bar and trace
+    trace = OperationTrace(label, args[0] if args else None)
+    trace.add("read", read_seconds)
+    read_seconds = 0.0
+    profile_path = None
+    if profile_var.get():
+        name = re.sub(r"\W+", "_", label).strip("_")
+        profile_path = os.path.join(default_trace_dir(), f"{name}-{time.strftime('%Y%m%d-%H%M%S')}.prof")
+
+    def done(result):
+        trace.note_result(result)
+        with trace.phase("render"):
+            show_result(result)
+            # Geometry is computed when idle, so include it in the render time
+            result_frame.update_idletasks()
+        finish_trace(trace)
+
+    def failed(e):
+        trace.status = "cancelled" if isinstance(e, JobCancelled) else "failed"
+        finish_trace(trace)
+        on_error(e)
+
+    worker.submit(
+        label, function, args, on_done=done, on_error=failed, time_budget=read_time_budget(),
+        on_stats=trace.merge, trace_memory=memory_var.get(), profile_path=profile_path,
+    )
+
+
+# Function to show an operation's timings in the status bar and keep them for export
+def finish_trace(trace):
+    status_label.config(text=trace.summary())
+    try:
+        trace_log.append(trace)
+    except OSError as e:
+        messagebox.showerror("Error", f"Could not write the trace file: {e}")
+
+
+# Function to save the recorded operation traces as JSONL
+def export_trace():
+    path = filedialog.asksaveasfilename(defaultextension=".jsonl", filetypes=[("JSON Lines", "*.jsonl"), ("All files", "*.*")])
+    if not path:
+        return
+    try:
+        count = trace_log.export(path)
+    except OSError as e:
+        messagebox.showerror("Error", f"Could not write the trace file: {e}")
+        return
+    status_label.config(text=f"Exported {count} operation traces to {path}")
+
+
+# Function to display a result matrix; only its visible part is drawn, however large it is
+def show_matrix(matrix, font=("Courier", 14)):
+    MatrixResultView(result_frame, matrix, font=font).pack(pady=5)
+
+
+# Function to show which backend produced a result and why
+def show_backend(note):
+    tk.Label(result_frame, text=f"Backend: {note}", font=("Arial", 12), fg="#7f8c8d").pack(pady=(5, 0))
+
+
 # Function to calculate determinant
 def calculate_determinant():
     try:
@@ -29,23 +138,23 @@ def calculate_determinant():
             messagebox.showerror("Error", "Determinant is only defined for square matrices!")
             return
 
-        matrix = []
-        for i in range(rows):
-            row = []
-            for j in range(cols):
-                value = entries[i][j].get()
-                row.append(parse_input(value))
-            matrix.append(row)
+        run_in_background(
+            "Determinant", dynamic_operations.determinant, (read_grid(entries, rows, cols), backend_var.get()), show_determinant
+        )
+    except Exception as e:
+        messagebox.showerror("Error", f"Invalid input: {e}")
 
-        sympy_matrix = sp.Matrix(matrix)
-        determinant = sympy_matrix.det()
 
-        clear_result_frame()
+def show_determinant(result):
+    determinant, note = result
+    clear_result_frame()
+    if isinstance(determinant, (float, str)):
+        result_text = f"Determinant = {format_number(determinant)}"
+    else:
         result_text = f"Determinant = {determinant}" if determinant % 1 else f"Determinant = {int(determinant)}"
-        result_label = tk.Label(result_frame, text=result_text, font=("Arial", 16, "bold"))
-        result_label.pack()
-    except Exception as e:
-        messagebox.showerror("Error", f"Invalid input: {e}")
+    result_label = tk.Label(result_frame, text=result_text, font=("Arial", 16, "bold"))
+    result_label.pack()
+    show_backend(note)
 
 
 # Function to calculate RREF
@@ -54,27 +163,20 @@ def calculate_rref():
         rows = int(row_entry.get())
         cols = int(col_entry.get())
 
-        matrix = []
-        for i in range(rows):
-            row = []
-            for j in range(cols):
-                value = entries[i][j].get()
-                row.append(parse_input(value))
-            matrix.append(row)
-
-        sympy_matrix = sp.Matrix(matrix)
-        rref_matrix, _ = sympy_matrix.rref()
-
-        clear_result_frame()
-        tk.Label(result_frame, text="RREF:", font=("Arial", 16, "bold")).pack()
-        for i in range(rref_matrix.rows):
-            row_text = "   ".join(map(str, rref_matrix.row(i)))
-            row_label = tk.Label(result_frame, text=row_text, font=("Arial", 16))
-            row_label.pack()
+        run_in_background("RREF", dynamic_operations.rref, (read_grid(entries, rows, cols), backend_var.get()), show_rref)
     except Exception as e:
         messagebox.showerror("Error", f"Invalid input: {e}")
 
 
+def show_rref(result):
+    (rref_matrix, rank), note = result
+    clear_result_frame()
+    tk.Label(result_frame, text="RREF:", font=("Arial", 16, "bold")).pack()
+    show_matrix(rref_matrix)
+    tk.Label(result_frame, text=f"Rank = {rank}", font=("Arial", 16, "bold")).pack(pady=(5, 0))
+    show_backend(note)
+
+
 # Function to calculate inverse matrix
 def calculate_inverse():
     try:
@@ -85,58 +187,126 @@ def calculate_inverse():
             messagebox.showerror("Error", "Inverse is only defined for square matrices!")
             return
 
-        matrix = []
-        for i in range(rows):
-            row = []
-            for j in range(cols):
-                value = entries[i][j].get()
-                row.append(parse_input(value))
-            matrix.append(row)
-
-        sympy_matrix = sp.Matrix(matrix)
-        inverse_matrix = sympy_matrix.inv()
-
-        clear_result_frame()
-        tk.Label(result_frame, text="Inverse Matrix:", font=("Arial", 16, "bold")).pack()
-        for i in range(inverse_matrix.rows):
-            row_text = "   ".join(map(str, inverse_matrix.row(i)))
-            row_label = tk.Label(result_frame, text=row_text, font=("Arial", 16))
-            row_label.pack()
-    except sp.MatrixError:
-        messagebox.showerror("Error", "Matrix is singular and not invertible!")
+        run_in_background("Inverse", dynamic_operations.inverse, (read_grid(entries, rows, cols), backend_var.get()), show_inverse)
     except Exception as e:
         messagebox.showerror("Error", f"Invalid input: {e}")
 
 
+def show_inverse(result):
+    inverse_matrix, note = result
+    clear_result_frame()
+    tk.Label(result_frame, text="Inverse Matrix:", font=("Arial", 16, "bold")).pack()
+    show_matrix(inverse_matrix)
+    show_backend(note)
+
+
 # Function to calculate transpose
 def calculate_transpose():
     try:
         rows = int(row_entry.get())
         cols = int(col_entry.get())
 
-        matrix = []
-        for i in range(rows):
-            row = []
-            for j in range(cols):
-                value = entries[i][j].get()
-                row.append(parse_input(value))
-            matrix.append(row)
-
-        sympy_matrix = sp.Matrix(matrix)
-        transpose_matrix = sympy_matrix.T
-
-        clear_result_frame()
-        tk.Label(result_frame, text="Transpose Matrix:", font=("Arial", 16, "bold")).pack()
-        for i in range(transpose_matrix.rows):
-            row_text = "   ".join(map(str, transpose_matrix.row(i)))
-            row_label = tk.Label(result_frame, text=row_text, font=("Arial", 16))
-            row_label.pack()
+        run_in_background("Transpose", dynamic_operations.transpose, (read_grid(entries, rows, cols),), show_transpose)
     except Exception as e:
         messagebox.showerror("Error", f"Invalid input: {e}")
 
 
+def show_transpose(transpose_matrix):
+    clear_result_frame()
+    tk.Label(result_frame, text="Transpose Matrix:", font=("Arial", 16, "bold")).pack()
+    show_matrix(transpose_matrix)
+
+
+# Function to factor the whole grid for live mode on the background worker
+def start_live_factorization():
+    global live_state, live_factoring
+    live_state = None
+    live_dirty.clear()
+    try:
+        rows = int(row_entry.get())
+        cols = int(col_entry.get())
+        live_factoring = True
+        run_in_background(
+            "Live", dynamic_operations.live_matrix, (read_grid(entries, rows, cols), backend_var.get()),
+            show_live_factorization, on_error=stop_live
+        )
+    except Exception as e:
+        stop_live(e)
+
+
+def show_live_factorization(result):
+    global live_state, live_note, live_factoring
+    live_factoring = False
+    live_state, live_note = result
+    # Cells edited while the factorization ran are applied as updates now
+    if live_dirty:
+        apply_live_edits()
+    else:
+        show_live()
+
+
+def stop_live(e):
+    global live_state, live_factoring
+    live_factoring = False
+    live_state = None
+    live_var.set(False)
+    show_error(e)
+
+
+# Function to switch live mode on or off
+def toggle_live():
+    global live_state
+    if live_var.get() and entries is not None:
+        start_live_factorization()
+    else:
+        live_state = None
+
+
+# Function to note an edited cell and apply the edits once typing pauses
+def on_cell_edit(row, col):
+    global live_timer
+    if not live_var.get():
+        return
+    live_dirty.add((row, col))
+    if live_timer is not None:
+        root.after_cancel(live_timer)
+    live_timer = root.after(LIVE_DEBOUNCE_MS, apply_live_edits)
+
+
+# Function to apply edited cells to the live factorization as rank-one updates
+def apply_live_edits():
+    global live_timer
+    live_timer = None
+    if live_state is None or live_factoring:
+        return  # The edits are applied when the running factorization arrives
+    for row, col in sorted(live_dirty):
+        try:
+            value = live_state.parse(entries.get(row, col))
+        except ValueError:
+            continue  # Still being typed; it stays pending
+        live_dirty.discard((row, col))
+        if not live_state.update(row, col, value):
+            start_live_factorization()
+            return
+    show_live()
+
+
+def show_live():
+    clear_result_frame()
+    lines = [f"Rank = {live_state.rank}"]
+    if live_state.square:
+        lines.insert(0, f"Determinant = {format_number(live_state.determinant)}")
+    tk.Label(result_frame, text="\n".join(lines), font=("Arial", 16, "bold")).pack()
+    if live_state.inverse is not None:
+        tk.Label(result_frame, text="Inverse Matrix:", font=("Arial", 16, "bold")).pack(pady=(5, 0))
+        show_matrix(live_state.inverse)
+    elif live_state.square:
+        tk.Label(result_frame, text="Matrix is singular and not invertible!", font=("Arial", 16)).pack(pady=(5, 0))
+    show_backend(f"{live_note}; live, {live_state.updates} rank-one updates since the last factorization")
+
+
 # Function to create matrix inputs
-def create_matrix_inputs():
+def create_matrix_inputs(array=None):
     for widget in matrix_frame.winfo_children():
         widget.destroy()
 
@@ -144,19 +314,18 @@ def create_matrix_inputs():
         rows = int(row_entry.get())
         cols = int(col_entry.get())
 
-        if rows > 10 or cols > 10:
-            messagebox.showerror("Error", "Maximum matrix size is 10x10!")
+        if rows > MAX_MATRIX_SIZE or cols > MAX_MATRIX_SIZE:
+            messagebox.showerror("Error", f"Maximum matrix size is {MAX_MATRIX_SIZE}x{MAX_MATRIX_SIZE}!")
             return
 
+        # Only the visible cells get widgets, so large matrices stay responsive
         global entries
-        entries = []
-        for i in range(rows):
-            row_entries = []
-            for j in range(cols):
-                entry = tk.Entry(matrix_frame, width=8, font=("Arial", 16), justify="center")
-                entry.grid(row=i, column=j, padx=10, pady=10)
-                row_entries.append(entry)
-            entries.append(row_entries)
+        entries = MatrixGrid(matrix_frame, rows, cols, on_edit=on_cell_edit)
+        entries.pack()
+        if array is not None:
+            entries.load(array)
+        if live_var.get():
+            start_live_factorization()
     except ValueError:
         messagebox.showerror("Error", "Please enter valid numbers for rows and columns.")
 
@@ -170,27 +339,31 @@ def calculate_eigenvalues():
             messagebox.showerror("Error", "Eigenvalues are only defined for square matrices!")
             return
 
-        # Build the matrix from user input
-        matrix = []
-        for i in range(rows):
-            row = []
-            for j in range(cols):
-                value = entries[i][j].get()
-                row.append(parse_input(value))
-            matrix.append(row)
+        run_in_background(
+            "Eigenvalues", dynamic_operations.eigenvalues, (read_grid(entries, rows, cols), backend_var.get()), show_eigenvalues
+        )
+    except Exception as e:
+        messagebox.showerror("Error", f"Invalid input: {e}")
 
-        sympy_matrix = sp.Matrix(matrix)
-        eigenvalues = sympy_matrix.eigenvals().keys()  # Get eigenvalues only
 
-        clear_result_frame()
-        tk.Label(result_frame, text="Eigenvalues:", font=("Arial", 16, "bold")).pack()
+def show_eigenvalues(result):
+    eigenvalues, note = result
+    clear_result_frame()
+    tk.Label(result_frame, text="Eigenvalues:", font=("Arial", 16, "bold")).pack()
 
-        for eigenval in eigenvalues:
-            # Format each eigenvalue using pretty notation
+    if len(eigenvalues) > MAX_PRETTY_RESULTS:
+        show_matrix([[value] for value in eigenvalues])
+        show_backend(note)
+        return
+    for eigenval in eigenvalues:
+        # Format each eigenvalue using pretty notation (float64 results as plain numbers)
+        if isinstance(eigenval, (float, complex)):
+            pretty_value = format_number(eigenval)
+        else:
             pretty_value = sp.pretty(eigenval, use_unicode=True)
-            tk.Label(result_frame, text=pretty_value, font=("Arial", 16)).pack()
-    except Exception as e:
-        messagebox.showerror("Error", f"Invalid input: {e}")
+        tk.Label(result_frame, text=pretty_value, font=("Arial", 16)).pack()
+    show_backend(note)
+
 
 # Function to diagonalize a square matrix
 def diagonalize_matrix():
@@ -202,86 +375,43 @@ def diagonalize_matrix():
             messagebox.showerror("Error", "Diagonalization is only defined for square matrices!")
             return
 
-        # Build the matrix from user input
-        matrix = []
-        for i in range(rows):
-            row = []
-            for j in range(cols):
-                value = entries[i][j].get()
-                row.append(parse_input(value))
-            matrix.append(row)
+        run_in_background("Diagonalize", dynamic_operations.diagonalize, (read_grid(entries, rows, cols),), show_diagonalization)
+    except Exception as e:
+        messagebox.showerror("Error", f"Invalid input: {e}")
 
-        sympy_matrix = sp.Matrix(matrix)
 
-        if not sympy_matrix.is_diagonalizable():
-            messagebox.showerror("Error", "The matrix is not diagonalizable!")
-            return
+def show_diagonalization(result):
+    P, D, P_inv, P_T = result
 
-        # Perform diagonalization
-        P, D = sympy_matrix.diagonalize()
-        P_inv = P.inv()
-        P_T = P.transpose()
-
-        # Display results
-        clear_result_frame()
-
-        tk.Label(result_frame, text="Diagonalization Result:", font=("Arial", 16, "bold")).pack()
-
-        # Display P matrix
-        tk.Label(result_frame, text="Matrix P:", font=("Arial", 14, "bold")).pack(pady=5)
-        for i in range(P.rows):
-            row_text = "   ".join(map(str, P.row(i)))
-            tk.Label(result_frame, text=row_text, font=("Arial", 14)).pack()
-
-        # Display D matrix
-        tk.Label(result_frame, text="Matrix D (Diagonal):", font=("Arial", 14, "bold")).pack(pady=5)
-        for i in range(D.rows):
-            row_text = "   ".join(map(str, D.row(i)))
-            tk.Label(result_frame, text=row_text, font=("Arial", 14)).pack()
-
-        # Display P^-1 matrix
-        tk.Label(result_frame, text="Matrix P^-1 (Inverse of P):", font=("Arial", 14, "bold")).pack(pady=5)
-        for i in range(P_inv.rows):
-            row_text = "   ".join(map(str, P_inv.row(i)))
-            tk.Label(result_frame, text=row_text, font=("Arial", 14)).pack()
-        # Display P^T matrix
-        tk.Label(result_frame, text="Matrix P^T (Transpose of P):", font=("Arial", 14, "bold")).pack(pady=5)
-        for i in range(P_T.rows):
-            row_text = "   ".join(map(str, P_T.row(i)))
-            tk.Label(result_frame, text=row_text, font=("Arial", 14)).pack()
-    except Exception as e:
-        messagebox.showerror("Error", f"Invalid input: {e}")
-# Function to calculate power of A using P and D
-def calculate_power_of_a():
-    try:
-        # Read inputs for P and D
-        size = int(row_entry.get())  # Assuming a square matrix of size rows x rows
-        matrix_p = []
-        matrix_d = []
+    # Display results
+    clear_result_frame()
 
-        for i in range(size):
-            row_p = [parse_input(entries_p[i][j].get()) for j in range(size)]
-            row_d = [parse_input(entries_d[i][j].get()) for j in range(size)]
+    tk.Label(result_frame, text="Diagonalization Result:", font=("Arial", 16, "bold")).pack()
 
-            matrix_p.append(row_p)
-            matrix_d.append(row_d)
+    # Display P matrix
+    tk.Label(result_frame, text="Matrix P:", font=("Arial", 14, "bold")).pack(pady=5)
+    show_matrix(P)
 
-        # Convert to sympy matrices
-        P = sp.Matrix(matrix_p)
-        D = sp.Matrix(matrix_d)
+    # Display D matrix
+    tk.Label(result_frame, text="Matrix D (Diagonal):", font=("Arial", 14, "bold")).pack(pady=5)
+    show_matrix(D)
 
-        # Calculate P^-1
-        try:
-            P_inv = P.inv()
-        except sp.NonInvertibleMatrixError:
-            messagebox.showerror("Error", "Matrix P is not invertible. Cannot compute P^-1.")
-            return
+    # Display P^-1 matrix
+    tk.Label(result_frame, text="Matrix P^-1 (Inverse of P):", font=("Arial", 14, "bold")).pack(pady=5)
+    show_matrix(P_inv)
 
-        # Check for the validity of diagonalization
-        A = P * D * P_inv
-        if not sp.simplify(P * D * P_inv - A).is_zero_matrix:
-            messagebox.showerror("Error", "The provided matrices do not satisfy P * D * P^-1 = A.")
-            return
+    # Display P^T matrix, as computed by the worker
+    tk.Label(result_frame, text="Matrix P^T (Transpose of P):", font=("Arial", 14, "bold")).pack(pady=5)
+    show_matrix(P_T)
+
+
+# Function to calculate power of A using P and D
+def calculate_power_of_a():
+    try:
+        # Read inputs for P and D
+        size = int(row_entry.get())  # Assuming a square matrix of size rows x rows
+        matrix_p = read_grid(entries_p, size, size)
+        matrix_d = read_grid(entries_d, size, size)
 
         # Get the value of n
         n = int(power_entry.get())
@@ -289,21 +419,24 @@ def calculate_power_of_a():
             messagebox.showerror("Error", "Only non-negative powers are supported.")
             return
 
-        # Compute A^n = P * D^n * P^-1
-        D_power = D ** n
-        A_power = P * D_power * P_inv
-
-        # Display result
-        clear_result_frame()
-        tk.Label(result_frame, text=f"A^{n}:", font=("Arial", 16, "bold")).pack()
-
-        for i in range(A_power.rows):
-            row_text = "   ".join(map(str, A_power.row(i)))
-            tk.Label(result_frame, text=row_text, font=("Arial", 16)).pack()
+        run_in_background(
+            "A^n (from P, D)",
+            dynamic_operations.power_from_diagonalization,
+            (matrix_p, matrix_d, n),
+            lambda result: show_power(result[0], n, result[1]),
+        )
     except Exception as e:
         messagebox.showerror("Error", f"Invalid input: {e}")
 
 
+def show_power(A_power, n, note=None):
+    clear_result_frame()
+    tk.Label(result_frame, text=f"A^{n}:", font=("Arial", 16, "bold")).pack()
+    show_matrix(A_power)
+    if note is not None:
+        show_backend(note)
+
+
 # Function to create inputs for P, D matrices and power n
 def create_power_matrix_inputs():
     for widget in matrix_frame.winfo_children():
@@ -312,28 +445,16 @@ def create_power_matrix_inputs():
     try:
         size = int(row_entry.get())  # Assuming square matrices
         global entries_p, entries_d, power_entry
-        entries_p = []
-        entries_d = []
 
         # Input fields for P
         tk.Label(matrix_frame, text="Matrix P", font=("Arial", 16, "bold"), bg="#2c3e50", fg="white").grid(row=0, column=0, columnspan=size)
-        for i in range(size):
-            row_p = []
-            for j in range(size):
-                entry = tk.Entry(matrix_frame, width=8, font=("Arial", 16), justify="center")
-                entry.grid(row=i + 1, column=j, padx=5, pady=5)
-                row_p.append(entry)
-            entries_p.append(row_p)
+        entries_p = MatrixGrid(matrix_frame, size, size, pad=5, bg="#2c3e50")
+        entries_p.grid(row=1, column=0, columnspan=2)
 
         # Input fields for D
         tk.Label(matrix_frame, text="Matrix D", font=("Arial", 16, "bold"), bg="#2c3e50", fg="white").grid(row=size + 1, column=0, columnspan=size)
-        for i in range(size):
-            row_d = []
-            for j in range(size):
-                entry = tk.Entry(matrix_frame, width=8, font=("Arial", 16), justify="center")
-                entry.grid(row=i + size + 2, column=j, padx=5, pady=5)
-                row_d.append(entry)
-            entries_d.append(row_d)
+        entries_d = MatrixGrid(matrix_frame, size, size, pad=5, bg="#2c3e50")
+        entries_d.grid(row=size + 2, column=0, columnspan=2)
 
         # Input field for n
         tk.Label(matrix_frame, text="Power (n):", font=("Arial", 16, "bold"), bg="#2c3e50", fg="white").grid(row=(2 * size) + 3, column=0, padx=10)
@@ -352,50 +473,30 @@ def calculate_eigenvalues_and_vectors():
             messagebox.showerror("Error", "Eigenvalues and eigenvectors are only defined for square matrices!")
             return
 
-        # Build the matrix from user input
-        matrix = []
-        for i in range(rows):
-            row = []
-            for j in range(cols):
-                value = entries[i][j].get()
-                row.append(parse_input(value))
-            matrix.append(row)
-
-        # Convert to a SymPy matrix
-        sympy_matrix = sp.Matrix(matrix)
-
-        # Debugging: Print matrix
-        print(f"Input Matrix:\n{sympy_matrix}")
+        run_in_background(
+            "Eigenvalues & Vectors", dynamic_operations.eigenvectors, (read_grid(entries, rows, cols),), show_eigenvectors
+        )
+    except Exception as e:
+        messagebox.showerror("Error", f"Invalid input: {e}")
 
-        # Calculate eigenvalues and eigenvectors
-        eigen_info = sympy_matrix.eigenvects()
 
-        # Debugging: Print raw eigenvalue and eigenvector data
-        print("\nEigenvalue and Eigenvector Details:")
-        for eigenvalue, multiplicity, eigenvectors in eigen_info:
-            print(f"Eigenvalue: {eigenvalue}, Multiplicity: {multiplicity}")
-            print(f"Eigenvectors: {eigenvectors}")
+def show_eigenvectors(eigen_info):
+    # Display results in GUI
+    clear_result_frame()
+    tk.Label(result_frame, text="Eigenvalues and Eigenvectors:", font=("Arial", 16, "bold")).pack(pady=10)
 
-        # Display results in GUI
-        clear_result_frame()
-        tk.Label(result_frame, text="Eigenvalues and Eigenvectors:", font=("Arial", 16, "bold")).pack(pady=10)
+    for eigenvalue, multiplicity, eigenvectors in eigen_info:
+        # Display the eigenvalue
+        pretty_value = sp.pretty(eigenvalue, use_unicode=True)
+        tk.Label(result_frame, text=f"Eigenvalue: {pretty_value}", font=("Arial", 16, "bold"), fg="#1abc9c").pack(pady=5)
 
-        for eigenvalue, multiplicity, eigenvectors in eigen_info:
-            # Display the eigenvalue
-            pretty_value = sp.pretty(eigenvalue, use_unicode=True)
-            tk.Label(result_frame, text=f"Eigenvalue: {pretty_value}", font=("Arial", 16, "bold"), fg="#1abc9c").pack(pady=5)
+        # Display the eigenvectors side by side, as the columns of one view
+        tk.Label(result_frame, text=f"Eigenvectors (Multiplicity: {multiplicity}):", font=("Arial", 14, "bold")).pack(pady=5)
+        show_matrix([[vector[i] for vector in eigenvectors] for i in range(len(eigenvectors[0]))])
 
-            # Display each eigenvector
-            tk.Label(result_frame, text=f"Eigenvectors (Multiplicity: {multiplicity}):", font=("Arial", 14, "bold")).pack(pady=5)
-            for vector in eigenvectors:
-                formatted_vector = sp.pretty(vector, use_unicode=True)
-                tk.Label(result_frame, text=formatted_vector, font=("Courier", 14), bg="#1abc9c").pack(pady=2)
+        # Separator for clarity
+        tk.Label(result_frame, text="-" * 50, font=("Arial", 12), fg="#7f8c8d").pack(pady=10)
 
-            # Separator for clarity
-            tk.Label(result_frame, text="-" * 50, font=("Arial", 12), fg="#7f8c8d").pack(pady=10)
-
-    except Exception as e:
-        messagebox.showerror("Error", f"Invalid input: {e}")
 
 # Function to calculate A^n directly
 def calculate_matrix_power_direct():
@@ -407,27 +508,25 @@ def calculate_matrix_power_direct():
             messagebox.showerror("Error", "Matrix power is only defined for square matrices!")
             return
 
-        matrix = []
-        for i in range(rows):
-            row = []
-            for j in range(cols):
-                value = entries[i][j].get()
-                row.append(parse_input(value))
-            matrix.append(row)
+        matrix = read_grid(entries, rows, cols)
 
         n = int(power_entry.get())
         if n < 0:
             messagebox.showerror("Error", "Only non-negative powers are supported!")
             return
 
-        sympy_matrix = sp.Matrix(matrix)
-        result_matrix = sympy_matrix**n
+        # Optional modulus m for exact A^n mod m
+        modulus = int(modulus_entry.get()) if modulus_entry.get().strip() else None
+        if modulus is not None and modulus < 1:
+            messagebox.showerror("Error", "The modulus must be a positive integer!")
+            return
 
-        clear_result_frame()
-        tk.Label(result_frame, text=f"A^{n}:", font=("Arial", 16, "bold")).pack()
-        for i in range(result_matrix.rows):
-            row_text = "   ".join(map(str, result_matrix.row(i)))
-            tk.Label(result_frame, text=row_text, font=("Arial", 16)).pack()
+        run_in_background(
+            "A^n",
+            dynamic_operations.matrix_power,
+            (matrix, n, backend_var.get(), modulus),
+            lambda result: show_power(result[0], n, result[1]),
+        )
     except Exception as e:
         messagebox.showerror("Error", f"Invalid input: {e}")
 
@@ -445,19 +544,13 @@ def create_power_input_direct():
             messagebox.showerror("Error", "Matrix power is only defined for square matrices!")
             return
 
-        global entries, power_entry
-        entries = []
+        global entries, power_entry, modulus_entry
 
         tk.Label(matrix_frame, text="Input Matrix", font=("Arial", 16, "bold"), bg="#2c3e50", fg="white").grid(row=0, column=0, columnspan=cols)
 
         # Create input fields for matrix
-        for i in range(rows):
-            row_entries = []
-            for j in range(cols):
-                entry = tk.Entry(matrix_frame, width=8, font=("Arial", 16), justify="center")
-                entry.grid(row=i + 1, column=j, padx=5, pady=5)
-                row_entries.append(entry)
-            entries.append(row_entries)
+        entries = MatrixGrid(matrix_frame, rows, cols, pad=5, bg="#2c3e50")
+        entries.grid(row=1, column=0, columnspan=4)
 
         # Input field for power n
         tk.Label(matrix_frame, text="Power (n):", font=("Arial", 16, "bold"), bg="#2c3e50", fg="white").grid(row=rows + 1, column=0, padx=10, pady=10)
@@ -468,6 +561,11 @@ def create_power_input_direct():
         calculate_button = tk.Button(matrix_frame, text="Calculate A^n", command=calculate_matrix_power_direct, font=("Arial", 16), bg="#16a085", fg="blue")
         calculate_button.grid(row=rows + 1, column=2, padx=10, pady=10)
 
+        # Optional input field for the modulus m (A^n mod m)
+        tk.Label(matrix_frame, text="Mod (m):", font=("Arial", 16, "bold"), bg="#2c3e50", fg="white").grid(row=rows + 2, column=0, padx=10, pady=10)
+        modulus_entry = tk.Entry(matrix_frame, width=8, font=("Arial", 16), justify="center")
+        modulus_entry.grid(row=rows + 2, column=1, padx=10, pady=10)
+
     except ValueError:
         messagebox.showerror("Error", "Please enter valid numbers for rows and columns.")
 
@@ -482,49 +580,33 @@ def calculate_scalar_power_matrix():
             messagebox.showerror("Error", "n^A is only defined for square matrices!")
             return
 
-        # Parse the matrix A
-        matrix = []
-        for i in range(rows):
-            row = []
-            for j in range(cols):
-                value = entries[i][j].get()
-                row.append(parse_input(value))
-            matrix.append(row)
+        scalar_choice = scalar_var.get()
 
-        sympy_matrix = sp.Matrix(matrix)
+        # Empty digits means float64; otherwise arbitrary precision with that many digits
+        digits = int(digits_entry.get()) if digits_entry.get().strip() else None
+        if digits is not None and digits < 1:
+            messagebox.showerror("Error", "Digits must be a positive integer!")
+            return
 
-        # Get the scalar n
-        scalar_choice = scalar_var.get()
-        if scalar_choice == "e":
-            n = sp.E
-        elif scalar_choice == "pi":
-            n = sp.pi
-        else:
-            try:
-                n = parse_input(scalar_choice)
-                if n <= 0:
-                    raise ValueError("The scalar n must be positive!")
-            except Exception as e:
-                messagebox.showerror("Error", f"Invalid scalar value: {e}")
-                return
-
-        # Calculate n^A using exp(A * ln(n))
-        result_matrix = sp.exp(sympy_matrix * sp.log(n))
-
-        # Evaluate the result numerically
-        result_matrix_numeric = result_matrix.evalf()
-
-        # Display the result
-        clear_result_frame()
-        tk.Label(result_frame, text=f"n^A (n={scalar_choice}):", font=("Arial", 16, "bold")).pack()
-
-        for i in range(result_matrix_numeric.rows):
-            row_text = "   ".join(map(str, result_matrix_numeric.row(i)))
-            tk.Label(result_frame, text=row_text, font=("Arial", 16)).pack()
+        run_in_background(
+            "n^A",
+            dynamic_operations.scalar_power,
+            (read_grid(entries, rows, cols), scalar_choice, digits),
+            lambda result: show_scalar_power(result, scalar_choice),
+        )
     except Exception as e:
         messagebox.showerror("Error", f"Invalid input: {e}")
 
 
+def show_scalar_power(result, scalar_choice):
+    result_matrix_numeric, note = result
+    # Display the result
+    clear_result_frame()
+    tk.Label(result_frame, text=f"n^A (n={scalar_choice}):", font=("Arial", 16, "bold")).pack()
+    show_matrix(result_matrix_numeric)
+    show_backend(note)
+
+
 # Function to create input fields for scalar n and matrix A
 def create_scalar_power_input():
     for widget in matrix_frame.winfo_children():
@@ -538,19 +620,13 @@ def create_scalar_power_input():
             messagebox.showerror("Error", "n^A is only defined for square matrices!")
             return
 
-        global entries, scalar_var
-        entries = []
+        global entries, scalar_var, digits_entry
 
         tk.Label(matrix_frame, text="Input Matrix A", font=("Arial", 16, "bold"), bg="#2c3e50", fg="white").grid(row=0, column=0, columnspan=cols)
 
         # Create input fields for matrix A
-        for i in range(rows):
-            row_entries = []
-            for j in range(cols):
-                entry = tk.Entry(matrix_frame, width=8, font=("Arial", 16), justify="center")
-                entry.grid(row=i + 1, column=j, padx=5, pady=5)
-                row_entries.append(entry)
-            entries.append(row_entries)
+        entries = MatrixGrid(matrix_frame, rows, cols, pad=5, bg="#2c3e50")
+        entries.grid(row=1, column=0, columnspan=4)
 
         from tkinter import ttk
 
@@ -585,6 +661,12 @@ def create_scalar_power_input():
         )
         calculate_button.grid(row=rows + 1, column=3, padx=10, pady=10)
 
+        # Optional input field for arbitrary-precision digits
+        tk.Label(matrix_frame, text="Digits:", font=("Arial", 16, "bold"), bg="#2c3e50", fg="white").grid(
+            row=rows + 2, column=0, padx=10, pady=10)
+        digits_entry = tk.Entry(matrix_frame, width=8, font=("Arial", 16), justify="center")
+        digits_entry.grid(row=rows + 2, column=1, padx=10, pady=10)
+
     except ValueError:
         messagebox.showerror("Error", "Please enter valid numbers for rows and columns.")
 
@@ -601,21 +683,15 @@ def orthogonal_diagonalize_matrix():
             messagebox.showerror("Error", "Matrix must be square to orthogonally diagonalize!")
             return
 
-        global entries
-        entries = []
+        global entries, decimals_entry
 
         tk.Label(matrix_frame, text="Input Symmetric Matrix A", font=("Arial", 16, "bold"), bg="#2c3e50", fg="white").grid(
             row=0, column=0, columnspan=cols
         )
 
         # Create input fields for matrix A
-        for i in range(rows):
-            row_entries = []
-            for j in range(cols):
-                entry = tk.Entry(matrix_frame, width=8, font=("Arial", 16), justify="center")
-                entry.grid(row=i + 1, column=j, padx=5, pady=5)
-                row_entries.append(entry)
-            entries.append(row_entries)
+        entries = MatrixGrid(matrix_frame, rows, cols, pad=5, bg="#2c3e50")
+        entries.grid(row=1, column=0, columnspan=4)
 
         # Button to calculate orthogonal diagonalization
         calculate_button = tk.Button(
@@ -626,7 +702,13 @@ def orthogonal_diagonalize_matrix():
             bg="#16a085",
             fg="blue",
         )
-        calculate_button.grid(row=rows + 1, column=0, columnspan=cols, pady=10)
+        calculate_button.grid(row=rows + 1, column=0, columnspan=2, pady=10)
+
+        # Input field for the number of decimal places in the result
+        tk.Label(matrix_frame, text="Decimals:", font=("Arial", 16, "bold"), bg="#2c3e50", fg="white").grid(row=rows + 1, column=2, padx=10, pady=10)
+        decimals_entry = tk.Entry(matrix_frame, width=4, font=("Arial", 16), justify="center")
+        decimals_entry.insert(0, "4")
+        decimals_entry.grid(row=rows + 1, column=3, padx=10, pady=10)
 
     except ValueError:
         messagebox.showerror("Error", "Please enter valid numbers for rows and columns.")
@@ -635,53 +717,72 @@ def orthogonal_diagonalize_matrix():
 def calculate_orthogonal_diagonalization():
     """Performs orthogonal diagonalization and displays the results."""
     try:
-        # Read input matrix A
-        matrix_a = []
-        for row_entries in entries:
-            row = [float(entry.get()) for entry in row_entries]
-            matrix_a.append(row)
-
-        matrix_a = Matrix(matrix_a)  # Convert to sympy Matrix
+        rows = int(row_entry.get())
+        cols = int(col_entry.get())
 
-        if not matrix_a.is_symmetric():
-            messagebox.showerror("Error", "Matrix must be symmetric to orthogonally diagonalize!")
+        decimals = int(decimals_entry.get())
+        if not 0 <= decimals <= 15:
+            messagebox.showerror("Error", "Decimals must be between 0 and 15!")
             return
 
-        # Perform diagonalization
-        P, D = matrix_a.diagonalize(normalize=True)
-
-        # Round values to 4 decimal places
-        D = D.applyfunc(lambda x: round(x, 4))
-        P = P.applyfunc(lambda x: round(x, 4))
-        P_T = P.T.applyfunc(lambda x: round(x, 4))
-
-        # Clear previous results
-        for widget in result_frame.winfo_children():
-            widget.destroy()
-
-        # Display results
-        tk.Label(result_frame, text="Matrix A:", font=("Arial", 16, "bold"), bg="#34495e", fg="white").pack(
-            anchor="w", pady=5
+        run_in_background(
+            "Orthogonal diagonalization",
+            dynamic_operations.orthogonal_diagonalization,
+            (read_grid(entries, rows, cols), decimals),
+            show_orthogonal_diagonalization,
         )
-        tk.Label(result_frame, text=matrix_a, font=("Courier", 14), bg="#34495e", fg="white").pack(anchor="w")
+    except ValueError:
+        messagebox.showerror("Error", "Please enter valid numeric values!")
 
-        tk.Label(result_frame, text="Orthogonal Matrix P:", font=("Arial", 16, "bold"), bg="#34495e", fg="white").pack(
-            anchor="w", pady=5
-        )
-        tk.Label(result_frame, text=P, font=("Courier", 14), bg="#34495e", fg="white").pack(anchor="w")
 
-        tk.Label(result_frame, text="Diagonal Matrix D:", font=("Arial", 16, "bold"), bg="#34495e", fg="white").pack(
-            anchor="w", pady=5
-        )
-        tk.Label(result_frame, text=D, font=("Courier", 14), bg="#34495e", fg="white").pack(anchor="w")
+def show_orthogonal_diagonalization(result):
+    matrix_a, P, D, P_T = result
 
-        tk.Label(result_frame, text="Transpose of P (P^T):", font=("Arial", 16, "bold"), bg="#34495e", fg="white").pack(
-            anchor="w", pady=5
-        )
-        tk.Label(result_frame, text=P_T, font=("Courier", 14), bg="#34495e", fg="white").pack(anchor="w")
+    # Clear previous results
+    for widget in result_frame.winfo_children():
+        widget.destroy()
 
-    except ValueError:
-        messagebox.showerror("Error", "Please enter valid numeric values!")
+    # Display results
+    tk.Label(result_frame, text="Matrix A:", font=("Arial", 16, "bold"), bg="#34495e", fg="white").pack(
+        anchor="w", pady=5
+    )
+    show_matrix(matrix_a)
+
+    tk.Label(result_frame, text="Orthogonal Matrix P:", font=("Arial", 16, "bold"), bg="#34495e", fg="white").pack(
+        anchor="w", pady=5
+    )
+    show_matrix(P)
+
+    tk.Label(result_frame, text="Diagonal Matrix D:", font=("Arial", 16, "bold"), bg="#34495e", fg="white").pack(
+        anchor="w", pady=5
+    )
+    show_matrix(D)
+
+    tk.Label(result_frame, text="Transpose of P (P^T):", font=("Arial", 16, "bold"), bg="#34495e", fg="white").pack(
+        anchor="w", pady=5
+    )
+    show_matrix(P_T)
+
+
+# Function to fill the grid with a pasted or imported matrix
+def load_imported_matrix(array):
+    rows, cols = array.shape
+    row_entry.delete(0, tk.END)
+    row_entry.insert(0, str(rows))
+    col_entry.delete(0, tk.END)
+    col_entry.insert(0, str(cols))
+    create_matrix_inputs(array)
+
+
+# Grid being edited, and the live mode state: factorization, pending cells and debounce timer
+entries = None
+live_state = None
+live_note = ""
+live_factoring = False
+live_dirty = set()
+live_timer = None
+read_seconds = 0.0
+trace_log = TraceLog()
 
 # Main window
 root = tk.Tk()
@@ -702,6 +803,49 @@ welcome_label = tk.Label(
 )
 welcome_label.pack(pady=10)
 
+# Status bar: progress of background jobs, an optional time limit and a cancel button
+status_frame = tk.Frame(root, bg="#2c3e50")
+status_frame.pack(side="bottom", fill="x")
+
+status_label = tk.Label(status_frame, text="Ready", bg="#2c3e50", fg="white", font=("Arial", 14), anchor="w")
+status_label.pack(side="left", fill="x", expand=True, padx=10, pady=5)
+
+tk.Button(status_frame, text="Cancel", command=lambda: worker.cancel(), font=("Arial", 14)).pack(side="right", padx=10, pady=5)
+budget_entry = tk.Entry(status_frame, width=6, font=("Arial", 14), justify="center")
+budget_entry.pack(side="right", pady=5)
+tk.Label(status_frame, text="Time limit (s):", bg="#2c3e50", fg="white", font=("Arial", 14)).pack(side="right", padx=5)
+
+# Instrumentation: peak memory (tracemalloc slows the computation down), cProfile dumps, trace export
+tk.Button(status_frame, text="Export Trace", command=export_trace, font=("Arial", 14)).pack(side="right", padx=10, pady=5)
+profile_var = tk.BooleanVar(value=False)
+tk.Checkbutton(
+    status_frame, text="Profile", variable=profile_var, bg="#2c3e50", fg="white", selectcolor="#34495e", font=("Arial", 14)
+).pack(side="right", padx=5)
+memory_var = tk.BooleanVar(value=True)
+tk.Checkbutton(
+    status_frame, text="Memory", variable=memory_var, bg="#2c3e50", fg="white", selectcolor="#34495e", font=("Arial", 14)
+).pack(side="right", padx=5)
+
+
+def update_status(message, elapsed):
+    status_label.config(text=f"{message} ({elapsed:.1f}s)")
+
+
+# Heavy sympy work runs in a separate process so the window never freezes
+worker = BackgroundWorker(root, on_progress=update_status)
+
+
+def close_window():
+    worker.shutdown()
+    root.destroy()
+
+
+root.protocol("WM_DELETE_WINDOW", close_window)
+
+# Once the window is up, load the operations here (to show results) and in the worker (to compute them)
+warm_up(root, sp, dynamic_operations)
+root.after(WARM_UP_DELAY_MS, worker.preload, "dynamic_operations")
+
 # Frame for operation buttons on the left
 button_frame = tk.Frame(root, bg="#2c3e50")
 button_frame.pack(side="left", fill="y", padx=10, pady=10)
@@ -767,6 +911,27 @@ generate_button = tk.Button(
 )
 generate_button.grid(row=0, column=4, padx=20)
 
+# Buttons to paste or import a whole matrix at once
+add_import_buttons(size_frame, load_imported_matrix, bg="#34495e").grid(row=1, column=0, columnspan=5, pady=(10, 0))
+
+# Backend: "auto" uses float64 for decimal or large inputs and falls back to exact when ill-conditioned
+tk.Label(size_frame, text="Backend:", bg="#34495e", fg="white", font=("Arial", 14)).grid(row=2, column=1, pady=(10, 0))
+backend_var = tk.StringVar(value="auto")
+tk.OptionMenu(size_frame, backend_var, *BACKEND_MODES).grid(row=2, column=2, pady=(10, 0))
+
+# Live mode: determinant, inverse and rank follow each edit through rank-one updates
+live_var = tk.BooleanVar(value=False)
+tk.Checkbutton(
+    size_frame,
+    text="Live",
+    variable=live_var,
+    command=toggle_live,
+    bg="#34495e",
+    fg="white",
+    selectcolor="#2c3e50",
+    font=("Arial", 14),
+).grid(row=2, column=3, pady=(10, 0))
+
 # Frame for matrix input
 matrix_frame = tk.Frame(scrollable_frame, bg="#34495e")
 matrix_frame.pack(pady=20)
@@ -0,0 +1,182 @@
+"""Run matrix operations headlessly over streams of matrices.
+
+Examples:
+    python batch_cli.py det matrices.jsonl -o results.jsonl
+    python batch_cli.py rref matrices.csv --workers 8
+    python batch_cli.py properties stack.npy
+    python batch_cli.py properties stack.npy --rank-mode numeric --tolerance 1e-9
+    python batch_cli.py AxB transform.npy --with stack.npy -o products.npy
+
+Input formats (picked from the file extension, or --format):
+    jsonl  one matrix per line, either [[...], ...] or {"id": ..., "matrix": [[...], ...]}
+    csv    matrices separated by blank lines (use --delimiter for TSV)
+    npy    a 2D array (one matrix) or 3D stack, opened with mmap_mode="r"
+
+Results are written as one JSON object per line, in input order. The pair
+operations (AxB, BxA, A+B, A-B) instead read A and B from .npy files, each a
+matrix or a k x m x n stack broadcast against the other, and write a .npy file.
+"""
+import argparse
+import csv
+import json
+import os
+import sys
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
+
+import numpy as np
+
+from matrix_operations import OPERATIONS, run_operations
+from pair_operations import PAIR_OPERATIONS, apply as apply_pair_operation, result_shape
+from rank_engine import RANK_MODES
+
+
+# Matrices sent to a worker per task, so pickling and IPC costs are shared by many small matrices
+DEFAULT_CHUNK_SIZE = 256
+
+# Function to read matrices from a JSONL stream
+def read_jsonl(path):
+    with open(path) as file:
+        for index, line in enumerate(file):
+            line = line.strip()
+            if not line:
+                continue
+            record = json.loads(line)
+            if isinstance(record, dict):
+                yield record.get("id", index), record["matrix"]
+            else:
+                yield index, record
+
+
+# Function to read blank-line separated matrices from a CSV/TSV stream
+def read_csv(path, delimiter=","):
+    with open(path, newline="") as file:
+        index = 0
+        rows = []
+        for row in csv.reader(file, delimiter=delimiter):
+            if not any(cell.strip() for cell in row):
+                if rows:
+                    yield index, rows
+                    index += 1
+                    rows = []
+                continue
+            rows.append(row)
+        if rows:
+            yield index, rows
+
+
+# Function to read matrices from a memory-mapped .npy file
+def read_npy(path):
+    array = np.load(path, mmap_mode="r")
+    if array.ndim == 2:
+        yield 0, np.array(array)
+    elif array.ndim == 3:
+        # Only one matrix at a time is copied out of the mapping
+        for index in range(array.shape[0]):
+            yield index, np.array(array[index])
+    else:
+        raise ValueError(f"Expected a 2D or 3D array, got {array.ndim} dimensions")
+
+
+def read_matrices(path, file_format=None, delimiter=","):
+    """Yield (id, rows) pairs from a matrix file."""
+    file_format = file_format or os.path.splitext(path)[1].lstrip(".").lower()
+    if file_format in ("jsonl", "json", "ndjson"):
+        return read_jsonl(path)
+    if file_format in ("csv", "tsv", "txt"):
+        return read_csv(path, "\t" if file_format == "tsv" else delimiter)
+    if file_format == "npy":
+        return read_npy(path)
+    raise ValueError(f"Unknown input format: {file_format}")
+
+
+def process_chunk(operation, chunk, options=None):
+    """Run one operation over (id, rows) records, capturing errors so one bad matrix does not stop the batch."""
+    results = run_operations(operation, [rows for _, rows in chunk], options)
+    return [
+        {"id": record_id, "operation": operation, "error": str(result)}
+        if isinstance(result, Exception)
+        else {"id": record_id, "operation": operation, "result": result}
+        for (record_id, _), result in zip(chunk, results)
+    ]
+
+
+def run_batch(operation, records, workers=None, max_in_flight=None, chunk_size=DEFAULT_CHUNK_SIZE, options=None):
+    """Yield results for (id, rows) records in input order.
+
+    Records are sent to the workers in chunks of `chunk_size` matrices. At most
+    `max_in_flight` chunks are held in memory at once, so arbitrarily long streams
+    run in bounded memory. `options` are passed to the operation.
+    """
+    records = iter(records)
+    if workers == 1:
+        while chunk := list(islice(records, chunk_size)):
+            yield from process_chunk(operation, chunk, options)
+        return
+
+    workers = workers or os.cpu_count() or 1
+    max_in_flight = max_in_flight or workers * 4
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        pending = deque()
+        while chunk := list(islice(records, chunk_size)):
+            pending.append(executor.submit(process_chunk, operation, chunk, options))
+            if len(pending) >= max_in_flight:
+                yield from pending.popleft().result()
+        while pending:
+            yield from pending.popleft().result()
+
+
+def run_pairs(operation, path_a, path_b, output, chunk_size=DEFAULT_CHUNK_SIZE):
+    """Combine two .npy matrices or stacks into a memory-mapped .npy result, chunk by chunk."""
+    a = np.load(path_a, mmap_mode="r")
+    b = np.load(path_b, mmap_mode="r")
+    shape = result_shape(operation, a.shape, b.shape)
+    out = np.lib.format.open_memmap(output, mode="w+", dtype=np.float64, shape=shape)
+    apply_pair_operation(operation, a, b, chunk_size, out=out)
+    out.flush()
+    return shape
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Run matrix operations over a stream of matrices.")
+    parser.add_argument(
+        "operation", choices=sorted(OPERATIONS) + list(PAIR_OPERATIONS), help="Operation to run on every matrix"
+    )
+    parser.add_argument("input", help="Input file (.jsonl, .csv, .tsv or .npy)")
+    parser.add_argument("-o", "--output", help="Output JSONL file (default: stdout), or .npy for pair operations")
+    parser.add_argument("--with", dest="other", help="Matrix or stack B (.npy) for the pair operations")
+    parser.add_argument("--format", choices=["jsonl", "csv", "tsv", "npy"], help="Override the input format")
+    parser.add_argument("--delimiter", default=",", help="CSV delimiter")
+    parser.add_argument("--workers", type=int, default=None, help="Worker processes (default: all cores)")
+    parser.add_argument("--chunk-size", type=int, default=DEFAULT_CHUNK_SIZE, help="Matrices sent to a worker at once")
+    parser.add_argument("--max-in-flight", type=int, default=None, help="Chunks held in memory at once")
+    parser.add_argument("--rank-mode", choices=RANK_MODES, default="modular", help="How properties computes the rank")
+    parser.add_argument("--tolerance", type=float, default=None, help="Singular value tolerance of the numeric rank")
+    parser.add_argument("--confirm", action="store_true", help="Confirm an uncertain modular rank exactly")
+    args = parser.parse_args(argv)
+
+    if args.operation in PAIR_OPERATIONS:
+        if not args.other or not args.output:
+            parser.error("pair operations need --with B.npy and -o OUTPUT.npy")
+        run_pairs(args.operation, args.input, args.other, args.output, args.chunk_size)
+        return 0
+
+    records = read_matrices(args.input, args.format, args.delimiter)
+    options = None
+    if args.operation == "properties":
+        options = {"mode": args.rank_mode, "tolerance": args.tolerance, "confirm": args.confirm}
+    output = open(args.output, "w") if args.output else sys.stdout
+    errors = 0
+    try:
+        for result in run_batch(args.operation, records, args.workers, args.max_in_flight, args.chunk_size, options):
+            errors += "error" in result
+            output.write(json.dumps(result) + "\n")
+    finally:
+        if output is not sys.stdout:
+            output.close()
+    return 1 if errors else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
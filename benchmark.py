@@ -0,0 +1,336 @@
+"""Time the determinant and matrix-operation backends on reproducible inputs.
+
+Examples:
+    python benchmark.py -o results.json
+    python benchmark.py --sizes 2 4 8 16 --kinds integer rational --backends laplace sympy.det
+    python benchmark.py --update-baseline
+
+Every backend runs on seeded random float, integer, rational, sparse and
+structured (upper triangular) matrices, at doubling sizes. Each case reports the
+best wall time of a few repeats and the peak memory traced by tracemalloc in a
+separate run, since tracing slows the code down. The scaling exponent of a series
+is the slope of log(time) against log(size) over its largest sizes. Sizes stop
+growing once the next one is predicted to run longer than --max-seconds. Cases run in a child process,
+so one that blows up anyway (exact eigenvalues, for one) is stopped after
+--timeout seconds.
+
+Results are written as JSON and compared against the stored baseline. A case that
+is REGRESSION_FACTOR times slower, or uses that much more memory, is flagged and
+the exit code is 1.
+"""
+import argparse
+import gc
+import json
+import math
+import multiprocessing
+import os
+import platform
+import sys
+import time
+import tracemalloc
+from fractions import Fraction
+
+import numpy as np
+import sympy as sp
+
+import dynamic_operations
+from determinant_engine import LAPLACE_MAX_SIZE, determinant, determinant_recursive
+from factorization_cache import default_cache
+from pair_operations import apply as apply_pair_operation
+from rational_matrix import RationalMatrix
+
+
+# Sizes run by default, doubling up to several hundred
+DEFAULT_SIZES = (2, 4, 8, 16, 32, 64, 128, 256, 512)
+
+# Timed runs per case; the best one is reported
+DEFAULT_REPEATS = 3
+
+# A series stops once its next size is predicted to take longer than this, in seconds
+DEFAULT_MAX_SECONDS = 2.0
+
+# A case still running after this many seconds is stopped, and its series ends there
+DEFAULT_TIMEOUT = 60.0
+
+# Slowdown (or memory growth) against the baseline that counts as a regression
+REGRESSION_FACTOR = 1.5
+
+# Cases faster than this are too noisy to compare, in seconds
+MIN_COMPARABLE_SECONDS = 1e-3
+
+# The scaling exponent is fitted over this many of the largest sizes, where fixed overheads matter least
+SCALING_POINTS = 3
+
+# Cases using less memory than this are not compared for memory, in bytes
+MIN_COMPARABLE_BYTES = 64 * 1024
+
+# Baseline the results are compared against
+DEFAULT_BASELINE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "benchmarks", "baseline.json")
+
+# Kinds of input matrices
+MATRIX_KINDS = ("float", "integer", "rational", "sparse", "structured")
+
+
+def make_matrix(kind, size, seed=0):
+    """Return a size x size matrix of Python numbers (float, int or Fraction), the same for every run."""
+    rng = np.random.default_rng([seed, MATRIX_KINDS.index(kind), size])
+    if kind == "float":
+        return rng.standard_normal((size, size)).tolist()
+    if kind == "integer":
+        return rng.integers(-9, 10, (size, size)).tolist()
+    if kind == "rational":
+        numerators = rng.integers(-9, 10, (size, size)).tolist()
+        denominators = rng.integers(1, 10, (size, size)).tolist()
+        return [[Fraction(n, d) for n, d in zip(*pair)] for pair in zip(numerators, denominators)]
+    if kind == "sparse":
+        # About 5% nonzeros plus a nonzero diagonal, which keeps it invertible in practice
+        values = rng.integers(1, 10, (size, size)) * (rng.random((size, size)) < 0.05)
+        np.fill_diagonal(values, rng.integers(1, 10, size))
+        return values.tolist()
+    if kind == "structured":
+        values = np.triu(rng.integers(-9, 10, (size, size)))
+        np.fill_diagonal(values, rng.integers(1, 10, size))
+        return values.tolist()
+    raise ValueError(f"Unknown matrix kind: {kind}")
+
+
+def as_strings(matrix):
+    """The matrix as grid text, the way the GUIs read it."""
+    return [[repr(value) if isinstance(value, float) else str(value) for value in row] for row in matrix]
+
+
+def as_fractions(matrix):
+    return [[Fraction(repr(value)) if isinstance(value, float) else Fraction(value) for value in row] for row in matrix]
+
+
+def as_sympy(matrix):
+    return sp.Matrix([[sp.Rational(value.numerator, value.denominator) for value in row] for row in as_fractions(matrix)])
+
+
+def as_couple_operand(matrix):
+    """A float array, or a RationalMatrix when CoupleMatrix would need "Exact fractions"."""
+    if isinstance(matrix[0][0], float):
+        return np.array(matrix, dtype=np.float64)
+    return RationalMatrix.from_values(as_strings(matrix))
+
+
+def _pair(operation):
+    return lambda operand: apply_pair_operation(operation, operand, operand)
+
+
+# Backend name: (function run on the prepared input, input preparation, largest size)
+BACKENDS = {
+    "laplace": (determinant_recursive, as_fractions, LAPLACE_MAX_SIZE),
+    "sympy.det": (lambda matrix: matrix.det(), as_sympy, None),
+    "numpy.det": (np.linalg.det, lambda matrix: np.array(matrix, dtype=np.float64), None),
+    "engine.det": (determinant, as_fractions, None),
+    "dynamic.det": (dynamic_operations.determinant, as_strings, None),
+    "dynamic.rref": (dynamic_operations.rref, as_strings, None),
+    "dynamic.inverse": (dynamic_operations.inverse, as_strings, None),
+    "dynamic.eigenvalues": (dynamic_operations.eigenvalues, as_strings, None),
+    "couple.AxB": (_pair("AxB"), as_couple_operand, None),
+    "couple.A+B": (_pair("A+B"), as_couple_operand, None),
+}
+
+
+def _reset():
+    # Each run starts cold, so cached factorizations do not hide the elimination
+    default_cache.clear()
+    gc.collect()
+
+
+def measure(function, argument, repeats=DEFAULT_REPEATS):
+    """Return (best wall time in seconds, peak traced bytes) of function(argument)."""
+    best = math.inf
+    for _ in range(repeats):
+        _reset()
+        start = time.perf_counter()
+        function(argument)
+        best = min(best, time.perf_counter() - start)
+    _reset()
+    tracemalloc.start()
+    try:
+        function(argument)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return best, peak
+
+
+def scaling_exponent(sizes, seconds):
+    """Slope of log(time) against log(size), over the largest sizes slow enough to time reliably."""
+    points = [(size, value) for size, value in zip(sizes, seconds) if value >= MIN_COMPARABLE_SECONDS / 10]
+    points = points[-SCALING_POINTS:]
+    if len(points) < 2:
+        return None
+    slope, _ = np.polyfit(np.log([size for size, _ in points]), np.log([value for _, value in points]), 1)
+    return round(float(slope), 2)
+
+
+def _measure_case(backend, kind, size, seed, repeats):
+    function, prepare, _ = BACKENDS[backend]
+    return measure(function, prepare(make_matrix(kind, size, seed)), repeats)
+
+
+class CaseRunner:
+    """Run cases one at a time in a child process, which is killed when a case times out."""
+
+    def __init__(self, timeout=DEFAULT_TIMEOUT):
+        self.timeout = timeout
+        self.pool = None
+
+    def run(self, backend, kind, size, seed=0, repeats=DEFAULT_REPEATS):
+        """Return (seconds, peak_bytes); raises TimeoutError or whatever the case raised."""
+        if self.pool is None:
+            self.pool = multiprocessing.Pool(1)
+        pending = self.pool.apply_async(_measure_case, (backend, kind, size, seed, repeats))
+        try:
+            return pending.get(self.timeout)
+        except multiprocessing.TimeoutError:
+            self.close()
+            raise TimeoutError(f"timed out after {self.timeout:g} s")
+
+    def close(self):
+        if self.pool is not None:
+            self.pool.terminate()
+            self.pool.join()
+            self.pool = None
+
+
+def run_series(backend, kind, sizes, repeats=DEFAULT_REPEATS, max_seconds=DEFAULT_MAX_SECONDS, seed=0, runner=None):
+    """Yield one result dict per size until the next size is predicted to exceed `max_seconds`."""
+    _, _, largest = BACKENDS[backend]
+    own_runner = runner is None
+    runner = runner or CaseRunner()
+    previous = None
+    try:
+        for size in sorted(sizes):
+            if largest is not None and size > largest:
+                break
+            if previous is not None:
+                last_size, last_seconds = previous
+                # Cubic growth is assumed: elimination is cubic, sums stop a little early,
+                # and the factorial Laplace expansion is capped by its largest size
+                if last_seconds * (size / last_size) ** 3 > max_seconds:
+                    break
+            try:
+                seconds, peak = runner.run(backend, kind, size, seed, repeats)
+            except Exception as e:
+                yield {"backend": backend, "kind": kind, "size": size, "error": str(e) or type(e).__name__}
+                break
+            yield {"backend": backend, "kind": kind, "size": size, "seconds": seconds, "peak_bytes": peak}
+            previous = size, seconds
+    finally:
+        if own_runner:
+            runner.close()
+
+
+def run_benchmarks(
+    backends, kinds, sizes, repeats=DEFAULT_REPEATS, max_seconds=DEFAULT_MAX_SECONDS, seed=0, timeout=DEFAULT_TIMEOUT,
+    log=None,
+):
+    """Run every backend on every kind of matrix; returns the JSON-ready report."""
+    results = []
+    scaling = []
+    runner = CaseRunner(timeout)
+    try:
+        for backend in backends:
+            for kind in kinds:
+                series = []
+                for result in run_series(backend, kind, sizes, repeats, max_seconds, seed, runner):
+                    if log is not None:
+                        log(result)
+                    results.append(result)
+                    if "seconds" in result:
+                        series.append(result)
+                exponent = scaling_exponent([r["size"] for r in series], [r["seconds"] for r in series])
+                scaling.append({"backend": backend, "kind": kind, "exponent": exponent})
+    finally:
+        runner.close()
+    return {
+        "environment": {
+            "python": platform.python_version(),
+            "numpy": np.__version__,
+            "sympy": sp.__version__,
+            "machine": platform.machine(),
+        },
+        "seed": seed,
+        "repeats": repeats,
+        "results": results,
+        "scaling": scaling,
+    }
+
+
+def compare(report, baseline, factor=REGRESSION_FACTOR):
+    """Return a list of messages for cases that got slower or bigger than the baseline by `factor`."""
+    previous = {
+        (result["backend"], result["kind"], result["size"]): result
+        for result in baseline.get("results", [])
+        if "seconds" in result
+    }
+    regressions = []
+    for result in report["results"]:
+        old = previous.get((result["backend"], result["kind"], result["size"]))
+        if old is None:
+            continue
+        case = f"{result['backend']} on {result['size']}x{result['size']} {result['kind']}"
+        if "error" in result:
+            regressions.append(f"{case}: now fails with {result['error']}")
+            continue
+        if result["seconds"] >= MIN_COMPARABLE_SECONDS and result["seconds"] > factor * old["seconds"]:
+            regressions.append(f"{case}: {result['seconds']:.4g}s, was {old['seconds']:.4g}s")
+        if result["peak_bytes"] >= MIN_COMPARABLE_BYTES and result["peak_bytes"] > factor * old["peak_bytes"]:
+            regressions.append(f"{case}: peak {result['peak_bytes']:,} bytes, was {old['peak_bytes']:,}")
+    return regressions
+
+
+def format_result(result):
+    case = f"{result['backend']:<20} {result['kind']:<10} {result['size']:>4}"
+    if "error" in result:
+        return f"{case}  error: {result['error']}"
+    return f"{case}  {result['seconds'] * 1000:10.3f} ms  {result['peak_bytes'] / 1024:10.1f} KiB"
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the determinant and matrix-operation backends.")
+    parser.add_argument("--backends", nargs="+", choices=list(BACKENDS), default=list(BACKENDS), help="Backends to run")
+    parser.add_argument("--kinds", nargs="+", choices=MATRIX_KINDS, default=list(MATRIX_KINDS), help="Input matrices")
+    parser.add_argument("--sizes", nargs="+", type=int, default=list(DEFAULT_SIZES), help="Matrix sizes")
+    parser.add_argument("--repeats", type=int, default=DEFAULT_REPEATS, help="Timed runs per case")
+    parser.add_argument("--max-seconds", type=float, default=DEFAULT_MAX_SECONDS, help="Time budget per case")
+    parser.add_argument("--timeout", type=float, default=DEFAULT_TIMEOUT, help="Seconds before a case is stopped")
+    parser.add_argument("--seed", type=int, default=0, help="Seed of the input matrices")
+    parser.add_argument("-o", "--output", help="Write the JSON results here")
+    parser.add_argument("--baseline", default=DEFAULT_BASELINE, help="Baseline JSON to compare against")
+    parser.add_argument("--update-baseline", action="store_true", help="Store these results as the new baseline")
+    args = parser.parse_args(argv)
+
+    report = run_benchmarks(
+        args.backends, args.kinds, args.sizes, args.repeats, args.max_seconds, args.seed, args.timeout,
+        log=lambda result: print(format_result(result), file=sys.stderr),
+    )
+    for entry in report["scaling"]:
+        if entry["exponent"] is not None:
+            print(f"{entry['backend']:<20} {entry['kind']:<10} time ~ n^{entry['exponent']}", file=sys.stderr)
+
+    if args.output:
+        with open(args.output, "w") as file:
+            json.dump(report, file, indent=1)
+    if args.update_baseline:
+        os.makedirs(os.path.dirname(os.path.abspath(args.baseline)), exist_ok=True)
+        with open(args.baseline, "w") as file:
+            json.dump(report, file, indent=1)
+        return 0
+
+    if not os.path.exists(args.baseline):
+        print(f"No baseline at {args.baseline}; run with --update-baseline to store one", file=sys.stderr)
+        return 0
+    with open(args.baseline) as file:
+        regressions = compare(report, json.load(file))
+    for message in regressions:
+        print(f"REGRESSION {message}", file=sys.stderr)
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
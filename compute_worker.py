@@ -0,0 +1,237 @@
+"""Run heavy computations in a separate process so the Tk window stays responsive.
+
+The worker is a plain Python subprocess running this file, so it never re-imports the
+GUI script (which builds its window at import time). Jobs name a function by module
+and attribute; arguments and results are pickled over the worker's stdin/stdout.
+Cancelling a job, or running past its time budget, kills the worker process; a fresh
+one is started for the next job. `preload` starts the worker ahead of the first job
+and imports the modules it will need, so that job does not wait for them. Each job
+is measured in the worker (parse/compute time, optionally peak memory and a cProfile
+dump) and the numbers come back with it.
+"""
+import importlib
+import os
+import pickle
+import queue
+import struct
+import subprocess
+import sys
+import threading
+import time
+
+from instrumentation import measure_call
+
+
+# How often the Tk event loop checks for results, in milliseconds (about 60 fps)
+POLL_INTERVAL_MS = 16
+
+HEADER = struct.Struct("!I")
+
+# Job ids start at 1, so the replies to a preload match no job and are dropped
+PRELOAD_JOB_ID = 0
+
+
+def write_message(stream, message):
+    data = pickle.dumps(message)
+    stream.write(HEADER.pack(len(data)) + data)
+    stream.flush()
+
+
+def read_message(stream):
+    header = stream.read(HEADER.size)
+    if len(header) < HEADER.size:
+        raise EOFError
+    (size,) = HEADER.unpack(header)
+    return pickle.loads(stream.read(size))
+
+
+def import_modules(module_names):
+    for name in module_names:
+        importlib.import_module(name)
+
+
+class JobCancelled(Exception):
+    """Raised (passed to on_error) when a job is cancelled or runs out of time."""
+
+
+class BackgroundWorker:
+    """Run one job at a time in a worker process and report back on the Tk event loop.
+
+    `submit` returns immediately. `on_done(result)` or `on_error(exception)` is later
+    called on the Tk thread, and `on_progress(message, elapsed)` is called while the
+    job runs so the GUI can show what is happening. `on_stats(stats)` receives the
+    worker's measurements of a finished job just before `on_done` or `on_error`.
+    """
+
+    def __init__(self, root, on_progress=None):
+        self.root = root
+        self.on_progress = on_progress
+        self.process = None
+        self.messages = queue.Queue()
+        self.job = None
+        self.next_job_id = 0
+        self.polling = False
+        self.preloaded = ()
+
+    @property
+    def busy(self):
+        return self.job is not None
+
+    def submit(self, label, function, args=(), on_done=None, on_error=None, time_budget=None, on_stats=None,
+               trace_memory=False, profile_path=None):
+        """Start `function(*args)` in the worker, cancelling any job still running.
+
+        `function` must live in an importable module (not the GUI script itself).
+        `trace_memory` and `profile_path` are passed to instrumentation.measure_call.
+        """
+        if self.busy:
+            self.cancel("Superseded by a new job")
+
+        self._ensure_process()
+        self.next_job_id += 1
+        self.job = {
+            "id": self.next_job_id,
+            "label": label,
+            "on_done": on_done,
+            "on_error": on_error,
+            "on_stats": on_stats,
+            "started": time.monotonic(),
+            "deadline": time.monotonic() + time_budget if time_budget else None,
+            "status": "starting",
+        }
+        options = {"trace_memory": trace_memory, "profile_path": profile_path}
+        write_message(self.process.stdin, (self.next_job_id, function.__module__, function.__name__, args, options))
+        self._report(f"{label}: starting")
+        if not self.polling:
+            self.polling = True
+            self.root.after(POLL_INTERVAL_MS, self._poll)
+
+    def preload(self, *module_names):
+        """Start the worker process now and import `module_names` in it while it is idle.
+
+        The modules are imported again in every replacement worker started after a cancel.
+        """
+        self.preloaded = module_names
+        self._ensure_process()
+        options = {"trace_memory": False}
+        write_message(self.process.stdin, (PRELOAD_JOB_ID, __name__, "import_modules", (module_names,), options))
+
+    def cancel(self, reason="Cancelled"):
+        """Stop the running job by killing the worker process."""
+        if self.process is not None:
+            self.process.kill()
+            self.process.wait()
+            self.process = None
+            if self.preloaded:
+                self.preload(*self.preloaded)
+        job, self.job = self.job, None
+        if job is not None:
+            self._report(f"{job['label']}: {reason.lower()}")
+            if job["on_error"] is not None:
+                job["on_error"](JobCancelled(reason))
+
+    def shutdown(self):
+        self.job = None
+        if self.process is not None:
+            self.process.kill()
+            self.process = None
+
+    def _ensure_process(self):
+        if self.process is not None and self.process.poll() is None:
+            return
+        self.process = subprocess.Popen(
+            [sys.executable, os.path.abspath(__file__)],
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            cwd=os.path.dirname(os.path.abspath(__file__)),
+        )
+        # Results are read on a thread so the Tk thread never blocks on the pipe
+        threading.Thread(target=self._read_results, args=(self.process,), daemon=True).start()
+
+    def _read_results(self, process):
+        try:
+            while True:
+                self.messages.put((process, read_message(process.stdout)))
+        except (EOFError, OSError, pickle.UnpicklingError):
+            self.messages.put((process, ("exit", None, None, None)))
+
+    def _report(self, message):
+        if self.on_progress is not None:
+            elapsed = time.monotonic() - self.job["started"] if self.job else 0.0
+            self.on_progress(message, elapsed)
+
+    def _poll(self):
+        while True:
+            try:
+                process, (kind, job_id, payload, stats) = self.messages.get_nowait()
+            except queue.Empty:
+                break
+            # Ignore messages from killed workers and superseded jobs
+            if process is not self.process or self.job is None or (job_id is not None and job_id != self.job["id"]):
+                continue
+            if kind == "progress":
+                self.job["status"] = payload
+                continue
+
+            job, self.job = self.job, None
+            if stats is not None and job["on_stats"] is not None:
+                job["on_stats"](stats)
+            if kind == "done":
+                self._finish(job, "done", job["on_done"], payload)
+            elif kind == "error":
+                self._finish(job, "failed", job["on_error"], payload)
+            else:
+                self.process = None
+                self._finish(job, "failed", job["on_error"], RuntimeError("The worker process exited unexpectedly"))
+
+        if self.job is not None:
+            if self.job["deadline"] is not None and time.monotonic() > self.job["deadline"]:
+                self.cancel("Time budget exceeded")
+            else:
+                self._report(f"{self.job['label']}: {self.job['status']}")
+
+        if self.job is not None:
+            self.root.after(POLL_INTERVAL_MS, self._poll)
+        else:
+            self.polling = False
+
+    def _finish(self, job, status, callback, payload):
+        elapsed = time.monotonic() - job["started"]
+        if self.on_progress is not None:
+            self.on_progress(f"{job['label']}: {status}", elapsed)
+        if callback is not None:
+            callback(payload)
+
+
+def worker_main():
+    """Serve jobs from stdin until it is closed."""
+    # Keep the protocol on a private copy of stdout; stray prints go to stderr
+    protocol_in = sys.stdin.buffer
+    protocol_out = os.fdopen(os.dup(sys.stdout.fileno()), "wb")
+    os.dup2(sys.stderr.fileno(), sys.stdout.fileno())
+    sys.stdout = sys.stderr
+
+    while True:
+        try:
+            job_id, module_name, function_name, args, options = read_message(protocol_in)
+        except EOFError:
+            return
+        write_message(protocol_out, ("progress", job_id, "computing", None))
+        stats = {}
+        try:
+            function = getattr(importlib.import_module(module_name), function_name)
+            result = measure_call(function, args, stats, **options)
+            # write_message pickles before writing, so an unpicklable result is reported as an error
+            write_message(protocol_out, ("done", job_id, result, stats))
+            continue
+        except Exception as e:
+            error = e
+        try:
+            pickle.dumps(error)
+        except Exception:
+            error = RuntimeError(str(error))
+        write_message(protocol_out, ("error", job_id, error, stats))
+
+
+if __name__ == "__main__":
+    worker_main()
@@ -0,0 +1,298 @@
+from concurrent.futures import ProcessPoolExecutor
+from fractions import Fraction
+from math import isqrt, lcm
+
+from matrix_view import as_view
+
+
+# Largest size the Laplace expansion is offered for (n! growth)
+LAPLACE_MAX_SIZE = 8
+
+# Word-size primes for the modular determinant are taken downwards from here
+MODULAR_PRIME_START = 2 ** 62
+
+# Below this size the modular determinant runs in-process instead of in a pool
+MODULAR_POOL_MIN_SIZE = 40
+
+# Bases that make Miller-Rabin deterministic for every n < 3.3 * 10^24
+MILLER_RABIN_BASES = (2, 3, 5, 7, 11, 13, 17, 19, 23, 29, 31, 37, 41)
+
+
+def to_fraction_matrix(matrix):
+    """Convert every entry of a 2D list into a Fraction."""
+    return [[Fraction(value) for value in row] for row in matrix]
+
+
+def scale_to_integers(matrix):
+    """Scale each row to integers, returning the rows and the total scale factor."""
+    scaled = []
+    scale = 1
+    for row in matrix:
+        row = [Fraction(value) for value in row]
+        denominator = lcm(*(value.denominator for value in row)) if row else 1
+        scaled.append([value.numerator * (denominator // value.denominator) for value in row])
+        scale *= denominator
+    return scaled, scale
+
+
+def determinant_recursive(matrix):
+    """Calculate determinant recursively using Laplace expansion.
+
+    Minors are taken as views over the input, so no entries are copied while recursing.
+    """
+    matrix = as_view(matrix)
+    size = len(matrix)
+
+    # Base case: 1x1 matrix
+    if size == 1:
+        return matrix[0, 0]
+
+    # Base case: 2x2 matrix
+    if size == 2:
+        return matrix[0, 0] * matrix[1, 1] - matrix[0, 1] * matrix[1, 0]
+
+    # Recursive case
+    det = Fraction(0)
+    for col in range(size):
+        # Laplace expansion along the first row
+        det += ((-1) ** col) * matrix[0, col] * determinant_recursive(matrix.minor(0, col))
+
+    return det
+
+
+def determinant_bareiss_integer(rows):
+    """Calculate the determinant of an integer matrix with fraction-free Bareiss elimination.
+
+    The rows are modified in place.
+    """
+    size = len(rows)
+    sign = 1
+    previous_pivot = 1
+
+    for k in range(size - 1):
+        # Find a non-zero pivot, swapping rows if needed
+        if rows[k][k] == 0:
+            for i in range(k + 1, size):
+                if rows[i][k] != 0:
+                    rows[k], rows[i] = rows[i], rows[k]
+                    sign = -sign
+                    break
+            else:
+                return 0
+
+        pivot = rows[k][k]
+        pivot_row = rows[k]
+        for i in range(k + 1, size):
+            row = rows[i]
+            factor = row[k]
+            for j in range(k + 1, size):
+                # Exact division: every intermediate is a minor of the input
+                row[j] = (pivot * row[j] - factor * pivot_row[j]) // previous_pivot
+            row[k] = 0
+        previous_pivot = pivot
+
+    return sign * rows[size - 1][size - 1]
+
+
+def determinant_bareiss(matrix):
+    """Calculate the exact determinant of a rational matrix in O(n^3) as a Fraction."""
+    size = len(matrix)
+    if size == 0:
+        return Fraction(1)
+    if any(len(row) != size for row in matrix):
+        raise ValueError("Matrix must be square!")
+
+    rows, scale = scale_to_integers(matrix)
+    return Fraction(determinant_bareiss_integer(rows), scale)
+
+
+def determinant_minor_expansion(matrix, stats=None):
+    """Calculate a division-free determinant by Laplace expansion with memoized minors.
+
+    Works for any ring entries (Fraction, sympy expressions, polynomials). Each minor
+    is keyed by the bitmask of the columns still in use, so only O(n * 2^n) ring
+    operations are needed. If `stats` is a dict it receives the number of minors
+    computed and reused.
+    """
+    size = len(matrix)
+    if any(len(row) != size for row in matrix):
+        raise ValueError("Matrix must be square!")
+
+    cache = {}
+    counts = {"minors_computed": 0, "minors_reused": 0}
+
+    def minor(mask):
+        # The minor uses the last popcount(mask) rows and the columns set in mask
+        if mask in cache:
+            counts["minors_reused"] += 1
+            return cache[mask]
+
+        row = matrix[size - mask.bit_count()]
+        det = 0
+        position = 0
+        for col in range(size):
+            if not mask & (1 << col):
+                continue
+            entry = row[col]
+            if entry != 0:
+                rest = mask & ~(1 << col)
+                term = entry * minor(rest) if rest else entry
+                det = det - term if position % 2 else det + term
+            position += 1
+
+        counts["minors_computed"] += 1
+        cache[mask] = det
+        return det
+
+    result = minor((1 << size) - 1) if size else 1
+    if stats is not None:
+        stats.update(counts)
+    return result
+
+
+def is_prime(n):
+    """Deterministic Miller-Rabin primality test for word-size integers."""
+    if n < 2:
+        return False
+    for p in MILLER_RABIN_BASES:
+        if n % p == 0:
+            return n == p
+
+    d, r = n - 1, 0
+    while d % 2 == 0:
+        d //= 2
+        r += 1
+
+    for a in MILLER_RABIN_BASES:
+        x = pow(a, d, n)
+        if x == 1 or x == n - 1:
+            continue
+        for _ in range(r - 1):
+            x = x * x % n
+            if x == n - 1:
+                break
+        else:
+            return False
+    return True
+
+
+def word_primes(count, start=MODULAR_PRIME_START):
+    """Return the first `count` primes below `start`, largest first."""
+    primes = []
+    candidate = start - 1 if start % 2 == 0 else start - 2
+    while len(primes) < count:
+        if is_prime(candidate):
+            primes.append(candidate)
+        candidate -= 2
+    return primes
+
+
+def hadamard_bound(rows):
+    """Return an integer upper bound on |det| of an integer matrix (Hadamard's inequality)."""
+    bound = 1
+    for row in rows:
+        bound *= isqrt(sum(value * value for value in row)) + 1
+    return bound
+
+
+def determinant_mod_p(rows, p):
+    """Calculate the determinant of an integer matrix modulo the prime p."""
+    size = len(rows)
+    work = [[value % p for value in row] for row in rows]
+    det = 1
+
+    for k in range(size):
+        # Find a non-zero pivot, swapping rows if needed
+        pivot_index = next((i for i in range(k, size) if work[i][k]), None)
+        if pivot_index is None:
+            return 0
+        if pivot_index != k:
+            work[k], work[pivot_index] = work[pivot_index], work[k]
+            det = -det
+
+        pivot_row = work[k]
+        pivot = pivot_row[k]
+        det = det * pivot % p
+        inverse = pow(pivot, -1, p)
+        for i in range(k + 1, size):
+            row = work[i]
+            factor = row[k] * inverse % p
+            if factor:
+                for j in range(k + 1, size):
+                    row[j] = (row[j] - factor * pivot_row[j]) % p
+
+    return det % p
+
+
+# Matrix shared with pool workers, sent once per process instead of once per prime
+_worker_rows = None
+
+
+def _init_worker(rows):
+    global _worker_rows
+    _worker_rows = rows
+
+
+def _worker_determinant_mod_p(p):
+    return determinant_mod_p(_worker_rows, p)
+
+
+def determinant_modular_integer(rows, workers=None):
+    """Calculate the exact determinant of an integer matrix with multi-prime CRT.
+
+    One elimination is done per word-size prime, spread across a process pool
+    when `workers` is not 1 and the matrix is large enough. Enough primes are used
+    that their product exceeds twice the Hadamard bound, which fixes the sign.
+    """
+    size = len(rows)
+    if size == 0:
+        return 1
+
+    # Every prime exceeds 2^(bits - 1), so this many of them multiply past 2 * bound
+    prime_bits = MODULAR_PRIME_START.bit_length() - 1
+    count = (2 * hadamard_bound(rows)).bit_length() // (prime_bits - 1) + 1
+    primes = word_primes(count)
+
+    if workers == 1 or size < MODULAR_POOL_MIN_SIZE or len(primes) == 1:
+        residues = [determinant_mod_p(rows, p) for p in primes]
+    else:
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(rows,)) as executor:
+            residues = list(executor.map(_worker_determinant_mod_p, primes))
+
+    # Chinese Remainder Theorem, combining one prime at a time
+    det, modulus = 0, 1
+    for p, residue in zip(primes, residues):
+        det += modulus * ((residue - det) * pow(modulus, -1, p) % p)
+        modulus *= p
+
+    # Map back to the symmetric range (-modulus/2, modulus/2]
+    if det > modulus // 2:
+        det -= modulus
+    return det
+
+
+def determinant_modular(matrix, workers=None):
+    """Calculate the exact determinant of a rational matrix as a Fraction using modular arithmetic."""
+    size = len(matrix)
+    if size == 0:
+        return Fraction(1)
+    if any(len(row) != size for row in matrix):
+        raise ValueError("Matrix must be square!")
+
+    rows, scale = scale_to_integers(matrix)
+    return Fraction(determinant_modular_integer(rows, workers=workers), scale)
+
+
+def determinant(matrix, method="bareiss", workers=None):
+    """Calculate the determinant using the selected method ("bareiss", "modular", "minors" or "laplace")."""
+    if method == "bareiss":
+        return determinant_bareiss(matrix)
+    if method == "modular":
+        return determinant_modular(matrix, workers=workers)
+    if method == "minors":
+        return determinant_minor_expansion(matrix)
+    if method == "laplace":
+        if len(matrix) > LAPLACE_MAX_SIZE:
+            raise ValueError(f"Laplace expansion is limited to {LAPLACE_MAX_SIZE}x{LAPLACE_MAX_SIZE} matrices!")
+        return Fraction(determinant_recursive(to_fraction_matrix(matrix)))
+    raise ValueError(f"Unknown determinant method: {method}")
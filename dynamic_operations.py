@@ -0,0 +1,330 @@
+"""Computations behind the DynamicCalculator buttons.
+
+Each function takes the grid contents as strings, or the unedited NumPy array of an
+imported matrix (plus any parameters), and returns sympy results, so it can run in
+the background worker process and be displayed by the GUI afterwards.
+"""
+import math
+from fractions import Fraction
+
+import numpy as np
+import sympy as sp
+
+import exponential_engine
+import matrix_structure
+import numeric_backend
+import power_engine
+import sparse_matrix
+from factorization_cache import SingularMatrixError, default_cache, factorize
+from instrumentation import phase, timed
+from live_update import LiveMatrix
+from matrix_import import is_numeric_array, parse_tokens
+from matrix_view import MatrixView
+from numeric_backend import UnreliableResult, choose_backend
+from result_cache import persistent_result
+from sparse_matrix import SparseMatrix, is_sparse_enough
+
+
+class OperationError(Exception):
+    """An error whose message is shown to the user as-is."""
+
+
+# Function to parse input as float or fraction
+def parse_input(value):
+    try:
+        return sp.Rational(value)  # Use sympy's Rational for precise fraction handling
+    except (ValueError, TypeError, SyntaxError, sp.SympifyError):
+        raise ValueError(f"Invalid input: {value}")
+
+
+@timed("parse")
+def parse_rationals(rows):
+    """Convert a 2D list of strings into a 2D list of sympy Rationals."""
+    if is_numeric_array(rows):
+        return [[sp.Rational(value.numerator, value.denominator) for value in row] for row in parse_fraction_matrix(rows)]
+    return [[parse_input(value) for value in row] for row in rows]
+
+
+@timed("parse")
+def parse_matrix(rows):
+    """Convert a 2D list of strings into a sympy Matrix of Rationals."""
+    return sp.Matrix(parse_rationals(rows))
+
+
+@timed("parse")
+def parse_fraction_matrix(rows):
+    """Convert a 2D list of strings into a 2D list of Fractions."""
+    try:
+        if is_numeric_array(rows):
+            # Floats are read as their shortest decimal form, matching what a user would type
+            return [[Fraction(repr(value)) if isinstance(value, float) else Fraction(value) for value in row] for row in rows.tolist()]
+        return [[Fraction(value.strip()) for value in row] for row in rows]
+    except (ValueError, ZeroDivisionError) as e:
+        raise ValueError(f"Invalid input: {e}")
+
+
+def with_backend(rows, mode, numeric_function, exact_function, *params):
+    """Run an operation in float64 when `choose_backend` allows it, else exactly.
+
+    `exact_function` returns (result, structure), where structure is the Structure
+    it detected (or None). Returns (result, note) where the note names the backend,
+    why it was used and the detected structure. An unreliable float64 result is
+    discarded and recomputed exactly.
+    """
+    use_float64, reason = choose_backend(rows, mode)
+    if use_float64:
+        try:
+            result, detail = numeric_function(parse_tokens(rows), *params)
+            return result, f"float64 LAPACK: {reason}, {detail}"
+        except UnreliableResult as e:
+            reason = f"{reason}, but {e}"
+    result, structure = exact_function(rows, *params)
+    if structure is None:
+        return result, f"exact: {reason}"
+    return result, f"exact: {reason}; structure: {structure}"
+
+
+def with_sparse_backend(rows, mode, function):
+    """Run a sparse elimination in float64 or exactly, as `choose_backend` decides.
+
+    Only the nonzero entries are parsed. Returns (result, note) like with_backend;
+    a float64 run that raises UnreliableResult is redone exactly.
+    """
+    use_float64, reason = choose_backend(rows, mode)
+    if use_float64:
+        with phase("parse"):
+            matrix = SparseMatrix.from_grid(rows, exact=False)
+        try:
+            result = function(matrix)
+            return result, f"float64: {reason}; structure: sparse ({matrix.density:.1%} nonzeros), Markowitz pivoting"
+        except UnreliableResult as e:
+            reason = f"{reason}, but {e}"
+    with phase("parse"):
+        matrix = SparseMatrix.from_grid(rows, exact=True)
+    return function(matrix), f"exact: {reason}; structure: sparse ({matrix.density:.1%} nonzeros), Markowitz pivoting"
+
+
+def to_view(matrix):
+    """Wrap a float64 result array in a MatrixView so it is displayed like exact results."""
+    return MatrixView.from_rows(matrix.tolist()) if hasattr(matrix, "dtype") else matrix
+
+
+# Determinant, RREF and inverse share one cached elimination per matrix,
+# unless the matrix structure gives a cheaper kernel
+def exact_determinant(rows):
+    matrix = parse_fraction_matrix(rows)
+    structure = matrix_structure.analyze(matrix)
+    value = matrix_structure.determinant(matrix, structure, dense=lambda block: factorize(block).determinant())
+    if value is None:
+        value = factorize(matrix).determinant()
+    return value, structure
+
+
+def exact_rref(rows):
+    factorization = factorize(parse_fraction_matrix(rows))
+    return (MatrixView.from_rows(factorization.rref), factorization.rank), None
+
+
+def exact_inverse(rows):
+    matrix = parse_fraction_matrix(rows)
+    structure = matrix_structure.analyze(matrix)
+    try:
+        inverse_rows = matrix_structure.inverse(matrix, structure)
+        if inverse_rows is None:
+            inverse_rows = factorize(matrix).inverse()
+    except SingularMatrixError as e:
+        raise OperationError(str(e))
+    return MatrixView.from_rows(inverse_rows), structure
+
+
+def sparse_rref(matrix):
+    reduced, pivots = sparse_matrix.rref(matrix)
+    return MatrixView.from_rows(reduced.to_dense()), len(pivots)
+
+
+def sparse_determinant(matrix):
+    if matrix.exact:
+        return sparse_matrix.determinant(matrix)
+    # Like the dense path, a (nearly) singular float64 matrix is redone exactly
+    value, ratio = sparse_matrix.float_determinant(matrix)
+    if math.isinf(ratio):
+        raise UnreliableResult("the matrix is (nearly) singular")
+    if ratio > numeric_backend.MAX_CONDITION:
+        raise UnreliableResult(f"pivot ratio {ratio:.1e} is too large for float64")
+    return value
+
+
+def determinant(rows, mode="auto"):
+    if is_sparse_enough(rows):
+        return with_sparse_backend(rows, mode, sparse_determinant)
+    return with_backend(rows, mode, numeric_backend.determinant, exact_determinant)
+
+
+def rref(rows, mode="auto"):
+    if is_sparse_enough(rows):
+        return with_sparse_backend(rows, mode, sparse_rref)
+    (matrix, rank), note = with_backend(rows, mode, numeric_backend.rref, exact_rref)
+    return (to_view(matrix), rank), note
+
+
+def inverse(rows, mode="auto"):
+    matrix, note = with_backend(rows, mode, numeric_backend.inverse, exact_inverse)
+    return to_view(matrix), note
+
+
+def transpose(rows):
+    # The transpose is only displayed, so read it through a view instead of copying
+    return MatrixView.from_rows(parse_fraction_matrix(rows)).T
+
+
+def live_matrix(rows, mode="auto"):
+    """Factor the grid once for live mode; returns (LiveMatrix, note).
+
+    The GUI keeps the LiveMatrix and applies rank-one updates to it as cells change.
+    """
+    use_float64, reason = choose_backend(rows, mode)
+    matrix = parse_tokens(rows) if use_float64 else parse_fraction_matrix(rows)
+    return LiveMatrix(matrix, exact=not use_float64), f"{'float64' if use_float64 else 'exact'}: {reason}"
+
+
+def cache_stats():
+    """Return the hit/miss counters of the factorization cache in this process."""
+    return default_cache.stats()
+
+
+def exact_eigenvalues(rows):
+    matrix = parse_rationals(rows)
+    structure = matrix_structure.analyze(matrix)
+    values = matrix_structure.eigenvalues(
+        matrix, structure, dense=lambda block: list(sp.Matrix(block).eigenvals().keys())
+    )
+    if values is None:
+        values = list(sp.Matrix(matrix).eigenvals().keys())  # Get eigenvalues only
+    return values, structure
+
+
+def eigenvalues(rows, mode="auto"):
+    return with_backend(rows, mode, numeric_backend.eigenvalues, exact_eigenvalues)
+
+
+# Eigenvectors, diagonalizations and high-precision n^A are slow, so their results are kept on disk
+@persistent_result("diagonalize", version=1)
+def exact_diagonalization(matrix):
+    sympy_matrix = sp.Matrix(matrix)
+    if not sympy_matrix.is_diagonalizable():
+        return None
+    P, D = sympy_matrix.diagonalize()
+    return P, D, P.inv(), P.transpose()
+
+
+def diagonalize(rows):
+    """Return P, D, P^-1 and P^T with A = P D P^-1."""
+    result = exact_diagonalization(parse_rationals(rows))
+    if result is None:
+        raise OperationError("The matrix is not diagonalizable!")
+    return result
+
+
+def power_from_diagonalization(p_rows, d_rows, n):
+    """Compute A^n = P D^n P^-1 from P and D."""
+    P = parse_fraction_matrix(p_rows)
+    D = parse_fraction_matrix(d_rows)
+
+    # Calculate P^-1
+    try:
+        P_inv = factorize(P).inverse()
+    except SingularMatrixError:
+        raise OperationError("Matrix P is not invertible. Cannot compute P^-1.")
+
+    # A diagonal D only needs its diagonal raised to the n-th power, which scales the columns of P
+    structure = matrix_structure.analyze(D)
+    if structure.diagonal:
+        diagonal_power = [D[j][j] ** n for j in range(len(D))]
+        P_D_power = [[value * power for value, power in zip(row, diagonal_power)] for row in P]
+    else:
+        D_power = matrix_structure.power(D, structure, n, dense=power_engine.matrix_power)
+        if D_power is None:
+            D_power = power_engine.matrix_power(D, n)
+        P_D_power = power_engine.multiply(P, D_power)
+
+    # Compute A^n = P * D^n * P^-1
+    return MatrixView.from_rows(power_engine.multiply(P_D_power, P_inv)), f"exact: D is {structure}"
+
+
+@persistent_result("eigenvects", version=1)
+def exact_eigenvectors(matrix):
+    return sp.Matrix(matrix).eigenvects()
+
+
+def eigenvectors(rows):
+    return exact_eigenvectors(parse_rationals(rows))
+
+
+def exact_matrix_power(rows, n):
+    matrix = parse_fraction_matrix(rows)
+    structure = matrix_structure.analyze(matrix)
+    power = matrix_structure.power(matrix, structure, n, dense=power_engine.matrix_power)
+    if power is None:
+        power = power_engine.matrix_power(matrix, n)
+    return MatrixView.from_rows(power), structure
+
+
+def matrix_power(rows, n, mode="auto", modulus=None):
+    """Compute A^n; with a modulus m, compute A^n mod m exactly."""
+    if modulus is not None:
+        try:
+            power = power_engine.matrix_power(parse_fraction_matrix(rows), n, modulus=modulus)
+        except ValueError as e:
+            raise OperationError(str(e))
+        return MatrixView.from_rows(power), f"exact: integer arithmetic mod {modulus}"
+    matrix, note = with_backend(rows, mode, numeric_backend.matrix_power, exact_matrix_power, n)
+    return to_view(matrix), note
+
+
+def parse_scalar(scalar_choice):
+    """Convert the n^A scalar choice into "e", "pi" or a positive Fraction."""
+    if scalar_choice in ("e", "pi"):
+        return scalar_choice
+    try:
+        n = Fraction(scalar_choice.strip())
+        if n <= 0:
+            raise ValueError("The scalar n must be positive!")
+    except (ValueError, ZeroDivisionError) as e:
+        raise OperationError(f"Invalid scalar value: {e}")
+    return n
+
+
+@persistent_result("scalar_power", version=2)
+def precise_scalar_power(matrix, n, digits):
+    return exponential_engine.scalar_power_digits(matrix, n, digits)
+
+
+def scalar_power(rows, scalar_choice, digits=None):
+    """Compute n^A = exp(A ln n) in float64, or to `digits` significant digits with mpmath."""
+    n = parse_scalar(scalar_choice)
+    if digits is None:
+        try:
+            result, note = exponential_engine.scalar_power(parse_tokens(rows), n)
+        except OverflowError as e:
+            raise OperationError(str(e))
+        return to_view(result), note
+    result = precise_scalar_power(parse_fraction_matrix(rows), n, digits)
+    return MatrixView.from_rows(result), f"mpmath Taylor with scaling and squaring, {digits} significant digits"
+
+
+def orthogonal_diagonalization(rows, decimals=4):
+    """Return A, P, D and P^T with A = P D P^T, rounded to `decimals` decimal places."""
+    try:
+        matrix_a = parse_tokens(rows)
+    except ValueError:
+        raise OperationError("Please enter valid numeric values!")
+
+    try:
+        values, P = numeric_backend.symmetric_eigendecomposition(matrix_a)
+    except ValueError as e:
+        raise OperationError(str(e))
+
+    # Round values to the requested number of decimal places (adding 0.0 clears -0.0)
+    P = MatrixView.from_rows((P.round(decimals) + 0.0).tolist())
+    D = MatrixView.from_rows((np.diag(values).round(decimals) + 0.0).tolist())
+    return MatrixView.from_rows(matrix_a.tolist()), P, D, P.T
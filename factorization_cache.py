@@ -0,0 +1,170 @@
+import hashlib
+from collections import OrderedDict
+from fractions import Fraction
+
+
+# Default memory cap for cached factorizations
+DEFAULT_MAX_BYTES = 64 * 1024 * 1024
+
+# Rough size of one Fraction object plus its list slot, before its digits
+FRACTION_OVERHEAD_BYTES = 120
+
+
+class SingularMatrixError(ValueError):
+    """Raised when the inverse of a singular (or non-square) matrix is requested."""
+
+
+def matrix_key(matrix):
+    """Return a content hash of a rational matrix, independent of how entries were written."""
+    digest = hashlib.blake2b(digest_size=16)
+    digest.update(f"{len(matrix)}x{len(matrix[0]) if matrix else 0}:".encode())
+    for row in matrix:
+        digest.update(",".join(f"{value.numerator}/{value.denominator}" for value in row).encode())
+        digest.update(b";")
+    return digest.hexdigest()
+
+
+class Factorization:
+    """One exact Gauss-Jordan elimination of A (augmented with I when square).
+
+    Determinant, rank, RREF, pivots, inverse, null space and column space are all
+    read off this single elimination.
+    """
+
+    def __init__(self, matrix):
+        self.matrix = [[Fraction(value) for value in row] for row in matrix]
+        self.rows = len(self.matrix)
+        self.cols = len(self.matrix[0]) if self.matrix else 0
+        square = self.rows == self.cols
+
+        # Augment with the identity so the same elimination yields the inverse
+        width = self.cols * 2 if square else self.cols
+        work = [
+            row + [Fraction(int(i == j)) for j in range(self.cols)] if square else row[:]
+            for i, row in enumerate(self.matrix)
+        ]
+
+        sign = 1
+        det = Fraction(1)
+        pivots = []
+        r = 0
+        for c in range(self.cols):
+            if r == self.rows:
+                break
+            pivot_row = next((i for i in range(r, self.rows) if work[i][c] != 0), None)
+            if pivot_row is None:
+                continue
+            if pivot_row != r:
+                work[r], work[pivot_row] = work[pivot_row], work[r]
+                sign = -sign
+
+            pivot = work[r][c]
+            det *= pivot
+            row = work[r]
+            for j in range(c, width):
+                row[j] /= pivot
+
+            for i in range(self.rows):
+                factor = work[i][c]
+                if i != r and factor != 0:
+                    other = work[i]
+                    for j in range(c, width):
+                        other[j] -= factor * row[j]
+
+            pivots.append(c)
+            r += 1
+
+        self.pivots = tuple(pivots)
+        self.rank = len(pivots)
+        self.rref = [row[:self.cols] for row in work]
+        self._inverse = [row[self.cols:] for row in work] if square and self.rank == self.rows else None
+        self._determinant = sign * det if square and self.rank == self.rows else Fraction(0)
+
+    def determinant(self):
+        if self.rows != self.cols:
+            raise ValueError("Determinant is only defined for square matrices!")
+        return self._determinant
+
+    def inverse(self):
+        if self._inverse is None:
+            raise SingularMatrixError("Matrix is singular and not invertible!")
+        return self._inverse
+
+    def nullspace(self):
+        """Return a basis of the null space, one vector per free column."""
+        basis = []
+        for free in (c for c in range(self.cols) if c not in self.pivots):
+            vector = [Fraction(0)] * self.cols
+            vector[free] = Fraction(1)
+            for i, pivot in enumerate(self.pivots):
+                vector[pivot] = -self.rref[i][free]
+            basis.append(vector)
+        return basis
+
+    def columnspace(self):
+        """Return a basis of the column space: the pivot columns of A."""
+        return [[row[c] for row in self.matrix] for c in self.pivots]
+
+    def estimated_bytes(self):
+        stored = [self.matrix, self.rref, self._inverse or []]
+        total = 0
+        for matrix in stored:
+            for row in matrix:
+                for value in row:
+                    total += FRACTION_OVERHEAD_BYTES + (value.numerator.bit_length() + value.denominator.bit_length()) // 8
+        return total
+
+
+class FactorizationCache:
+    """LRU cache of factorizations keyed by matrix content, bounded by estimated memory."""
+
+    def __init__(self, max_bytes=DEFAULT_MAX_BYTES):
+        self.max_bytes = max_bytes
+        self.entries = OrderedDict()
+        self.total_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, matrix):
+        """Return the factorization of a matrix, computing it only on a cache miss."""
+        matrix = [[Fraction(value) for value in row] for row in matrix]
+        key = matrix_key(matrix)
+        if key in self.entries:
+            self.hits += 1
+            self.entries.move_to_end(key)
+            return self.entries[key][0]
+
+        self.misses += 1
+        factorization = Factorization(matrix)
+        size = factorization.estimated_bytes()
+        if size <= self.max_bytes:
+            self.entries[key] = (factorization, size)
+            self.total_bytes += size
+            while self.total_bytes > self.max_bytes:
+                _, (_, evicted_size) = self.entries.popitem(last=False)
+                self.total_bytes -= evicted_size
+                self.evictions += 1
+        return factorization
+
+    def clear(self):
+        self.entries.clear()
+        self.total_bytes = 0
+
+    def stats(self):
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "entries": len(self.entries),
+            "bytes": self.total_bytes,
+        }
+
+
+# Shared cache for the calculators
+default_cache = FactorizationCache()
+
+
+def factorize(matrix):
+    """Return the cached factorization of a matrix from the shared cache."""
+    return default_cache.get(matrix)
@@ -1,12 +1,18 @@
 import tkinter as tk
 from tkinter import messagebox
-import sympy as sp
+from fractions import Fraction
+import sparse_matrix
+from factorization_cache import factorize
+from lazy_import import LazyModule, warm_up
+from matrix_grid import MatrixGrid, MAX_MATRIX_SIZE
+from matrix_import import add_import_buttons
+from sparse_matrix import SparseMatrix, is_sparse_enough
 
 # Function to parse input as float or fraction
 def parse_input(value):
     try:
-        return sp.Rational(value)
-    except ValueError:
+        return Fraction(value.strip())
+    except (ValueError, ZeroDivisionError):
         raise ValueError(f"Invalid input: {value}")
 
 # Function to clear the previous result display
@@ -14,22 +20,32 @@ def clear_result_frame():
     for widget in result_frame.winfo_children():
         widget.destroy()
 
+# Function to read the matrix grid as Fractions, checking it matches the size fields.
+# Mostly-zero matrices are read as a SparseMatrix, straight from an unedited import if there is one
+def read_matrix(rows, cols):
+    if (entries.rows, entries.cols) != (rows, cols):
+        raise ValueError("The matrix size changed; click Generate Matrix again.")
+    source = entries.unedited_source()
+    if hasattr(source, "dtype") and is_sparse_enough(source):
+        return SparseMatrix.from_array(source, exact=True)
+    values = entries.values()
+    if is_sparse_enough(values):
+        return SparseMatrix.from_strings(values)
+    return [[parse_input(value) for value in row] for row in values]
+
 # Function to calculate the basis for the image of T
 def calculate_image_basis():
     try:
         rows = int(row_entry.get())
         cols = int(col_entry.get())
 
-        matrix = []
-        for i in range(rows):
-            row = []
-            for j in range(cols):
-                value = entries[i][j].get()
-                row.append(parse_input(value))
-            matrix.append(row)
+        matrix = read_matrix(rows, cols)
 
-        sympy_matrix = sp.Matrix(matrix)
-        image_basis = sympy_matrix.columnspace()
+        # Image and kernel share one cached elimination of the matrix (sparse ones are eliminated directly)
+        if isinstance(matrix, SparseMatrix):
+            image_basis = sparse_matrix.columnspace(matrix)
+        else:
+            image_basis = factorize(matrix).columnspace()
 
         clear_result_frame()
         tk.Label(result_frame, text="Basis for im(T):", font=("Arial", 16, "bold")).pack()
@@ -46,16 +62,13 @@ def calculate_kernel_basis():
         rows = int(row_entry.get())
         cols = int(col_entry.get())
 
-        matrix = []
-        for i in range(rows):
-            row = []
-            for j in range(cols):
-                value = entries[i][j].get()
-                row.append(parse_input(value))
-            matrix.append(row)
+        matrix = read_matrix(rows, cols)
 
-        sympy_matrix = sp.Matrix(matrix)
-        kernel_basis = sympy_matrix.nullspace()
+        # Image and kernel share one cached elimination of the matrix (sparse ones are eliminated directly)
+        if isinstance(matrix, SparseMatrix):
+            kernel_basis = sparse_matrix.nullspace(matrix)
+        else:
+            kernel_basis = factorize(matrix).nullspace()
 
         clear_result_frame()
         tk.Label(result_frame, text="Basis for ker(T):", font=("Arial", 16, "bold")).pack()
@@ -67,7 +80,7 @@ def calculate_kernel_basis():
         messagebox.showerror("Error", f"Invalid input: {e}")
 
 # Function to create matrix inputs
-def create_matrix_inputs():
+def create_matrix_inputs(array=None):
     for widget in matrix_frame.winfo_children():
         widget.destroy()
 
@@ -75,22 +88,29 @@ def create_matrix_inputs():
         rows = int(row_entry.get())
         cols = int(col_entry.get())
 
-        if rows > 10 or cols > 10:
-            messagebox.showerror("Error", "Maximum matrix size is 10x10!")
+        if rows > MAX_MATRIX_SIZE or cols > MAX_MATRIX_SIZE:
+            messagebox.showerror("Error", f"Maximum matrix size is {MAX_MATRIX_SIZE}x{MAX_MATRIX_SIZE}!")
             return
 
+        # Only the visible cells get widgets, so large matrices stay responsive
         global entries
-        entries = []
-        for i in range(rows):
-            row_entries = []
-            for j in range(cols):
-                entry = tk.Entry(matrix_frame, width=8, font=("Arial", 16), justify="center")
-                entry.grid(row=i, column=j, padx=10, pady=10)
-                row_entries.append(entry)
-            entries.append(row_entries)
+        entries = MatrixGrid(matrix_frame, rows, cols)
+        entries.pack()
+        if array is not None:
+            entries.load(array)
     except ValueError:
         messagebox.showerror("Error", "Please enter valid numbers for rows and columns.")
 
+# Function to fill the grid with a pasted or imported matrix
+def load_imported_matrix(array):
+    rows, cols = array.shape
+    row_entry.delete(0, tk.END)
+    row_entry.insert(0, str(rows))
+    col_entry.delete(0, tk.END)
+    col_entry.insert(0, str(cols))
+    create_matrix_inputs(array)
+
+
 # Main window
 root = tk.Tk()
 root.title("Matrix Transformation Calculator")
@@ -132,6 +152,9 @@ generate_button = tk.Button(
 )
 generate_button.grid(row=0, column=4, padx=20)
 
+# Buttons to paste or import a whole matrix at once
+add_import_buttons(size_frame, load_imported_matrix, bg="#2c3e50").grid(row=1, column=0, columnspan=5, pady=(10, 0))
+
 matrix_frame = tk.Frame(root, bg="#34495e")
 matrix_frame.pack(pady=20)
 
@@ -144,4 +167,7 @@ tk.Button(button_frame, text="Basis for ker(T)", command=calculate_kernel_basis,
 result_frame = tk.Frame(root, bg="#34495e")
 result_frame.pack(pady=20)
 
+# NumPy is only needed to paste or import a matrix; load it while the window sits idle
+warm_up(root, LazyModule("numpy"))
+
 root.mainloop()
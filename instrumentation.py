@@ -0,0 +1,208 @@
+"""Per-operation timings, peak memory and profiles for the calculator windows.
+
+An operation has four phases: reading the grid widgets ("read", in the GUI),
+parsing the entries ("parse") and computing ("compute"), both in the worker
+process, and building the result widgets ("render", back in the GUI). Parsing
+code marks itself with the `phase` context manager or the `timed` decorator; it
+costs nothing when no operation is being measured. The worker measures each job
+with `measure_call`, which can also trace the peak memory with tracemalloc and
+dump a cProfile profile. The GUI merges everything into an OperationTrace.
+
+Traces are kept in a TraceLog and can be exported as JSONL. Set
+LINALG_TRACE_FILE to also append every trace to that file as it happens.
+"""
+import cProfile
+import functools
+import json
+import os
+import time
+import tracemalloc
+from collections import deque
+from contextlib import contextmanager
+
+
+# Traces kept in memory for export
+MAX_TRACES = 1000
+
+# Order in which phases are reported
+PHASES = ("read", "parse", "compute", "render")
+
+# Phase timings of the call being measured in this process, or None
+_active = None
+
+# Phases currently open, so nested parse helpers are only counted once
+_open_phases = set()
+
+
+def default_trace_dir():
+    path = os.environ.get("LINALG_TRACE_DIR")
+    if path:
+        return path
+    return os.path.join(os.path.expanduser("~"), ".cache", "linear-algebra-project", "traces")
+
+
+@contextmanager
+def phase(name):
+    """Count the time spent in the block towards `name` of the call being measured."""
+    if _active is None or name in _open_phases:
+        yield
+        return
+    _open_phases.add(name)
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        _open_phases.discard(name)
+        _active[name] = _active.get(name, 0.0) + time.perf_counter() - start
+
+
+def timed(name):
+    """Decorator form of `phase`."""
+    def decorator(function):
+        @functools.wraps(function)
+        def wrapper(*args, **kwargs):
+            with phase(name):
+                return function(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def measure_call(function, args, stats, trace_memory=True, profile_path=None):
+    """Return function(*args), filling `stats` with its parse/compute split and peak memory.
+
+    `stats` is filled even when the function raises. With `profile_path`, the call
+    runs under cProfile and the profile is written there.
+    """
+    global _active
+    _active = {}
+    _open_phases.clear()
+    profiler = cProfile.Profile() if profile_path else None
+    if trace_memory:
+        tracemalloc.start()
+    start = time.perf_counter()
+    try:
+        if profiler is not None:
+            return profiler.runcall(function, *args)
+        return function(*args)
+    finally:
+        total = time.perf_counter() - start
+        if trace_memory:
+            stats["peak_bytes"] = tracemalloc.get_traced_memory()[1]
+            tracemalloc.stop()
+        parse_seconds = _active.get("parse", 0.0)
+        stats["parse"] = parse_seconds
+        stats["compute"] = max(total - parse_seconds, 0.0)
+        _active = None
+        if profiler is not None:
+            os.makedirs(os.path.dirname(os.path.abspath(profile_path)), exist_ok=True)
+            profiler.dump_stats(profile_path)
+            stats["profile"] = profile_path
+
+
+def describe_matrix(value):
+    """Return (rows, cols, type) of a grid read as strings or an imported NumPy array."""
+    shape = getattr(value, "shape", None)
+    if shape is not None and len(shape) == 2:
+        return shape[0], shape[1], str(value.dtype)
+    if isinstance(value, list) and value and isinstance(value[0], list):
+        return len(value), len(value[0]), "text"
+    return None, None, type(value).__name__
+
+
+def format_seconds(seconds):
+    return f"{seconds * 1000:.0f} ms" if seconds < 10 else f"{seconds:.1f} s"
+
+
+def format_bytes(size):
+    for unit in ("B", "KiB", "MiB"):
+        if size < 1024:
+            return f"{size:.0f} {unit}" if unit == "B" else f"{size:.1f} {unit}"
+        size /= 1024
+    return f"{size:.1f} GiB"
+
+
+class OperationTrace:
+    """Phase timings, peak memory and matrix description of one operation."""
+
+    def __init__(self, label, matrix=None):
+        self.label = label
+        self.started = time.time()
+        self.rows, self.cols, self.matrix_type = describe_matrix(matrix)
+        self.phases = {}
+        self.peak_bytes = None
+        self.backend = None
+        self.profile = None
+        self.status = "done"
+
+    def add(self, name, seconds):
+        self.phases[name] = self.phases.get(name, 0.0) + seconds
+
+    @contextmanager
+    def phase(self, name):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.add(name, time.perf_counter() - start)
+
+    def merge(self, stats):
+        """Take the parse/compute split, peak memory and profile reported by the worker."""
+        for name in ("parse", "compute"):
+            if name in stats:
+                self.add(name, stats[name])
+        self.peak_bytes = stats.get("peak_bytes", self.peak_bytes)
+        self.profile = stats.get("profile", self.profile)
+
+    def note_result(self, result):
+        # Most operations return (value, note), where the note names the backend
+        if isinstance(result, tuple) and len(result) == 2 and isinstance(result[1], str):
+            self.backend = result[1]
+
+    def to_dict(self):
+        return {
+            "operation": self.label,
+            "started": self.started,
+            "status": self.status,
+            "rows": self.rows,
+            "cols": self.cols,
+            "matrix_type": self.matrix_type,
+            "phases": {name: round(self.phases[name], 6) for name in PHASES if name in self.phases},
+            "peak_bytes": self.peak_bytes,
+            "backend": self.backend,
+            "profile": self.profile,
+        }
+
+    def summary(self):
+        """One line for the status bar."""
+        size = f" {self.rows}x{self.cols} {self.matrix_type}" if self.rows is not None else ""
+        parts = [f"{name} {format_seconds(self.phases[name])}" for name in PHASES if name in self.phases]
+        if self.peak_bytes is not None:
+            parts.append(f"peak {format_bytes(self.peak_bytes)}")
+        text = f"{self.label}{size}: {self.status}; " + ", ".join(parts)
+        if self.profile:
+            text += f"; profile: {self.profile}"
+        return text
+
+
+class TraceLog:
+    """The most recent traces, exportable as JSONL, optionally appended to a file as they come."""
+
+    def __init__(self, max_traces=MAX_TRACES, path=None):
+        self.traces = deque(maxlen=max_traces)
+        self.path = path if path is not None else os.environ.get("LINALG_TRACE_FILE") or None
+
+    def __len__(self):
+        return len(self.traces)
+
+    def append(self, trace):
+        record = trace.to_dict()
+        self.traces.append(record)
+        if self.path:
+            with open(self.path, "a") as file:
+                file.write(json.dumps(record) + "\n")
+
+    def export(self, path):
+        with open(path, "w") as file:
+            for record in self.traces:
+                file.write(json.dumps(record) + "\n")
+        return len(self.traces)
@@ -0,0 +1,49 @@
+"""Heavy modules (sympy, NumPy and the operations built on them) imported on first use.
+
+Importing sympy alone takes most of a second, so the calculator windows and the
+helpers they load at startup refer to these modules through a LazyModule, which
+imports the real module the first time one of its attributes is used. Once the
+window is up, `warm_up` imports them on a background thread, so by the time the
+user clicks a button they are usually loaded already.
+"""
+import importlib
+import threading
+
+
+# Delay after the event loop starts before warming up, so the window is drawn first
+WARM_UP_DELAY_MS = 200
+
+
+class LazyModule:
+    """Stands in for a module, importing it when one of its attributes is first used."""
+
+    def __init__(self, name):
+        self._name = name
+        self._module = None
+
+    @property
+    def loaded(self):
+        return self._module is not None
+
+    def load(self):
+        # import_module holds the module's import lock, so a warm-up thread and the
+        # Tk thread asking at the same time both get the one fully imported module
+        if self._module is None:
+            self._module = importlib.import_module(self._name)
+        return self._module
+
+    def __getattr__(self, attribute):
+        return getattr(self.load(), attribute)
+
+    def __repr__(self):
+        state = "loaded" if self.loaded else "not loaded"
+        return f"<lazy module {self._name!r} ({state})>"
+
+
+def warm_up(root, *modules, delay_ms=WARM_UP_DELAY_MS):
+    """Import the LazyModules on a daemon thread shortly after the Tk event loop starts."""
+    def load_all():
+        for module in modules:
+            module.load()
+
+    root.after(delay_ms, lambda: threading.Thread(target=load_all, daemon=True).start())
@@ -0,0 +1,115 @@
+"""Keep det(A), A^-1 and rank(A) current while single entries of A are edited.
+
+Changing a_ij by delta is the rank-one update A' = A + delta e_i e_j^T. With
+g = 1 + delta (A^-1)_ji, the matrix determinant lemma gives det(A') = g det(A),
+and Sherman-Morrison gives A'^-1 = A^-1 - (delta / g) (A^-1 e_i)(e_j^T A^-1).
+Both take O(n^2) instead of a new O(n^3) elimination. A rank-one update changes
+the rank by at most one, so A' has rank n when g != 0 and rank n - 1 when g = 0.
+
+There is nothing to update from a singular or non-square matrix, so `update`
+then returns False and the caller refactors. Float state is also refactored
+every REFACTOR_INTERVAL updates, or when |g| is small, because rounding errors
+build up and are amplified by 1 / |g|.
+"""
+from fractions import Fraction
+
+import numpy as np
+
+from factorization_cache import Factorization, SingularMatrixError
+from numeric_backend import MAX_CONDITION
+
+
+# Float rank-one updates applied before the factorization is recomputed
+REFACTOR_INTERVAL = 50
+
+# Float updates with |1 + delta (A^-1)_ji| below this are recomputed instead
+MIN_FLOAT_DENOMINATOR = 1e-8
+
+
+class LiveMatrix:
+    """A matrix with its determinant, inverse and rank, updated one entry at a time."""
+
+    def __init__(self, matrix, exact=True):
+        self.exact = exact
+        if exact:
+            self.matrix = [[Fraction(value) for value in row] for row in matrix]
+        else:
+            self.matrix = np.array(matrix, dtype=np.float64)
+        self.rows = len(self.matrix)
+        self.cols = len(self.matrix[0]) if self.rows else 0
+        self.refactor()
+
+    @property
+    def square(self):
+        return self.rows == self.cols
+
+    def refactor(self):
+        """Recompute determinant, inverse and rank from scratch."""
+        self.updates = 0
+        if self.exact:
+            factorization = Factorization(self.matrix)
+            self.rank = factorization.rank
+            self.determinant = factorization.determinant() if self.square else None
+            try:
+                # Copied, because the updates below modify the inverse in place
+                self.inverse = [row[:] for row in factorization.inverse()]
+            except SingularMatrixError:
+                self.inverse = None
+            return
+
+        self.rank = int(np.linalg.matrix_rank(self.matrix)) if self.matrix.size else 0
+        self.determinant = float(np.linalg.det(self.matrix)) if self.square and self.rows else None
+        self.inverse = None
+        if self.square and self.rank == self.rows and np.linalg.cond(self.matrix) <= MAX_CONDITION:
+            self.inverse = np.linalg.inv(self.matrix)
+
+    def parse(self, text):
+        """Read a cell as this matrix reads entries; raises ValueError while it is incomplete."""
+        try:
+            value = Fraction(text.strip())
+        except (ValueError, ZeroDivisionError):
+            raise ValueError(f"Invalid input: {text}")
+        return value if self.exact else float(value)
+
+    def update(self, row, col, value):
+        """Set one entry; return False if the caller has to refactor instead."""
+        delta = value - self.matrix[row][col]
+        self.matrix[row][col] = value
+        if delta == 0:
+            return True
+        if self.inverse is None:
+            return False
+        if self.exact:
+            return self._exact_update(row, col, delta)
+        return self._float_update(row, col, delta)
+
+    def _exact_update(self, row, col, delta):
+        inverse = self.inverse
+        denominator = 1 + delta * inverse[col][row]
+        if denominator == 0:
+            # The edit made A singular: one rank lost, no inverse left to update
+            self.determinant = Fraction(0)
+            self.rank = self.rows - 1
+            self.inverse = None
+            return True
+        self.determinant *= denominator
+        scale = delta / denominator
+        column = [inverse[k][row] * scale for k in range(self.rows)]
+        pivot_row = inverse[col][:]
+        for k, factor in enumerate(column):
+            if factor:
+                target = inverse[k]
+                for j, value in enumerate(pivot_row):
+                    if value:
+                        target[j] -= factor * value
+        self.updates += 1
+        return True
+
+    def _float_update(self, row, col, delta):
+        denominator = 1 + delta * self.inverse[col, row]
+        if abs(denominator) < MIN_FLOAT_DENOMINATOR or self.updates >= REFACTOR_INTERVAL:
+            return False
+        self.determinant *= denominator
+        self.inverse -= np.outer(self.inverse[:, row], self.inverse[col, :]) * (delta / denominator)
+        self.updates += 1
+        return True
@@ -0,0 +1,292 @@
+"""Lazy matrix expressions such as (A*B*C + D)^T * E.
+
+Parsing builds a tree and computes nothing. Transposes are pushed down to the
+matrices with (XY)^T = Y^T X^T and (X + Y)^T = X^T + Y^T. There they are free
+views that matmul reads in transposed order. Nested products are flattened into
+chains, and each chain is multiplied in the order chosen by the matrix-chain
+dynamic program. Sums accumulate in place into one buffer, and the last product
+of each term writes into a reused scratch buffer. Only the result and the
+operands of each chain are ever materialized. Values are float arrays or
+RationalMatrix values.
+"""
+import re
+
+import numpy as np
+
+
+# Names, the transpose suffixes ^T and ', operators and parentheses
+TOKEN = re.compile(r"\s*(?:([A-Za-z_]\w*)|(\^\s*T\b|')|(\S))")
+
+
+def _describe(shape):
+    return f"{shape[0]}x{shape[1]}"
+
+
+class Leaf:
+    """A named matrix, possibly read transposed."""
+
+    def __init__(self, name, base_shape, transposed=False):
+        self.name = name
+        self.base_shape = tuple(base_shape)
+        self.transposed = transposed
+
+    @property
+    def shape(self):
+        return self.base_shape[::-1] if self.transposed else self.base_shape
+
+    def transpose(self):
+        return Leaf(self.name, self.base_shape, not self.transposed)
+
+    def multiplications(self):
+        return 0
+
+    def __str__(self):
+        return self.name + ("^T" if self.transposed else "")
+
+
+class Product:
+    """A chain of two or more factors, multiplied in the cheapest order."""
+
+    def __init__(self, factors):
+        self.factors = factors
+
+    @property
+    def shape(self):
+        return (self.factors[0].shape[0], self.factors[-1].shape[1])
+
+    @property
+    def dims(self):
+        return [self.factors[0].shape[0]] + [factor.shape[1] for factor in self.factors]
+
+    def transpose(self):
+        return Product([factor.transpose() for factor in reversed(self.factors)])
+
+    def multiplications(self):
+        """Scalar multiplications in the chosen chain order."""
+        return sum(factor.multiplications() for factor in self.factors) + chain_order(self.dims)[0]
+
+    def order(self):
+        """The chosen parenthesization, e.g. "(A*(B*C))"."""
+        _, split = chain_order(self.dims)
+
+        def group(i, j):
+            if i == j:
+                return str(self.factors[i])
+            k = split[i][j]
+            return f"({group(i, k)}*{group(k + 1, j)})"
+
+        return group(0, len(self.factors) - 1)
+
+    def __str__(self):
+        return self.order()
+
+
+class Sum:
+    """A signed sum of terms of the same shape."""
+
+    def __init__(self, terms):
+        self.terms = terms
+
+    @property
+    def shape(self):
+        return self.terms[0][1].shape
+
+    def transpose(self):
+        return Sum([(sign, term.transpose()) for sign, term in self.terms])
+
+    def multiplications(self):
+        return sum(term.multiplications() for _, term in self.terms)
+
+    def __str__(self):
+        text = ""
+        for sign, term in self.terms:
+            text += ("-" if sign < 0 else "+" if text else "") + str(term)
+        return f"({text})"
+
+
+def multiply(x, y):
+    if x.shape[1] != y.shape[0]:
+        raise ValueError(f"Cannot multiply a {_describe(x.shape)} matrix by a {_describe(y.shape)} matrix")
+    # (-X)Y = X(-Y) = -(XY), so a negated factor does not have to be materialized
+    for negated, other, left in ((x, y, True), (y, x, False)):
+        if isinstance(negated, Sum) and len(negated.terms) == 1 and negated.terms[0][0] < 0:
+            inner = negated.terms[0][1]
+            return negate(multiply(inner, other) if left else multiply(other, inner))
+    factors_x = x.factors if isinstance(x, Product) else [x]
+    factors_y = y.factors if isinstance(y, Product) else [y]
+    return Product(factors_x + factors_y)
+
+
+def add(x, y, sign=1):
+    if x.shape != y.shape:
+        raise ValueError(f"Cannot add a {_describe(x.shape)} matrix and a {_describe(y.shape)} matrix")
+    return Sum(_terms(x, 1) + _terms(y, sign))
+
+
+def negate(x):
+    terms = _terms(x, -1)
+    # -(-X) is X again, which keeps a product flat
+    if len(terms) == 1 and terms[0][0] > 0:
+        return terms[0][1]
+    return Sum(terms)
+
+
+def _terms(node, sign):
+    if isinstance(node, Sum):
+        return [(sign * term_sign, term) for term_sign, term in node.terms]
+    return [(sign, node)]
+
+
+class _Parser:
+    def __init__(self, text, shapes):
+        self.tokens = []
+        for match in TOKEN.finditer(text):
+            name, transpose, symbol = match.groups()
+            self.tokens.append(("name", name) if name else ("T", "^T") if transpose else ("symbol", symbol))
+        self.position = 0
+        self.shapes = shapes
+        # Multiplications if the expression were evaluated as written, left to right
+        self.written_cost = 0
+
+    def peek(self):
+        return self.tokens[self.position][1] if self.position < len(self.tokens) else None
+
+    def take(self):
+        token = self.tokens[self.position]
+        self.position += 1
+        return token
+
+    def expression(self):
+        node = self.term()
+        while self.peek() in ("+", "-"):
+            sign = 1 if self.take()[1] == "+" else -1
+            node = add(node, self.term(), sign)
+        return node
+
+    def term(self):
+        node = self.unary()
+        while self.peek() in ("*", "@"):
+            self.take()
+            factor = self.unary()
+            node = multiply(node, factor)
+            self.written_cost += node.shape[0] * factor.shape[0] * node.shape[1]
+        return node
+
+    def unary(self):
+        if self.peek() == "-":
+            self.take()
+            return negate(self.unary())
+        node = self.primary()
+        while self.position < len(self.tokens) and self.tokens[self.position][0] == "T":
+            self.take()
+            node = node.transpose()
+        return node
+
+    def primary(self):
+        if self.position >= len(self.tokens):
+            raise ValueError("The expression ends too early")
+        kind, value = self.take()
+        if kind == "name":
+            if value not in self.shapes:
+                raise ValueError(f"Unknown matrix: {value}")
+            return Leaf(value, self.shapes[value])
+        if value == "(":
+            node = self.expression()
+            if self.peek() != ")":
+                raise ValueError("Missing closing parenthesis")
+            self.take()
+            return node
+        raise ValueError(f"Unexpected '{value}' in the expression")
+
+
+def parse(text, shapes):
+    """Build the lazy tree for `text`, given {name: (rows, cols)}; raises ValueError.
+
+    Returns (tree, multiplications needed to evaluate the text left to right).
+    """
+    parser = _Parser(text, shapes)
+    node = parser.expression()
+    if parser.position < len(parser.tokens):
+        raise ValueError(f"Unexpected '{parser.peek()}' in the expression")
+    return node, parser.written_cost
+
+
+def chain_order(dims):
+    """Return (multiplications, split) for the cheapest order of a chain with dimensions `dims`.
+
+    Factor i is dims[i] x dims[i + 1]; split[i][j] is where the product of
+    factors i..j is divided last.
+    """
+    count = len(dims) - 1
+    cost = [[0] * count for _ in range(count)]
+    split = [[0] * count for _ in range(count)]
+    for length in range(2, count + 1):
+        for i in range(count - length + 1):
+            j = i + length - 1
+            cost[i][j] = None
+            for k in range(i, j):
+                candidate = cost[i][k] + cost[k + 1][j] + dims[i] * dims[k + 1] * dims[j + 1]
+                if cost[i][j] is None or candidate < cost[i][j]:
+                    cost[i][j] = candidate
+                    split[i][j] = k
+    return cost[0][count - 1], split
+
+
+def evaluate(node, values, out=None):
+    """Materialize a tree, with {name: matrix} values. A float product may write into `out`."""
+    if isinstance(node, Leaf):
+        value = values[node.name]
+        return value.T if node.transposed else value
+
+    if isinstance(node, Product):
+        operands = [evaluate(factor, values) for factor in node.factors]
+        _, split = chain_order(node.dims)
+
+        def chain(i, j, target=None):
+            if i == j:
+                return operands[i]
+            k = split[i][j]
+            left = chain(i, k)
+            right = chain(k + 1, j)
+            if target is not None and isinstance(left, np.ndarray) and isinstance(right, np.ndarray):
+                return np.matmul(left, right, out=target)
+            return left @ right
+
+        return chain(0, len(operands) - 1, out)
+
+    result = None
+    scratch = None
+    for sign, term in node.terms:
+        if result is not None and isinstance(result, np.ndarray) and isinstance(term, Product):
+            if scratch is None:
+                scratch = np.empty(result.shape, dtype=result.dtype)
+            value = evaluate(term, values, out=scratch)
+        else:
+            value = evaluate(term, values)
+        if result is None:
+            # Leaves are the caller's matrices, so the accumulator must be a copy
+            if sign < 0:
+                result = -value
+            elif isinstance(term, Leaf) and isinstance(value, np.ndarray):
+                result = np.array(value, dtype=np.float64)
+            else:
+                result = value
+        elif isinstance(result, np.ndarray):
+            if sign > 0:
+                result += value
+            else:
+                result -= value
+        else:
+            result = result + value if sign > 0 else result - value
+    return result
+
+
+def evaluate_expression(text, values):
+    """Return (result, note) for an expression over {name: matrix} values."""
+    node, left_to_right = parse(text, {name: value.shape for name, value in values.items()})
+    planned = node.multiplications()
+    result = evaluate(node, values)
+    if isinstance(node, Leaf) and isinstance(result, np.ndarray):
+        result = np.array(result, dtype=np.float64)
+    note = f"order {node}: {planned:,} multiplications ({left_to_right:,} left to right)"
+    return result, note
@@ -0,0 +1,333 @@
+import tkinter as tk
+
+
+# Largest matrix the grid editor accepts
+MAX_MATRIX_SIZE = 5000
+
+# Cells visible at once before the grid starts scrolling
+MAX_VISIBLE_ROWS = 10
+MAX_VISIBLE_COLS = 10
+
+
+class MatrixGrid:
+    """A virtualized matrix input grid drawn on a canvas.
+
+    Only the entry widgets needed for the visible viewport are created. They are
+    recycled while scrolling, so the widget count stays constant no matter how
+    large the matrix is. Values come from an optional backing source (a 2D list
+    or NumPy array, possibly memory-mapped) that is only formatted for visible
+    cells, plus a dict of the cells the user has typed into.
+
+    `grid[i][j]` returns a cell handle with the same `get`, `insert`, `delete`
+    and `focus_set` methods as a `tk.Entry`, so code written against a 2D list of
+    entries keeps working. `on_edit(row, col)`, if given, is called whenever the
+    user changes the text of a cell (not for navigation keys, nor for values the
+    grid itself puts into recycled entries).
+    """
+
+    def __init__(
+        self,
+        master,
+        rows,
+        cols,
+        width=8,
+        font=("Arial", 16),
+        pad=10,
+        bg="#34495e",
+        navigate=None,
+        visible_rows=MAX_VISIBLE_ROWS,
+        visible_cols=MAX_VISIBLE_COLS,
+        on_edit=None,
+    ):
+        if rows < 1 or cols < 1:
+            raise ValueError("Matrix must have at least one row and one column!")
+        if rows > MAX_MATRIX_SIZE or cols > MAX_MATRIX_SIZE:
+            raise ValueError(f"Maximum matrix size is {MAX_MATRIX_SIZE}x{MAX_MATRIX_SIZE}!")
+
+        self.rows = rows
+        self.cols = cols
+        self.source = None
+        self.edits = {}
+        self.navigate = navigate or self.focus_cell
+        self.on_edit = on_edit
+        # True while the grid writes into its own entries, which is not an edit
+        self.filling = False
+
+        self.frame = tk.Frame(master, bg=bg)
+
+        # Measure one entry to size the cells
+        probe = tk.Entry(self.frame, width=width, font=font)
+        self.cell_width = probe.winfo_reqwidth() + pad
+        self.cell_height = probe.winfo_reqheight() + pad
+        probe.destroy()
+
+        self.visible_rows = min(rows, visible_rows)
+        self.visible_cols = min(cols, visible_cols)
+
+        self.canvas = tk.Canvas(
+            self.frame,
+            width=self.visible_cols * self.cell_width,
+            height=self.visible_rows * self.cell_height,
+            scrollregion=(0, 0, cols * self.cell_width, rows * self.cell_height),
+            xscrollincrement=self.cell_width,
+            yscrollincrement=self.cell_height,
+            bg=bg,
+            highlightthickness=0,
+        )
+        self.canvas.grid(row=0, column=0)
+
+        if rows > self.visible_rows:
+            y_scrollbar = tk.Scrollbar(self.frame, orient="vertical", command=self.canvas.yview)
+            y_scrollbar.grid(row=0, column=1, sticky="ns")
+            self.canvas.configure(yscrollcommand=lambda *args: self._on_scroll(y_scrollbar, *args))
+        if cols > self.visible_cols:
+            x_scrollbar = tk.Scrollbar(self.frame, orient="horizontal", command=self.canvas.xview)
+            x_scrollbar.grid(row=1, column=0, sticky="ew")
+            self.canvas.configure(xscrollcommand=lambda *args: self._on_scroll(x_scrollbar, *args))
+
+        # One spare row and column so partially scrolled cells are still covered
+        self.pool = []
+        self.text_of_entry = {}
+        self.cell_of_entry = {}
+        self.entry_of_cell = {}
+        for _ in range(min(rows, self.visible_rows + 1) * min(cols, self.visible_cols + 1)):
+            text = tk.StringVar(self.canvas)
+            entry = tk.Entry(self.canvas, textvariable=text, width=width, font=font, justify="center")
+            self.text_of_entry[entry] = text
+            window_id = self.canvas.create_window(0, 0, window=entry, anchor="nw", state="hidden")
+            entry.bind("<Up>", lambda e, widget=entry: self._move(widget, -1, 0))
+            entry.bind("<Down>", lambda e, widget=entry: self._move(widget, 1, 0))
+            entry.bind("<Left>", lambda e, widget=entry: self._move(widget, 0, -1))
+            entry.bind("<Right>", lambda e, widget=entry: self._move(widget, 0, 1))
+            # Typing, pasting and deleting all change the variable; arrow and modifier keys do not
+            text.trace_add("write", lambda *args, widget=entry: self._edited(widget))
+            self._bind_wheel(entry)
+            self.pool.append((entry, window_id))
+        self._bind_wheel(self.canvas)
+
+        self.layout_pending = False
+        self._layout()
+
+    # Geometry management is forwarded to the outer frame
+    def grid(self, **kwargs):
+        self.frame.grid(**kwargs)
+
+    def pack(self, **kwargs):
+        self.frame.pack(**kwargs)
+
+    def __len__(self):
+        return self.rows
+
+    def __getitem__(self, row):
+        if not 0 <= row < self.rows:
+            raise IndexError(row)
+        return _GridRow(self, row)
+
+    def __iter__(self):
+        for row in range(self.rows):
+            yield _GridRow(self, row)
+
+    def get(self, row, col):
+        entry = self.entry_of_cell.get((row, col))
+        if entry is not None:
+            return entry.get()
+        return self._stored(row, col)
+
+    def set(self, row, col, value):
+        self.edits[(row, col)] = str(value)
+        entry = self.entry_of_cell.get((row, col))
+        if entry is not None:
+            self._fill(entry, str(value))
+
+    def values(self):
+        """Return every cell as a 2D list of strings."""
+        self._flush()
+        return [[self._stored(i, j) for j in range(self.cols)] for i in range(self.rows)]
+
+    def load(self, source):
+        """Back the grid with a 2D list or array without converting its entries.
+
+        Entries are only formatted when their cell scrolls into view or is read.
+        """
+        shape = getattr(source, "shape", None) or (len(source), len(source[0]) if len(source) else 0)
+        if tuple(shape) != (self.rows, self.cols):
+            raise ValueError("Loaded values do not match the grid size!")
+        self.source = source
+        self.edits = {}
+        for (row, col), entry in self.entry_of_cell.items():
+            self._fill(entry, self._stored(row, col))
+
+    def unedited_source(self):
+        """Return the backing source if no cell was edited since it was loaded, else None."""
+        self._flush()
+        return None if self.edits else self.source
+
+    def _stored(self, row, col):
+        value = self.edits.get((row, col))
+        if value is not None:
+            return value
+        if self.source is None:
+            return ""
+        return format_cell(self.source[row][col])
+
+    def focus_cell(self, row, col):
+        """Scroll a cell into view and move the keyboard focus to it."""
+        if not (0 <= row < self.rows and 0 <= col < self.cols):
+            return
+        first_row, first_col = self._first_visible()
+        if row < first_row:
+            self.canvas.yview_moveto(row / self.rows)
+        elif row >= first_row + self.visible_rows:
+            self.canvas.yview_moveto((row - self.visible_rows + 1) / self.rows)
+        if col < first_col:
+            self.canvas.xview_moveto(col / self.cols)
+        elif col >= first_col + self.visible_cols:
+            self.canvas.xview_moveto((col - self.visible_cols + 1) / self.cols)
+        self._layout()
+        entry = self.entry_of_cell.get((row, col))
+        if entry is not None:
+            entry.focus_set()
+            entry.icursor(tk.END)
+
+    def _move(self, entry, row_step, col_step):
+        row, col = self.cell_of_entry[entry]
+        self.navigate(row + row_step, col + col_step)
+        return "break"
+
+    def _edited(self, entry):
+        cell = self.cell_of_entry.get(entry)
+        if self.on_edit is not None and cell is not None and not self.filling:
+            self.on_edit(*cell)
+
+    def _fill(self, entry, text):
+        self.filling = True
+        try:
+            self.text_of_entry[entry].set(text)
+        finally:
+            self.filling = False
+
+    def _bind_wheel(self, widget):
+        widget.bind("<MouseWheel>", lambda e: self._scroll_rows(-1 if e.delta > 0 else 1))
+        widget.bind("<Button-4>", lambda e: self._scroll_rows(-1))
+        widget.bind("<Button-5>", lambda e: self._scroll_rows(1))
+
+    def _scroll_rows(self, step):
+        if self.rows > self.visible_rows:
+            self.canvas.yview_scroll(step, "units")
+
+    def _on_scroll(self, scrollbar, first, last):
+        scrollbar.set(first, last)
+        # Coalesce bursts of scroll events into one relayout
+        if not self.layout_pending:
+            self.layout_pending = True
+            self.canvas.after_idle(self._layout)
+
+    def _first_visible(self):
+        first_row = int(self.canvas.canvasy(0) // self.cell_height)
+        first_col = int(self.canvas.canvasx(0) // self.cell_width)
+        return max(0, first_row), max(0, first_col)
+
+    def _flush(self):
+        # Record what was typed in the visible entries, skipping unchanged cells
+        for (row, col), entry in self.entry_of_cell.items():
+            text = entry.get()
+            if text != self._stored(row, col):
+                self.edits[(row, col)] = text
+
+    def _layout(self):
+        """Bind the pooled entries to the cells in the current viewport."""
+        self.layout_pending = False
+        self._flush()
+        first_row, first_col = self._first_visible()
+        pool_cols = min(self.cols, self.visible_cols + 1)
+        focused = self.canvas.focus_get()
+        focused_cell = self.cell_of_entry.get(focused)
+
+        self.entry_of_cell = {}
+        self.cell_of_entry = {}
+        for index, (entry, window_id) in enumerate(self.pool):
+            row = first_row + index // pool_cols
+            col = first_col + index % pool_cols
+            if row >= self.rows or col >= self.cols:
+                self.canvas.itemconfigure(window_id, state="hidden")
+                continue
+            self.entry_of_cell[(row, col)] = entry
+            self.cell_of_entry[entry] = (row, col)
+            self._fill(entry, self._stored(row, col))
+            self.canvas.coords(window_id, col * self.cell_width, row * self.cell_height)
+            self.canvas.itemconfigure(window_id, state="normal")
+
+        # Keep the focus on the same cell if it is still visible
+        if focused_cell in self.entry_of_cell:
+            self.entry_of_cell[focused_cell].focus_set()
+
+
+def format_cell(value):
+    """Format one backing value for display, keeping integral floats short."""
+    if isinstance(value, str):
+        return value
+    if isinstance(value, int):
+        return str(value)
+    if hasattr(value, "dtype"):
+        kind = value.dtype.kind
+        if kind in "iub":
+            return str(int(value))
+        if kind == "f":
+            value = float(value)
+        else:
+            return str(value)
+    if isinstance(value, float):
+        if value.is_integer() and abs(value) < 2 ** 53:
+            return str(int(value))
+        return repr(value)
+    return str(value)
+
+
+class _GridRow:
+    __slots__ = ("grid", "row")
+
+    def __init__(self, grid, row):
+        self.grid = grid
+        self.row = row
+
+    def __len__(self):
+        return self.grid.cols
+
+    def __getitem__(self, col):
+        if not 0 <= col < self.grid.cols:
+            raise IndexError(col)
+        return _GridCell(self.grid, self.row, col)
+
+    def __iter__(self):
+        for col in range(self.grid.cols):
+            yield _GridCell(self.grid, self.row, col)
+
+
+class _GridCell:
+    """Entry-like handle for one cell of a MatrixGrid."""
+
+    __slots__ = ("grid", "row", "col")
+
+    def __init__(self, grid, row, col):
+        self.grid = grid
+        self.row = row
+        self.col = col
+
+    def get(self):
+        return self.grid.get(self.row, self.col)
+
+    def insert(self, index, text):
+        value = self.get()
+        index = len(value) if index == tk.END else int(index)
+        self.grid.set(self.row, self.col, value[:index] + str(text) + value[index:])
+
+    def delete(self, first, last=None):
+        value = self.get()
+        first = len(value) if first == tk.END else int(first)
+        if last is None:
+            last = first + 1
+        last = len(value) if last == tk.END else int(last)
+        self.grid.set(self.row, self.col, value[:first] + value[last:])
+
+    def focus_set(self):
+        self.grid.focus_cell(self.row, self.col)
@@ -0,0 +1,118 @@
+import tkinter as tk
+from tkinter import filedialog, messagebox
+
+from instrumentation import timed
+from lazy_import import LazyModule
+
+# Imported on first use, so the windows that offer imports open without waiting for NumPy
+np = LazyModule("numpy")
+
+
+def detect_delimiter(line):
+    """Guess the delimiter of one line of text (None means any whitespace)."""
+    for delimiter in ("\t", ",", ";"):
+        if delimiter in line:
+            return delimiter
+    return None
+
+
+def is_numeric_array(value):
+    """Return True for an int, unsigned or float NumPy array (an unedited numeric import)."""
+    return getattr(value, "dtype", None) is not None and value.dtype.kind in "iuf"
+
+
+@timed("parse")
+def parse_tokens(tokens):
+    """Vectorized conversion of a string array (ints, decimals, a/b, 1e-3) to float64."""
+    if is_numeric_array(tokens):
+        return np.asarray(tokens, dtype=np.float64)
+    tokens = np.char.strip(np.asarray(tokens, dtype=str))
+    parts = np.char.partition(tokens, "/")
+    try:
+        numerators = parts[..., 0].astype(np.float64)
+        denominators = np.where(parts[..., 1] == "/", parts[..., 2], "1").astype(np.float64)
+    except ValueError as e:
+        raise ValueError(f"Invalid input: {e}")
+    if np.any(denominators == 0):
+        raise ValueError("Invalid input: division by zero in a fraction")
+    return numerators / denominators
+
+
+def parse_text(text):
+    """Parse pasted or file text into a 2D NumPy array.
+
+    Plain integers and decimals (including scientific notation) are parsed in C into
+    int64/float64 arrays. Text with fractions or integers too large for int64 is
+    kept as a string array, so every entry stays exact, and is validated with
+    `parse_tokens`.
+    """
+    delimiter = detect_delimiter(text[:text.find("\n")] if "\n" in text else text)
+    lines = [line for line in text.splitlines() if line.strip()]
+    if not lines:
+        raise ValueError("No matrix data found!")
+
+    if "/" not in text:
+        dtype = np.float64 if any(c in text for c in ".eE") else np.int64
+        try:
+            # loadtxt parses in C and rejects any row whose length differs from the first
+            return np.loadtxt(lines, dtype=dtype, delimiter=delimiter, ndmin=2)
+        except ValueError:
+            pass  # Ragged, malformed or beyond int64: checked token by token below
+
+    # Exact (or malformed) input: keep the tokens as text and validate them
+    if delimiter is not None:
+        lines = [line.replace(delimiter, " ") for line in lines]
+    tokens = [line.split() for line in lines]
+    cols = len(tokens[0])
+    if any(len(row) != cols for row in tokens):
+        raise ValueError("All rows must have the same number of entries!")
+    tokens = np.array(tokens, dtype=str)
+    parse_tokens(tokens)
+    return tokens
+
+
+def grid_to_float_array(grid):
+    """Read a MatrixGrid as a float64 array, using an unedited numeric source directly."""
+    source = grid.unedited_source()
+    if is_numeric_array(source):
+        return np.asarray(source, dtype=np.float64)
+    return parse_tokens(grid.values())
+
+
+def load_file(path):
+    """Load a matrix from a CSV/TSV/text file, or memory-map a 2D .npy file."""
+    if path.lower().endswith(".npy"):
+        array = np.load(path, mmap_mode="r")
+        if array.ndim != 2:
+            raise ValueError(f"Expected a 2D array, got {array.ndim} dimensions")
+        return array
+    with open(path) as file:
+        return parse_text(file.read())
+
+
+def add_import_buttons(parent, on_loaded, bg="#2c3e50"):
+    """Create "Paste" and "Import File" buttons that pass the loaded array to `on_loaded`."""
+    frame = tk.Frame(parent, bg=bg)
+
+    def import_clipboard():
+        try:
+            on_loaded(parse_text(parent.clipboard_get()))
+        except tk.TclError:
+            messagebox.showerror("Error", "The clipboard is empty!")
+        except ValueError as e:
+            messagebox.showerror("Error", f"Invalid input: {e}")
+
+    def import_file():
+        path = filedialog.askopenfilename(
+            filetypes=[("Matrix files", "*.csv *.tsv *.txt *.npy"), ("All files", "*.*")]
+        )
+        if not path:
+            return
+        try:
+            on_loaded(load_file(path))
+        except (OSError, ValueError) as e:
+            messagebox.showerror("Error", f"Could not import {path}: {e}")
+
+    tk.Button(frame, text="Paste", command=import_clipboard, font=("Arial", 14)).pack(side="left", padx=5)
+    tk.Button(frame, text="Import File", command=import_file, font=("Arial", 14)).pack(side="left", padx=5)
+    return frame
@@ -0,0 +1,169 @@
+from fractions import Fraction
+
+import numpy as np
+import sympy as sp
+
+from determinant_engine import determinant
+from factorization_cache import Factorization
+from matrix_import import is_numeric_array, parse_tokens
+from rank_engine import rank as matrix_rank, ranks as matrix_ranks
+
+
+# Function to parse a single matrix entry (string, int, float or Fraction) exactly
+def parse_entry(value):
+    if isinstance(value, (int, Fraction)):
+        return Fraction(value)
+    if isinstance(value, (float, np.floating)):
+        # Use the shortest decimal form, matching what a user would type
+        return Fraction(repr(float(value)))
+    if isinstance(value, np.integer):
+        return Fraction(int(value))
+    try:
+        return Fraction(str(value).strip())
+    except ValueError:
+        raise ValueError(f"Invalid input: {value}")
+
+
+def parse_matrix(rows):
+    """Convert a 2D list of entries into a 2D list of Fractions."""
+    matrix = [[parse_entry(value) for value in row] for row in rows]
+    if matrix and any(len(row) != len(matrix[0]) for row in matrix):
+        raise ValueError("All rows must have the same length!")
+    return matrix
+
+
+def parse_float_matrix(rows):
+    """Convert a 2D list of entries (or an array) straight to a float64 array, for numeric ranks."""
+    if not is_numeric_array(rows) and len(rows) and any(len(row) != len(rows[0]) for row in rows):
+        raise ValueError("All rows must have the same length!")
+    array = parse_tokens(rows)
+    if array.size == 0:
+        return array.reshape(len(rows), 0)
+    return array
+
+
+def to_sympy(matrix):
+    """Convert a 2D list of Fractions into a sympy Matrix of Rationals."""
+    return sp.Matrix([[sp.Rational(value.numerator, value.denominator) for value in row] for row in matrix])
+
+
+def format_rows(rows):
+    """Convert the entries of a matrix into strings."""
+    return [[str(value) for value in row] for row in rows]
+
+
+def require_square(matrix, name):
+    if len(matrix) != (len(matrix[0]) if matrix else 0):
+        raise ValueError(f"{name} is only defined for square matrices!")
+
+
+def classify_rank(rank, rows, cols):
+    """Describe whether a matrix with the given rank is one-to-one and/or onto."""
+    if rank == cols and rank == rows:
+        return "The matrix is both one-to-one and onto."
+    elif rank == cols:
+        return "The matrix is one-to-one but not onto."
+    elif rank == rows:
+        return "The matrix is onto but not one-to-one."
+    return "The matrix is neither one-to-one nor onto."
+
+
+def operation_determinant(matrix):
+    require_square(matrix, "Determinant")
+    return {"determinant": str(determinant(matrix))}
+
+
+def operation_rref(matrix):
+    rref_matrix, pivots = to_sympy(matrix).rref()
+    return {"rref": format_rows(rref_matrix.tolist()), "pivots": list(pivots)}
+
+
+def operation_inverse(matrix):
+    require_square(matrix, "Inverse")
+    # Raises SingularMatrixError (a ValueError) with the message shown to the user
+    return {"inverse": format_rows(Factorization(matrix).inverse())}
+
+
+def operation_transpose(matrix):
+    return {"transpose": format_rows(zip(*matrix))}
+
+
+def operation_eigenvalues(matrix):
+    require_square(matrix, "Eigenvalues")
+    eigenvalues = to_sympy(matrix).eigenvals()
+    return {"eigenvalues": {str(value): multiplicity for value, multiplicity in eigenvalues.items()}}
+
+
+def rank_properties(rank, note, rows, cols):
+    return {"rank": rank, "result": classify_rank(rank, rows, cols), "method": note}
+
+
+def operation_properties(matrix, mode="modular", tolerance=None, confirm=False):
+    # A numeric rank gets a float64 array from parse_operand
+    rows = len(matrix)
+    cols = len(matrix[0]) if rows else 0
+    rank, note = matrix_rank(matrix, mode, tolerance, confirm)
+    return rank_properties(rank, note, rows, cols)
+
+
+def operation_image(matrix):
+    return {"image_basis": [[str(value) for value in vec] for vec in to_sympy(matrix).columnspace()]}
+
+
+def operation_kernel(matrix):
+    return {"kernel_basis": [[str(value) for value in vec] for vec in to_sympy(matrix).nullspace()]}
+
+
+# Operations available outside the GUI, by name
+OPERATIONS = {
+    "det": operation_determinant,
+    "rref": operation_rref,
+    "inverse": operation_inverse,
+    "transpose": operation_transpose,
+    "eigenvalues": operation_eigenvalues,
+    "properties": operation_properties,
+    "image": operation_image,
+    "kernel": operation_kernel,
+}
+
+
+def parse_operand(name, rows, options=None):
+    """Parse a matrix for the named operation: to float64 for a numeric rank, else to Fractions."""
+    if name == "properties" and (options or {}).get("mode") == "numeric":
+        return parse_float_matrix(rows)
+    return parse_matrix(rows)
+
+
+def run_operation(name, rows, options=None):
+    """Parse a matrix and run the named operation on it, returning a JSON-ready dict.
+
+    `options` are keyword arguments for the operation, e.g. the rank mode of "properties".
+    """
+    if name not in OPERATIONS:
+        raise ValueError(f"Unknown operation: {name}")
+    return OPERATIONS[name](parse_operand(name, rows, options), **(options or {}))
+
+
+def run_operations(name, matrices, options=None):
+    """Run the named operation on a list of matrices; returns a result dict or the raised exception for each.
+
+    Numeric ranks of matrices with the same shape are stacked and computed by one batched SVD.
+    """
+    options = options or {}
+    results = [None] * len(matrices)
+    stacks = {}
+    for index, rows in enumerate(matrices):
+        try:
+            if name == "properties" and options.get("mode") == "numeric":
+                array = parse_float_matrix(rows)
+                stacks.setdefault(array.shape, []).append((index, array))
+            else:
+                results[index] = run_operation(name, rows, options)
+        except Exception as e:
+            results[index] = e
+
+    for (rows, cols), members in stacks.items():
+        stack = np.stack([array for _, array in members])
+        for (index, _), (rank, note) in zip(members, matrix_ranks(stack, **options)):
+            results[index] = rank_properties(rank, note, rows, cols)
+    return results
@@ -0,0 +1,281 @@
+"""Detect the structure of a matrix once and use cheaper kernels where one applies.
+
+`analyze` makes a single pass over the entries and records the bandwidths,
+symmetry, permutation pattern and diagonal blocks. The kernels below return None
+when the structure gives them no shortcut, so callers fall back to their dense
+algorithm. They work on any exact number type (Fraction, int, sympy Rational).
+"""
+from factorization_cache import SingularMatrixError
+
+
+class Structure:
+    """What `analyze` found out about a matrix."""
+
+    def __init__(self, rows, cols, lower_bandwidth, upper_bandwidth, symmetric, permutation, blocks):
+        self.rows = rows
+        self.cols = cols
+        self.lower_bandwidth = lower_bandwidth
+        self.upper_bandwidth = upper_bandwidth
+        self.symmetric = symmetric
+        self.permutation = permutation
+        self.blocks = blocks
+
+    @property
+    def square(self):
+        return self.rows == self.cols
+
+    @property
+    def diagonal(self):
+        return self.square and self.lower_bandwidth == 0 and self.upper_bandwidth == 0
+
+    @property
+    def upper_triangular(self):
+        return self.square and self.lower_bandwidth == 0
+
+    @property
+    def lower_triangular(self):
+        return self.square and self.upper_bandwidth == 0
+
+    @property
+    def triangular(self):
+        return self.upper_triangular or self.lower_triangular
+
+    @property
+    def tridiagonal(self):
+        return self.square and self.lower_bandwidth <= 1 and self.upper_bandwidth <= 1
+
+    @property
+    def block_diagonal(self):
+        return len(self.blocks) > 1
+
+    @property
+    def name(self):
+        """The most specific structure, e.g. "diagonal" or "block diagonal (2 + 3)"."""
+        if not self.square:
+            return "rectangular"
+        if self.diagonal:
+            return "diagonal"
+        if self.permutation is not None:
+            return "permutation"
+        if self.upper_triangular:
+            return "upper triangular"
+        if self.lower_triangular:
+            return "lower triangular"
+        if self.tridiagonal:
+            return "symmetric tridiagonal" if self.symmetric else "tridiagonal"
+        if self.block_diagonal:
+            return "block diagonal (" + " + ".join(str(end - start) for start, end in self.blocks) + ")"
+        if max(self.lower_bandwidth, self.upper_bandwidth) < self.rows - 1:
+            return f"banded (lower {self.lower_bandwidth}, upper {self.upper_bandwidth})"
+        if self.symmetric:
+            return "symmetric"
+        return "dense"
+
+    def __str__(self):
+        return self.name
+
+
+def analyze(matrix):
+    """Inspect a 2D list once and return its Structure."""
+    rows = len(matrix)
+    cols = len(matrix[0]) if rows else 0
+    lower = upper = 0
+    # reach[k]: furthest index coupled to k by a nonzero entry, for finding diagonal blocks
+    reach = list(range(max(rows, cols)))
+    is_permutation = rows == cols
+    column_hits = [0] * cols
+
+    for i, row in enumerate(matrix):
+        ones = 0
+        for j, value in enumerate(row):
+            if value == 0:
+                continue
+            if j < i:
+                lower = max(lower, i - j)
+            elif j > i:
+                upper = max(upper, j - i)
+            if i < len(reach) and j < len(reach):
+                far = max(i, j)
+                reach[i] = max(reach[i], far)
+                reach[j] = max(reach[j], far)
+            if is_permutation:
+                if value == 1:
+                    ones += 1
+                    column_hits[j] += 1
+                else:
+                    is_permutation = False
+        if ones != 1:
+            is_permutation = False
+
+    # Entries outside the band are zero on both sides, so only the band needs checking
+    symmetric = rows == cols and lower == upper and all(
+        matrix[i][j] == matrix[j][i] for i in range(rows) for j in range(i + 1, min(cols, i + upper + 1))
+    )
+    permutation = None
+    if is_permutation and all(hits == 1 for hits in column_hits):
+        permutation = [next(j for j, value in enumerate(row) if value != 0) for row in matrix]
+
+    blocks = []
+    if rows == cols:
+        start = 0
+        furthest = 0
+        for k in range(rows):
+            furthest = max(furthest, reach[k])
+            if furthest == k:
+                blocks.append((start, k + 1))
+                start = k + 1
+    else:
+        blocks = [(0, rows)]
+
+    return Structure(rows, cols, lower, upper, symmetric, permutation, blocks)
+
+
+def _block(matrix, start, end):
+    return [row[start:end] for row in matrix[start:end]]
+
+
+def _product(values):
+    result = 1
+    for value in values:
+        result *= value
+    return result
+
+
+def permutation_sign(permutation):
+    """Return +1 or -1: the parity of the permutation, from its cycle lengths."""
+    sign = 1
+    for cycle in _cycles(permutation):
+        if len(cycle) % 2 == 0:
+            sign = -sign
+    return sign
+
+
+def determinant(matrix, structure, dense=None):
+    """Determinant in O(n) or O(n^2) for structured matrices, else None.
+
+    `dense`, if given, computes the determinant of each diagonal block of a
+    block-diagonal matrix that has no shortcut of its own.
+    """
+    if not structure.square:
+        return None
+    n = structure.rows
+    if structure.triangular:
+        return _product(matrix[i][i] for i in range(n))
+    if structure.permutation is not None:
+        return permutation_sign(structure.permutation)
+    if structure.tridiagonal:
+        # Continuant recurrence: f_k = a_k f_(k-1) - b_(k-1) c_(k-1) f_(k-2)
+        previous, current = 1, matrix[0][0]
+        for k in range(1, n):
+            previous, current = current, matrix[k][k] * current - matrix[k][k - 1] * matrix[k - 1][k] * previous
+        return current
+    if structure.block_diagonal and dense is not None:
+        result = 1
+        for start, end in structure.blocks:
+            block = _block(matrix, start, end)
+            value = determinant(block, analyze(block), dense)
+            result *= dense(block) if value is None else value
+        return result
+    return None
+
+
+def inverse(matrix, structure):
+    """Inverse of a diagonal, permutation or triangular matrix, else None.
+
+    Raises SingularMatrixError when a zero on the diagonal makes it singular.
+    """
+    if not structure.square:
+        return None
+    n = structure.rows
+    if structure.permutation is not None:
+        # The inverse of a permutation matrix is its transpose
+        return [[matrix[j][i] for j in range(n)] for i in range(n)]
+    if structure.triangular and any(matrix[i][i] == 0 for i in range(n)):
+        raise SingularMatrixError("Matrix is singular and not invertible!")
+    if structure.diagonal:
+        return [[1 / matrix[i][i] if i == j else 0 * matrix[i][i] for j in range(n)] for i in range(n)]
+    if structure.lower_triangular:
+        transposed = [[matrix[j][i] for j in range(n)] for i in range(n)]
+        upper = _upper_triangular_inverse(transposed, structure.lower_bandwidth)
+        return [[upper[j][i] for j in range(n)] for i in range(n)]
+    if structure.upper_triangular:
+        return _upper_triangular_inverse(matrix, structure.upper_bandwidth)
+    return None
+
+
+def _upper_triangular_inverse(matrix, bandwidth):
+    # Back substitution column by column, only over the band
+    n = len(matrix)
+    zero = 0 * matrix[0][0]
+    inverse = [[zero] * n for _ in range(n)]
+    for j in range(n):
+        inverse[j][j] = 1 / matrix[j][j]
+        for i in range(j - 1, -1, -1):
+            total = zero
+            for k in range(i + 1, min(j, i + bandwidth) + 1):
+                total += matrix[i][k] * inverse[k][j]
+            inverse[i][j] = -total / matrix[i][i]
+    return inverse
+
+
+def eigenvalues(matrix, structure, dense=None):
+    """Distinct eigenvalues of a triangular (or block-diagonal) matrix, else None.
+
+    `dense`, if given, returns the distinct eigenvalues of a block with no shortcut.
+    """
+    if not structure.square:
+        return None
+    if structure.triangular:
+        return list(dict.fromkeys(matrix[i][i] for i in range(structure.rows)))
+    if structure.block_diagonal and dense is not None:
+        values = []
+        for start, end in structure.blocks:
+            block = _block(matrix, start, end)
+            block_values = eigenvalues(block, analyze(block), dense)
+            values.extend(dense(block) if block_values is None else block_values)
+        return list(dict.fromkeys(values))
+    return None
+
+
+def power(matrix, structure, n, dense=None):
+    """A^n for diagonal, permutation and block-diagonal matrices, else None.
+
+    `dense(block, n)`, if given, raises a block with no shortcut to the n-th power.
+    """
+    if not structure.square or n < 0:
+        return None
+    size = structure.rows
+    zero = 0 * matrix[0][0] if size else 0
+    if structure.diagonal:
+        return [[matrix[i][i] ** n if i == j else zero for j in range(size)] for i in range(size)]
+    if structure.permutation is not None:
+        # Row i of P^n has its 1 in column p^n(i): move n steps along the cycle of i
+        result = [[zero] * size for _ in range(size)]
+        for cycle in _cycles(structure.permutation):
+            for k, i in enumerate(cycle):
+                result[i][cycle[(k + n) % len(cycle)]] = zero + 1
+        return result
+    if structure.block_diagonal and dense is not None:
+        result = [[zero] * size for _ in range(size)]
+        for start, end in structure.blocks:
+            block = _block(matrix, start, end)
+            block_power = power(block, analyze(block), n, dense)
+            if block_power is None:
+                block_power = dense(block, n)
+            for i, row in enumerate(block_power):
+                result[start + i][start:end] = row
+        return result
+    return None
+
+
+def _cycles(permutation):
+    seen = [False] * len(permutation)
+    for start in range(len(permutation)):
+        cycle = []
+        j = start
+        while not seen[j]:
+            seen[j] = True
+            cycle.append(j)
+            j = permutation[j]
+        if cycle:
+            yield cycle
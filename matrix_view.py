@@ -0,0 +1,114 @@
+class MatrixView:
+    """A read-only view of a matrix stored in one flat row-major buffer.
+
+    Rows and columns are reached through index maps of buffer offsets, so minors,
+    transposes, slices and permutations share the same data instead of copying it.
+    """
+
+    __slots__ = ("buffer", "row_offsets", "col_offsets")
+
+    def __init__(self, buffer, row_offsets, col_offsets):
+        self.buffer = buffer
+        self.row_offsets = row_offsets
+        self.col_offsets = col_offsets
+
+    @classmethod
+    def from_rows(cls, rows):
+        """Build a view over a 2D list, flattening it once into the backing buffer."""
+        rows = list(rows)
+        cols = len(rows[0]) if rows else 0
+        buffer = []
+        for row in rows:
+            if len(row) != cols:
+                raise ValueError("All rows must have the same length!")
+            buffer.extend(row)
+        return cls(buffer, range(0, len(rows) * cols, cols), range(cols))
+
+    @property
+    def rows(self):
+        return len(self.row_offsets)
+
+    @property
+    def cols(self):
+        return len(self.col_offsets)
+
+    @property
+    def shape(self):
+        return self.rows, self.cols
+
+    def __getitem__(self, index):
+        i, j = index
+        return self.buffer[self.row_offsets[i] + self.col_offsets[j]]
+
+    def __len__(self):
+        return self.rows
+
+    def __iter__(self):
+        for i in range(self.rows):
+            yield self.row(i)
+
+    def row(self, i):
+        """Return an iterator over the entries of row i."""
+        offset = self.row_offsets[i]
+        return (self.buffer[offset + c] for c in self.col_offsets)
+
+    def column(self, j):
+        """Return an iterator over the entries of column j."""
+        offset = self.col_offsets[j]
+        return (self.buffer[r + offset] for r in self.row_offsets)
+
+    def transpose(self):
+        """Return the transpose by swapping the row and column maps."""
+        # Offsets are added together, so swapping the maps reads (j, i) for (i, j)
+        return MatrixView(self.buffer, self.col_offsets, self.row_offsets)
+
+    @property
+    def T(self):
+        return self.transpose()
+
+    def minor(self, row, col):
+        """Return the view with one row and one column removed."""
+        return MatrixView(
+            self.buffer,
+            _drop(self.row_offsets, row),
+            _drop(self.col_offsets, col),
+        )
+
+    def submatrix(self, rows, cols):
+        """Return the view of the given row and column slices or index lists."""
+        return MatrixView(self.buffer, _select(self.row_offsets, rows), _select(self.col_offsets, cols))
+
+    def permute_rows(self, permutation):
+        """Return the view whose row i is row permutation[i] of this view."""
+        return MatrixView(self.buffer, [self.row_offsets[i] for i in permutation], self.col_offsets)
+
+    def permute_columns(self, permutation):
+        """Return the view whose column j is column permutation[j] of this view."""
+        return MatrixView(self.buffer, self.row_offsets, [self.col_offsets[j] for j in permutation])
+
+    def tolist(self):
+        """Copy the view out into a new 2D list."""
+        return [list(self.row(i)) for i in range(self.rows)]
+
+    def __repr__(self):
+        return f"MatrixView({self.tolist()})"
+
+
+def as_view(matrix):
+    """Return `matrix` unchanged if it is already a view, otherwise wrap it."""
+    if isinstance(matrix, MatrixView):
+        return matrix
+    return MatrixView.from_rows(matrix)
+
+
+def _drop(offsets, index):
+    # Ranges slice without copying; other maps become one tuple of the survivors
+    if isinstance(offsets, range) and index in (0, len(offsets) - 1):
+        return offsets[1:] if index == 0 else offsets[:-1]
+    return tuple(offsets[:index]) + tuple(offsets[index + 1:])
+
+
+def _select(offsets, selection):
+    if isinstance(selection, slice):
+        return offsets[selection]
+    return [offsets[i] for i in selection]
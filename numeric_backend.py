@@ -0,0 +1,215 @@
+"""Float64 (NumPy/LAPACK) versions of the DynamicCalculator operations.
+
+Each function returns a result together with a short note for the user, or raises
+UnreliableResult when the condition estimate says a float64 answer cannot be
+trusted, so the caller can fall back to exact arithmetic.
+"""
+import math
+import sys
+from fractions import Fraction
+
+from lazy_import import LazyModule
+
+# Imported on first use; DynamicCalculator needs BACKEND_MODES and format_number at startup
+np = LazyModule("numpy")
+
+
+# In "auto" mode, matrices at least this large use float64 even with exact entries
+NUMERIC_MIN_SIZE = 50
+
+# Largest condition number accepted (about 6 significant digits left in float64)
+MAX_CONDITION = 1e10
+
+# Largest accepted condition number of the eigenvector matrix (defective matrices fail this)
+MAX_EIGENVECTOR_CONDITION = 1e8
+
+# Largest accepted relative error estimate of a float64 matrix power
+MAX_POWER_ERROR = 1e-6
+
+# Largest asymmetry |a_ij - a_ji| accepted, relative to the largest entry
+SYMMETRY_TOLERANCE = 1e-12
+
+# Machine epsilon of float64 (np.finfo(np.float64).eps)
+EPS = sys.float_info.epsilon
+
+# Natural logs of the largest float64 and of the smallest normal one; results outside are shown from their logs
+MAX_LOG_FLOAT = math.log(sys.float_info.max)
+MIN_LOG_FLOAT = math.log(sys.float_info.min)
+
+BACKEND_MODES = ("auto", "exact", "float64")
+
+# Exact integers longer than this are shown in scientific notation
+MAX_DISPLAY_DIGITS = 1000
+
+
+class UnreliableResult(Exception):
+    """Raised when a float64 result would be too inaccurate to show."""
+
+
+def is_inexact(rows):
+    """Return True if any entry is written as a decimal (e.g. 0.1 or 1e-3).
+
+    `rows` is a 2D list of strings or an imported NumPy array, where a float array counts as decimal.
+    """
+    kind = getattr(getattr(rows, "dtype", None), "kind", "U")
+    if kind not in "US":
+        return kind == "f"
+    return any("." in value or "e" in value.lower() for row in rows for value in row)
+
+
+def choose_backend(rows, mode="auto"):
+    """Return (use_float64, reason) for a 2D list of strings."""
+    if mode not in BACKEND_MODES:
+        raise ValueError(f"Unknown backend mode: {mode}")
+    if mode == "exact":
+        return False, "exact arithmetic selected"
+    if mode == "float64":
+        return True, "float64 selected"
+    size = max(len(rows), len(rows[0]) if len(rows) else 0)
+    if is_inexact(rows):
+        return True, "decimal inputs"
+    if size >= NUMERIC_MIN_SIZE:
+        return True, f"{len(rows)}x{len(rows[0])} matrix"
+    return False, "small matrix with exact entries"
+
+
+def check_condition(a):
+    cond = np.linalg.cond(a)
+    if not np.isfinite(cond) or cond > MAX_CONDITION:
+        raise UnreliableResult(f"condition number {cond:.1e} is too large for float64")
+    return cond
+
+
+def scientific_notation(sign, log10_magnitude):
+    """Format sign * 10**log10_magnitude, for values too large or too small for a float."""
+    exponent, mantissa = divmod(log10_magnitude, 1)
+    return f"{sign * 10 ** mantissa:.10g}e{int(exponent):+d}"
+
+
+def in_float_range(log_magnitude):
+    """Return True if e**log_magnitude is a normal float64 (neither overflows nor underflows)."""
+    return MIN_LOG_FLOAT < log_magnitude < MAX_LOG_FLOAT
+
+
+def determinant(a):
+    cond = check_condition(a)
+    sign, logdet = np.linalg.slogdet(a)
+    if sign == 0:
+        return 0.0, f"condition number {cond:.1e}"
+    if in_float_range(logdet):
+        return float(sign * np.exp(logdet)), f"condition number {cond:.1e}"
+
+    # Too large or too small for a float: report it in scientific notation from log10|det|
+    return scientific_notation(sign, logdet / math.log(10)), f"condition number {cond:.1e}"
+
+
+def inverse(a):
+    cond = check_condition(a)
+    return np.linalg.inv(a), f"condition number {cond:.1e}"
+
+
+def rref(a):
+    """Gauss-Jordan elimination with partial pivoting; returns ((rref, rank), note)."""
+    singular_values = np.linalg.svd(a, compute_uv=False)
+    largest = singular_values[0] if singular_values.size else 0.0
+    tolerance = largest * max(a.shape) * EPS
+    rank = int(np.count_nonzero(singular_values > tolerance))
+    if rank and largest / singular_values[rank - 1] > MAX_CONDITION:
+        raise UnreliableResult("the rank is numerically ambiguous")
+
+    work = np.array(a, dtype=np.float64)
+    rows, cols = work.shape
+    pivot_tolerance = max(tolerance, EPS)
+    r = 0
+    for c in range(cols):
+        if r == rows:
+            break
+        pivot_row = r + int(np.argmax(np.abs(work[r:, c])))
+        if abs(work[pivot_row, c]) <= pivot_tolerance:
+            work[r:, c] = 0.0
+            continue
+        work[[r, pivot_row]] = work[[pivot_row, r]]
+        work[r] /= work[r, c]
+        factors = work[:, c].copy()
+        factors[r] = 0.0
+        work -= np.outer(factors, work[r])
+        r += 1
+
+    if r != rank:
+        raise UnreliableResult("elimination and SVD disagree on the rank")
+    work[np.abs(work) <= pivot_tolerance] = 0.0
+    return (work, rank), f"rank {rank} from SVD"
+
+
+def eigenvalues(a):
+    if np.array_equal(a, a.T):
+        # Symmetric eigenvalues are always well conditioned
+        return [float(value) for value in np.linalg.eigvalsh(a)], "symmetric eigensolver"
+
+    values, vectors = np.linalg.eig(a)
+    cond = np.linalg.cond(vectors)
+    if not np.isfinite(cond) or cond > MAX_EIGENVECTOR_CONDITION:
+        raise UnreliableResult("the matrix is (nearly) defective")
+    if np.all(values.imag == 0):
+        values = values.real
+    return [complex(value) if isinstance(value, complex) else float(value) for value in values.tolist()], (
+        f"eigenvector condition number {cond:.1e}"
+    )
+
+
+def symmetric_eigendecomposition(a):
+    """Return (eigenvalues, P) with A = P diag(eigenvalues) P^T and P orthogonal.
+
+    Uses LAPACK's symmetric solver (tridiagonal reduction, then divide and conquer),
+    which returns an orthonormal eigenbasis even for repeated eigenvalues.
+    """
+    scale = max(np.abs(a).max(), 1.0) if a.size else 1.0
+    if not np.allclose(a, a.T, rtol=0, atol=scale * SYMMETRY_TOLERANCE):
+        raise ValueError("Matrix must be symmetric to orthogonally diagonalize!")
+    return np.linalg.eigh((a + a.T) / 2)
+
+
+def matrix_power(a, n):
+    result = np.linalg.matrix_power(a, n)
+    if not np.all(np.isfinite(result)):
+        raise UnreliableResult("A^n overflows float64")
+
+    # Rounding errors grow like n * eps * ||A||^n relative to ||A^n||
+    norm_a = np.linalg.norm(a)
+    norm_result = np.linalg.norm(result)
+    if norm_a == 0 or n == 0:
+        return result, "exact in float64"
+    if norm_result == 0:
+        raise UnreliableResult("A^n cancels to zero in float64")
+    error = np.exp(min(np.log(max(n, 1) * EPS) + n * np.log(norm_a) - np.log(norm_result), 700.0))
+    if error > MAX_POWER_ERROR:
+        raise UnreliableResult(f"estimated relative error {error:.1e} is too large")
+    return result, f"estimated relative error {error:.1e}"
+
+
+def format_integer(value):
+    """Format an integer, abbreviating it when it has more than MAX_DISPLAY_DIGITS digits."""
+    if value.bit_length() <= MAX_DISPLAY_DIGITS * 3.32:
+        return str(value)
+    # str() of a huge int is slow (and refused past sys.get_int_max_str_digits())
+    exponent, mantissa = divmod(math.log10(abs(value)), 1)
+    sign = "-" if value < 0 else ""
+    return f"{sign}{10 ** mantissa:.10f}e+{int(exponent)} ({int(exponent) + 1} digits)"
+
+
+def format_number(value):
+    """Format a float or complex result with 10 significant digits; exact values as they are."""
+    if isinstance(value, int):
+        return format_integer(value)
+    if isinstance(value, Fraction):
+        if value.denominator == 1:
+            return format_integer(value.numerator)
+        return f"{format_integer(value.numerator)}/{format_integer(value.denominator)}"
+    if isinstance(value, complex):
+        if value.imag == 0:
+            return format_number(value.real)
+        sign = "-" if value.imag < 0 else "+"
+        return f"{value.real:.10g} {sign} {abs(value.imag):.10g}i"
+    if isinstance(value, float):
+        return f"{value:.10g}"
+    return str(value)
@@ -0,0 +1,89 @@
+"""A x B, B x A, A + B and A - B on single matrices or stacks of matrices.
+
+Operands are m x n matrices or k x m x n stacks and broadcast like NumPy arrays.
+A single A is applied to every B of a stack, and two stacks of the same length
+are combined pair by pair. Stacks are processed `chunk_size` pairs at a time,
+which bounds the temporaries. Memory-mapped inputs and outputs are streamed
+chunk by chunk instead of being loaded whole. Operands are either float arrays
+or exact RationalMatrix values.
+"""
+import numpy as np
+
+from rational_matrix import RationalMatrix
+
+
+# Pairs combined per step when the operands are stacks
+DEFAULT_CHUNK_SIZE = 1024
+
+PAIR_OPERATIONS = {
+    "AxB": lambda a, b: a @ b,
+    "BxA": lambda a, b: b @ a,
+    "A+B": lambda a, b: a + b,
+    "A-B": lambda a, b: a - b,
+}
+
+
+def result_shape(operation, shape_a, shape_b):
+    """Return the shape of the result, or raise ValueError if the operands do not fit."""
+    if operation not in PAIR_OPERATIONS:
+        raise ValueError(f"Unknown operation: {operation}")
+    if not (2 <= len(shape_a) <= 3 and 2 <= len(shape_b) <= 3):
+        raise ValueError("Expected a matrix or a stack of matrices")
+    (rows_a, cols_a), (rows_b, cols_b) = shape_a[-2:], shape_b[-2:]
+    if operation == "AxB" and cols_a == rows_b:
+        matrix_shape = (rows_a, cols_b)
+    elif operation == "BxA" and cols_b == rows_a:
+        matrix_shape = (rows_b, cols_a)
+    elif operation in ("A+B", "A-B") and (rows_a, cols_a) == (rows_b, cols_b):
+        matrix_shape = (rows_a, cols_a)
+    else:
+        raise ValueError("Matrix dimensions are not compatible for this operation!")
+    try:
+        batch_shape = np.broadcast_shapes(tuple(shape_a[:-2]), tuple(shape_b[:-2]))
+    except ValueError:
+        raise ValueError(f"Stacks of {shape_a[0]} and {shape_b[0]} matrices cannot be broadcast together")
+    return batch_shape + matrix_shape
+
+
+def _batch(operand, start, stop, exact):
+    # A single matrix (or a stack of one) broadcasts against every chunk
+    if len(operand.shape) == 2 or operand.shape[0] == 1:
+        selected = operand
+    else:
+        selected = operand[start:stop]
+    return selected if exact else np.asarray(selected, dtype=np.float64)
+
+
+def apply(operation, a, b, chunk_size=DEFAULT_CHUNK_SIZE, out=None):
+    """Return operation(A, B) for matrices or stacks (float arrays or RationalMatrix values).
+
+    A float result is written into `out` when given, e.g. a memory-mapped .npy file.
+    """
+    shape = result_shape(operation, a.shape, b.shape)
+    function = PAIR_OPERATIONS[operation]
+    exact = isinstance(a, RationalMatrix)
+    if exact != isinstance(b, RationalMatrix):
+        raise TypeError("Both operands must be exact, or neither")
+
+    if exact:
+        if len(shape) == 2:
+            return function(a, b)
+        parts = []
+        denominator = 1
+        for start in range(0, shape[0], chunk_size):
+            stop = min(start + chunk_size, shape[0])
+            part = function(_batch(a, start, stop, True), _batch(b, start, stop, True))
+            parts.append(np.broadcast_to(part.numerators, (stop - start,) + shape[1:]))
+            denominator = part.denominator
+        numerators = np.concatenate(parts) if parts else np.zeros(shape, dtype=np.int64)
+        return RationalMatrix(numerators, denominator)
+
+    if out is None:
+        out = np.empty(shape, dtype=np.float64)
+    if len(shape) == 2:
+        out[...] = function(_batch(a, 0, 0, False), _batch(b, 0, 0, False))
+        return out
+    for start in range(0, shape[0], chunk_size):
+        stop = min(start + chunk_size, shape[0])
+        out[start:stop] = function(_batch(a, start, stop, False), _batch(b, start, stop, False))
+    return out
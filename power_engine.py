@@ -0,0 +1,145 @@
+"""Exact matrix powers A^n, optionally modulo m.
+
+Rational matrices are scaled by their common denominator d, so the work is done on
+the integer matrix M = d*A and A^n = M^n / d^n. Small exponents use repeated
+squaring; when n has more bits than the matrix has rows, x^n is first reduced
+modulo the characteristic polynomial (Cayley-Hamilton), so only polynomial
+products of degree < size are squared and A^n is rebuilt from A^0 ... A^(size-1).
+Integers are gmpy2 mpz values when gmpy2 is installed (through mpmath), which
+makes products of huge entries much faster.
+"""
+from fractions import Fraction
+from math import gcd, lcm
+
+import sympy as sp
+from mpmath.libmp import MPZ
+
+
+def to_integer_matrix(matrix):
+    """Return (M, d) with M an integer matrix and A = M / d."""
+    fractions = [[Fraction(value) for value in row] for row in matrix]
+    denominator = lcm(*(value.denominator for row in fractions for value in row))
+    rows = [[MPZ(value.numerator * (denominator // value.denominator)) for value in row] for row in fractions]
+    return rows, denominator
+
+
+def identity(size):
+    return [[MPZ(int(i == j)) for j in range(size)] for i in range(size)]
+
+
+def multiply(x, y, modulus=None):
+    """Multiply two matrices given as 2D lists, reducing mod `modulus` if given."""
+    columns = list(zip(*y))
+    if modulus is None:
+        return [[sum(a * b for a, b in zip(row, column)) for column in columns] for row in x]
+    return [[sum(a * b for a, b in zip(row, column)) % modulus for column in columns] for row in x]
+
+
+def binary_power(matrix, n, modulus=None):
+    """A^n by repeated squaring: about 2*log2(n) matrix products."""
+    result = None
+    base = matrix
+    while n:
+        if n & 1:
+            result = base if result is None else multiply(result, base, modulus)
+        n >>= 1
+        if n:
+            base = multiply(base, base, modulus)
+    if result is None:
+        result = identity(len(matrix))
+    if modulus is not None:
+        result = [[value % modulus for value in row] for row in result]
+    return result
+
+
+def characteristic_polynomial(matrix):
+    """Coefficients c_0 ... c_(k-1) of det(xI - M) = x^k + ... + c_1 x + c_0 for an integer matrix."""
+    coefficients = sp.Matrix([[int(value) for value in row] for row in matrix]).charpoly().all_coeffs()
+    return [MPZ(int(c)) for c in reversed(coefficients[1:])]
+
+
+def _multiply_mod_charpoly(p, q, charpoly, modulus):
+    """Product of two polynomials (low degree first) reduced modulo a monic polynomial."""
+    k = len(charpoly)
+    product = [MPZ(0)] * (2 * k - 1)
+    for i, a in enumerate(p):
+        if a:
+            for j, b in enumerate(q):
+                product[i + j] += a * b
+    # x^k = -(c_0 + c_1 x + ... + c_(k-1) x^(k-1))
+    for top in range(2 * k - 2, k - 1, -1):
+        coefficient = product[top]
+        if coefficient:
+            for j, c in enumerate(charpoly):
+                product[top - k + j] -= coefficient * c
+    if modulus is not None:
+        return [value % modulus for value in product[:k]]
+    return product[:k]
+
+
+def cayley_hamilton_power(matrix, n, modulus=None):
+    """A^n from x^n mod charpoly(A): squares polynomials of degree < k instead of k x k matrices."""
+    k = len(matrix)
+    if k < 2:
+        # x mod charpoly is a constant for k = 1, so there is nothing to reduce
+        return binary_power(matrix, n, modulus)
+    charpoly = characteristic_polynomial(matrix)
+
+    # remainder = x^n mod charpoly, by repeated squaring of polynomials
+    remainder = [MPZ(1)] + [MPZ(0)] * (k - 1)
+    base = _multiply_mod_charpoly([MPZ(0), MPZ(1)] + [MPZ(0)] * (k - 2), remainder, charpoly, modulus)
+    while n:
+        if n & 1:
+            remainder = _multiply_mod_charpoly(remainder, base, charpoly, modulus)
+        n >>= 1
+        if n:
+            base = _multiply_mod_charpoly(base, base, charpoly, modulus)
+
+    # A^n = r_0 I + r_1 A + ... + r_(k-1) A^(k-1); the powers of A stay small
+    result = [[MPZ(0)] * k for _ in range(k)]
+    power = identity(k)
+    for i, coefficient in enumerate(remainder):
+        if coefficient:
+            for row, power_row in zip(result, power):
+                for j, value in enumerate(power_row):
+                    if value:
+                        row[j] += coefficient * value
+        if i < k - 1:
+            power = multiply(power, matrix, modulus)
+    if modulus is not None:
+        result = [[value % modulus for value in row] for row in result]
+    return result
+
+
+def matrix_power(matrix, n, modulus=None, method="auto"):
+    """Return A^n exactly as a 2D list of Fractions, or of ints in [0, m) when `modulus` is given.
+
+    `method` is "binary", "cayley-hamilton" or "auto" (Cayley-Hamilton once n has
+    more bits than the matrix has rows).
+    """
+    if n < 0:
+        raise ValueError("Only non-negative powers are supported!")
+    if modulus is not None and modulus < 1:
+        raise ValueError("The modulus must be a positive integer!")
+    if method not in ("auto", "binary", "cayley-hamilton"):
+        raise ValueError(f"Unknown method: {method}")
+
+    rows, denominator = to_integer_matrix(matrix)
+    size = len(rows)
+    if method == "auto":
+        method = "cayley-hamilton" if size > 1 and n.bit_length() > size else "binary"
+
+    if modulus is not None:
+        if gcd(denominator, modulus) != 1:
+            raise ValueError(f"The denominators of A are not invertible modulo {modulus}!")
+        rows = [[value % modulus for value in row] for row in rows]
+        # A^n = M^n * d^(-n) mod m
+        scale = pow(denominator, -n, modulus)
+    power = cayley_hamilton_power(rows, n, modulus) if method == "cayley-hamilton" else binary_power(rows, n, modulus)
+
+    if modulus is not None:
+        return [[int(value) * scale % modulus for value in row] for row in power]
+    if denominator == 1:
+        return [[Fraction(int(value)) for value in row] for row in power]
+    scale = denominator ** n
+    return [[Fraction(int(value), scale) for value in row] for row in power]
@@ -0,0 +1,181 @@
+"""Rank of rational matrices modulo random primes, exactly, or numerically.
+
+The modular rank scales A to integers and eliminates modulo random primes p in
+[2^30, 2^31), so every product fits int64 and each elimination is vectorized.
+rank_p(A) <= rank(A) always holds. It is smaller only when p divides every
+r x r minor (r = rank A), so in particular one fixed nonzero minor M. By
+Hadamard's inequality M has at most log2|M| / 30 prime factors in that range,
+out of PRIMES_IN_RANGE primes, which bounds the chance that one random prime
+fails. Taking the largest rank over k independent primes fails only if all of
+them fail, so k is chosen to push that bound under `max_error`. A full rank
+result is always certain. `confirm=True` adds a fraction-free exact
+elimination.
+
+The numeric rank counts the singular values above a tolerance, as
+np.linalg.matrix_rank does, and takes a whole k x m x n stack in one call.
+"""
+import math
+import random
+
+import numpy as np
+
+from determinant_engine import is_prime
+from rational_matrix import RationalMatrix
+
+
+# Random primes for the modular rank are drawn from [PRIME_LOW, PRIME_HIGH)
+PRIME_LOW = 2 ** 30
+PRIME_HIGH = 2 ** 31
+
+# Lower bound on the number of primes in that range, from Rosser and Schoenfeld's
+# x / ln x < pi(x) < 1.25506 x / ln x
+PRIMES_IN_RANGE = int(PRIME_HIGH / math.log(PRIME_HIGH) - 1.25506 * PRIME_LOW / math.log(PRIME_LOW))
+
+# Default bound on the probability that the modular rank is too small
+DEFAULT_MAX_ERROR = 1e-12
+
+# Rank modes offered by the checker and batch mode
+RANK_MODES = ("modular", "exact", "numeric")
+
+
+def random_prime(rng):
+    while True:
+        candidate = rng.randrange(PRIME_LOW + 1, PRIME_HIGH, 2)
+        if is_prime(candidate):
+            return candidate
+
+
+def integer_matrix(matrix):
+    """Scale a matrix (Fractions, strings or a NumPy array) to integers with the same rank."""
+    return RationalMatrix.from_values(matrix).numerators
+
+
+def rank_mod_p(numerators, p):
+    """Rank of an integer array modulo the prime p < 2^31, by vectorized Gaussian elimination."""
+    work = (numerators % p).astype(np.int64)
+    rows, cols = work.shape
+    rank = 0
+    for c in range(cols):
+        if rank == rows:
+            break
+        candidates = np.flatnonzero(work[rank:, c])
+        if candidates.size == 0:
+            continue
+        pivot = rank + candidates[0]
+        if pivot != rank:
+            work[[rank, pivot]] = work[[pivot, rank]]
+        work[rank, c:] = work[rank, c:] * pow(int(work[rank, c]), -1, p) % p
+        targets = rank + 1 + np.flatnonzero(work[rank + 1:, c])
+        if targets.size:
+            # Entries are below 2^31, so these products stay below 2^62
+            work[targets, c:] = (work[targets, c:] - np.outer(work[targets, c], work[rank, c:]) % p) % p
+        rank += 1
+    return rank
+
+
+def log2_minor_bound(numerators):
+    """Upper bound on log2 |M| for every nonzero square minor M (Hadamard's inequality)."""
+    rows, cols = numerators.shape
+    half_log_cols = math.log2(cols) / 2 if cols else 0.0
+    if numerators.dtype == object:
+        largest = [max((abs(value) for value in row), default=0) for row in numerators.tolist()]
+    else:
+        largest = np.abs(numerators).max(axis=1).tolist() if cols else []
+    # Each row of a minor has norm below sqrt(cols) * 2^bit_length
+    return sum(int(value).bit_length() + half_log_cols for value in largest if value)
+
+
+def modular_rank(matrix, max_error=DEFAULT_MAX_ERROR, rng=None):
+    """Return (rank, error_bound): rank is wrong with probability at most error_bound."""
+    numerators = integer_matrix(matrix)
+    rows, cols = numerators.shape
+    if rows == 0 or cols == 0:
+        return 0, 0.0
+    rng = rng or random.SystemRandom()
+    # Chance that one random prime divides a fixed nonzero minor
+    failure = log2_minor_bound(numerators) / math.log2(PRIME_LOW) / PRIMES_IN_RANGE
+    if failure >= 1:
+        # Entries so large that the bound says nothing: only exact elimination is reliable
+        return _bareiss_rank(numerators), 0.0
+    count = 1 if failure == 0 else max(1, math.ceil(math.log(max_error) / math.log(failure)))
+
+    rank = 0
+    for _ in range(count):
+        rank = max(rank, rank_mod_p(numerators, random_prime(rng)))
+        if rank == min(rows, cols):
+            # rank_p never exceeds the true rank, so a full rank is certain
+            return rank, 0.0
+    return rank, failure ** count
+
+
+def exact_rank(matrix):
+    """Rank by fraction-free (Bareiss) elimination on integers, with no error."""
+    return _bareiss_rank(integer_matrix(matrix))
+
+
+def _bareiss_rank(numerators):
+    work = [[int(value) for value in row] for row in numerators.tolist()]
+    rows = len(work)
+    cols = len(work[0]) if rows else 0
+    rank = 0
+    previous = 1
+    for c in range(cols):
+        if rank == rows:
+            break
+        pivot = next((i for i in range(rank, rows) if work[i][c]), None)
+        if pivot is None:
+            continue
+        work[rank], work[pivot] = work[pivot], work[rank]
+        pivot_row = work[rank]
+        pivot_value = pivot_row[c]
+        for i in range(rank + 1, rows):
+            row = work[i]
+            factor = row[c]
+            # Every entry is a minor of A, so the division by the previous pivot is exact
+            for j in range(c + 1, cols):
+                row[j] = (pivot_value * row[j] - factor * pivot_row[j]) // previous
+            row[c] = 0
+        previous = pivot_value
+        rank += 1
+    return rank
+
+
+def numeric_rank(matrix, tolerance=None):
+    """Number of singular values above `tolerance` (NumPy's default when None); accepts stacks."""
+    array = np.asarray(matrix, dtype=np.float64)
+    if array.size == 0:
+        return np.zeros(array.shape[:-2], dtype=int) if array.ndim > 2 else 0
+    ranks = np.linalg.matrix_rank(array, tol=tolerance)
+    return int(ranks) if array.ndim == 2 else ranks
+
+
+def _numeric_note(tolerance):
+    return f"numeric: SVD with {'the default tolerance' if tolerance is None else f'tolerance {tolerance:g}'}"
+
+
+def rank(matrix, mode="modular", tolerance=None, confirm=False, max_error=DEFAULT_MAX_ERROR, rng=None):
+    """Return (rank, note) in the given mode; the note says how certain the rank is."""
+    if mode == "numeric":
+        return numeric_rank(matrix, tolerance), _numeric_note(tolerance)
+    if mode == "exact":
+        return exact_rank(matrix), "exact: fraction-free elimination"
+    if mode != "modular":
+        raise ValueError(f"Unknown rank mode: {mode}")
+
+    value, error = modular_rank(matrix, max_error, rng)
+    if error == 0:
+        return value, "modular: certain"
+    if confirm:
+        confirmed = exact_rank(matrix)
+        return confirmed, f"modular: {'confirmed' if confirmed == value else 'corrected'} by exact elimination"
+    return value, f"modular: error probability <= {error:.1e}"
+
+
+def ranks(matrices, mode="modular", tolerance=None, confirm=False, max_error=DEFAULT_MAX_ERROR, rng=None):
+    """Return [(rank, note), ...] for a list or k x m x n stack of matrices.
+
+    A numeric stack is handled by one batched SVD.
+    """
+    if mode == "numeric" and getattr(matrices, "ndim", 0) == 3:
+        return [(int(value), _numeric_note(tolerance)) for value in numeric_rank(matrices, tolerance)]
+    return [rank(matrix, mode, tolerance, confirm, max_error, rng) for matrix in matrices]
@@ -0,0 +1,192 @@
+"""Exact rational matrix arithmetic on integer numerators.
+
+A RationalMatrix stores A as an integer array M and one common denominator d,
+with A = M / d. Products and sums then only need integer kernels:
+A B = (M_A M_B) / (d_A d_B), and A + B is a sum of numerators rescaled to
+lcm(d_A, d_B). Integer products run as int64 NumPy matmuls when a bound on the
+result proves they cannot overflow. Otherwise the entries are split into limbs
+of a few dozen bits, the limb products run in int64, and they are recombined
+as Python integers. The result is only reduced to lowest terms when it is read
+out. Arrays may be stacks (k x m x n), which broadcast like NumPy arrays.
+"""
+from fractions import Fraction
+from math import lcm
+
+import numpy as np
+
+
+# Largest magnitude an int64 kernel may produce
+INT64_LIMIT = 2 ** 63 - 1
+
+
+def _max_abs(array):
+    if array.size == 0:
+        return 0
+    if array.dtype == object:
+        return max(abs(int(value)) for value in array.flat)
+    # Python ints, so abs(int64 min) does not wrap around
+    return max(abs(int(array.max())), abs(int(array.min())))
+
+
+def as_integer_array(values):
+    """Return an int64 array when every entry fits, else an object array of Python ints."""
+    array = np.array(values, dtype=object)
+    if _max_abs(array) <= INT64_LIMIT:
+        return array.astype(np.int64)
+    return array
+
+
+def _fits_int64(*bounds):
+    product = 1
+    for bound in bounds:
+        product *= bound
+    return product <= INT64_LIMIT
+
+
+def _limbs(array, bits):
+    """Split an integer array into int64 limbs L_0, L_1, ... with array = sum L_i 2^(bits i)."""
+    signs = np.sign(array).astype(np.int64)
+    magnitude = np.abs(array.astype(object))
+    mask = (1 << bits) - 1
+    limbs = []
+    while True:
+        limbs.append((magnitude & mask).astype(np.int64) * signs)
+        magnitude = magnitude >> bits
+        if not magnitude.any():
+            return limbs
+
+
+def integer_matmul(x, y):
+    """Exact product of two integer arrays (or stacks), in int64 whenever it provably fits."""
+    inner = x.shape[-1]
+    x_bound = _max_abs(x)
+    y_bound = _max_abs(y)
+    if _fits_int64(inner, x_bound, y_bound):
+        return np.matmul(x.astype(np.int64), y.astype(np.int64))
+
+    # inner * 2^bits * 2^bits must stay below 2^63 for every limb product
+    bits = (62 - inner.bit_length()) // 2
+    x_limbs = _limbs(x, bits)
+    y_limbs = _limbs(y, bits)
+    result = None
+    for i, x_limb in enumerate(x_limbs):
+        for j, y_limb in enumerate(y_limbs):
+            term = np.matmul(x_limb, y_limb).astype(object) << (bits * (i + j))
+            result = term if result is None else result + term
+    return as_integer_array(result)
+
+
+def integer_add(x, y, x_scale=1, y_scale=1):
+    """Exact x * x_scale + y * y_scale for integer arrays, in int64 whenever it provably fits."""
+    x_bound = _max_abs(x) * abs(x_scale)
+    y_bound = _max_abs(y) * abs(y_scale)
+    if x_bound + y_bound <= INT64_LIMIT:
+        return x.astype(np.int64) * x_scale + y.astype(np.int64) * y_scale
+    return as_integer_array(x.astype(object) * x_scale + y.astype(object) * y_scale)
+
+
+def _parse_strings(tokens):
+    """Vectorized parse of integer and a/b string tokens; returns (numerators, denominators) or None."""
+    tokens = np.char.strip(np.asarray(tokens, dtype=str))
+    parts = np.char.partition(tokens, "/")
+    try:
+        numerators = parts[..., 0].astype(np.int64)
+        denominators = np.where(parts[..., 1] == "/", parts[..., 2], "1").astype(np.int64)
+    except (ValueError, OverflowError):
+        return None  # Decimals or integers beyond int64
+    if np.any(denominators == 0):
+        raise ValueError("Invalid input: division by zero in a fraction")
+    return numerators, denominators
+
+
+class RationalMatrix:
+    """A matrix (or stack of matrices) of rationals stored as integer numerators over one denominator."""
+
+    __slots__ = ("numerators", "denominator")
+
+    def __init__(self, numerators, denominator=1):
+        self.numerators = numerators
+        self.denominator = denominator
+
+    @classmethod
+    def from_values(cls, values):
+        """Build from grid strings, Fractions, ints or a NumPy array (ints and floats read exactly).
+
+        Floats are read as their shortest decimal form, as a user would type them.
+        """
+        dtype = getattr(values, "dtype", None)
+        if dtype is not None and (dtype.kind in "ib" or dtype.kind == "u" and dtype.itemsize < 8):
+            return cls(np.asarray(values, dtype=np.int64))
+        parsed = _parse_strings(values) if dtype is None or dtype.kind in "US" else None
+        if parsed is not None:
+            numerators, denominators = parsed
+            denominator = lcm(*np.unique(denominators).tolist())
+            if denominator == 1:
+                return cls(numerators)
+            scales = denominator // denominators.astype(object)
+            return cls(as_integer_array(numerators.astype(object) * scales), denominator)
+
+        array = np.array(values, dtype=object)
+        fractions = np.empty(array.shape, dtype=object)
+        for index, value in np.ndenumerate(array):
+            fractions[index] = _to_fraction(value)
+        denominator = lcm(*{value.denominator for value in fractions.flat}) if fractions.size else 1
+        numerators = [value.numerator * (denominator // value.denominator) for value in fractions.flat]
+        return cls(as_integer_array(numerators).reshape(array.shape), denominator)
+
+    @property
+    def shape(self):
+        return self.numerators.shape
+
+    def __getitem__(self, index):
+        return RationalMatrix(self.numerators[index], self.denominator)
+
+    @property
+    def T(self):
+        """Transpose of the last two axes (of every matrix in a stack)."""
+        return RationalMatrix(np.swapaxes(self.numerators, -1, -2), self.denominator)
+
+    def __matmul__(self, other):
+        return RationalMatrix(integer_matmul(self.numerators, other.numerators), self.denominator * other.denominator)
+
+    def __add__(self, other):
+        denominator = lcm(self.denominator, other.denominator)
+        numerators = integer_add(
+            self.numerators, other.numerators, denominator // self.denominator, denominator // other.denominator
+        )
+        return RationalMatrix(numerators, denominator)
+
+    def __sub__(self, other):
+        denominator = lcm(self.denominator, other.denominator)
+        numerators = integer_add(
+            self.numerators, other.numerators, denominator // self.denominator, -(denominator // other.denominator)
+        )
+        return RationalMatrix(numerators, denominator)
+
+    def __neg__(self):
+        return RationalMatrix(integer_add(self.numerators, self.numerators, -1, 0), self.denominator)
+
+    def to_fractions(self):
+        """Return the entries as nested lists of Fractions, each reduced to lowest terms."""
+        return _nested_fractions(self.numerators.tolist(), self.denominator)
+
+
+def _to_fraction(value):
+    if isinstance(value, float):
+        return Fraction(repr(value))
+    if isinstance(value, str):
+        try:
+            return Fraction(value.strip())
+        except (ValueError, ZeroDivisionError):
+            raise ValueError(f"Invalid input: {value}")
+    if isinstance(value, np.floating):
+        return Fraction(repr(float(value)))
+    if isinstance(value, np.integer):
+        return Fraction(int(value))
+    return Fraction(value)
+
+
+def _nested_fractions(values, denominator):
+    if isinstance(values, list):
+        return [_nested_fractions(value, denominator) for value in values]
+    return Fraction(int(values), denominator)
@@ -0,0 +1,180 @@
+"""Persistent SQLite cache for slow symbolic results (eigenvectors, diagonalization, n^A).
+
+Results are keyed by a canonical hash of the matrix, the operation name and its
+parameters, and stored pickled. Every entry carries a version stamp made of the
+operation's algorithm version and the sympy version, so changing either one
+invalidates old results. The file is bounded in size: the least recently used
+entries are evicted first.
+
+The cache file may live on a volume shared between machines. Results are
+unpickled when read, so only point it at a location writable by trusted users.
+Set LINALG_RESULT_CACHE to a file path to move the cache, or to an empty string
+to disable it.
+"""
+import functools
+import os
+import pickle
+import sqlite3
+import time
+
+import sympy as sp
+
+from factorization_cache import matrix_key
+
+
+# Default size bound of the cache file contents
+DEFAULT_MAX_BYTES = 256 * 1024 * 1024
+
+# Bump when the table layout or the key format changes
+SCHEMA_VERSION = 1
+
+# How long to wait for another process holding the database lock, in seconds
+LOCK_TIMEOUT = 30
+
+
+def default_path():
+    path = os.environ.get("LINALG_RESULT_CACHE")
+    if path is not None:
+        return path or None
+    return os.path.join(os.path.expanduser("~"), ".cache", "linear-algebra-project", "results.sqlite")
+
+
+class ResultCache:
+    """A size-bounded, versioned key/value store of pickled results in SQLite."""
+
+    def __init__(self, path, max_bytes=DEFAULT_MAX_BYTES):
+        self.path = path
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        self.connection = sqlite3.connect(path, timeout=LOCK_TIMEOUT)
+        with self.connection:
+            self.connection.execute(
+                "CREATE TABLE IF NOT EXISTS meta (name TEXT PRIMARY KEY, value TEXT NOT NULL)"
+            )
+            row = self.connection.execute("SELECT value FROM meta WHERE name = 'schema'").fetchone()
+            if row is None or int(row[0]) != SCHEMA_VERSION:
+                self.connection.execute("DROP TABLE IF EXISTS results")
+                self.connection.execute(
+                    "INSERT OR REPLACE INTO meta (name, value) VALUES ('schema', ?)", (str(SCHEMA_VERSION),)
+                )
+            self.connection.execute(
+                """CREATE TABLE IF NOT EXISTS results (
+                    key TEXT PRIMARY KEY,
+                    version TEXT NOT NULL,
+                    value BLOB NOT NULL,
+                    size INTEGER NOT NULL,
+                    last_used REAL NOT NULL
+                )"""
+            )
+            self.connection.execute("CREATE INDEX IF NOT EXISTS results_last_used ON results (last_used)")
+
+    def get(self, key, version):
+        """Return (True, value) for a stored result with a matching version, else (False, None)."""
+        row = self.connection.execute("SELECT version, value FROM results WHERE key = ?", (key,)).fetchone()
+        if row is None or row[0] != version:
+            self.misses += 1
+            return False, None
+        try:
+            value = pickle.loads(row[1])
+        except Exception:
+            # Written by an incompatible library version; recompute it
+            self.misses += 1
+            return False, None
+        self.hits += 1
+        with self.connection:
+            self.connection.execute("UPDATE results SET last_used = ? WHERE key = ?", (time.time(), key))
+        return True, value
+
+    def put(self, key, version, value):
+        data = pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+        if len(data) > self.max_bytes:
+            return
+        with self.connection:
+            self.connection.execute(
+                "INSERT OR REPLACE INTO results (key, version, value, size, last_used) VALUES (?, ?, ?, ?, ?)",
+                (key, version, data, len(data), time.time()),
+            )
+            self._evict()
+
+    def _evict(self):
+        (total,) = self.connection.execute("SELECT COALESCE(SUM(size), 0) FROM results").fetchone()
+        if total <= self.max_bytes:
+            return
+        # Drop the least recently used entries until the total fits again
+        for key, size in self.connection.execute("SELECT key, size FROM results ORDER BY last_used").fetchall():
+            self.connection.execute("DELETE FROM results WHERE key = ?", (key,))
+            total -= size
+            if total <= self.max_bytes:
+                break
+
+    def clear(self):
+        with self.connection:
+            self.connection.execute("DELETE FROM results")
+
+    def stats(self):
+        entries, total = self.connection.execute("SELECT COUNT(*), COALESCE(SUM(size), 0) FROM results").fetchone()
+        return {"hits": self.hits, "misses": self.misses, "entries": entries, "bytes": total}
+
+    def close(self):
+        self.connection.close()
+
+
+_default_cache = None
+
+
+def default_cache():
+    """Open the shared cache on first use; return None if it is disabled or unavailable."""
+    global _default_cache
+    if _default_cache is None:
+        path = default_path()
+        if path is None:
+            return None
+        try:
+            _default_cache = ResultCache(path)
+        except (OSError, sqlite3.Error):
+            return None
+    return _default_cache
+
+
+def result_key(operation, matrix, params):
+    """Build the cache key from the operation, a canonical hash of the matrix and the parameters."""
+    return f"{operation}:{matrix_key(matrix)}:{params!r}"
+
+
+def persistent_result(operation, version):
+    """Cache the results of `function(matrix, *params)` across sessions.
+
+    `matrix` is a 2D list of exact rationals (Fraction or sympy Rational), so the
+    same matrix typed as "0.5" or "1/2" shares one entry. Bump `version` whenever
+    the algorithm behind `operation` changes. Cache failures never stop the
+    computation; the result is then simply not stored.
+    """
+    def decorator(function):
+        @functools.wraps(function)
+        def wrapper(matrix, *params):
+            cache = default_cache()
+            if cache is None:
+                return function(matrix, *params)
+
+            key = result_key(operation, matrix, params)
+            stamp = f"{version}:sympy-{sp.__version__}"
+            try:
+                found, value = cache.get(key, stamp)
+                if found:
+                    return value
+            except sqlite3.Error:
+                return function(matrix, *params)
+
+            value = function(matrix, *params)
+            try:
+                cache.put(key, stamp, value)
+            except (sqlite3.Error, pickle.PicklingError, TypeError):
+                pass
+            return value
+
+        return wrapper
+
+    return decorator
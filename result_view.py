@@ -0,0 +1,230 @@
+"""A read-only result matrix drawn on a canvas, one screenful at a time.
+
+Only the cells in the viewport are drawn, by a fixed pool of canvas text items
+that is re-pointed at other cells while scrolling, so a 1000x1000 result costs
+as much to show as a 15x8 one. Entries are formatted when they first scroll into
+view and kept in an LRU cache. Copy and Export read the backing matrix itself
+(a NumPy array, MatrixView, sympy Matrix, RationalMatrix or 2D list) at full
+precision, not the formatted cells.
+"""
+import tkinter as tk
+import tkinter.font as tkfont
+from collections import OrderedDict
+from fractions import Fraction
+from tkinter import filedialog, messagebox
+
+from lazy_import import LazyModule
+from matrix_grid import format_cell
+from numeric_backend import format_number
+
+# Only needed to export .npy files
+np = LazyModule("numpy")
+
+
+# Cells visible at once before the view starts scrolling
+MAX_VISIBLE_ROWS = 15
+MAX_VISIBLE_COLS = 8
+
+# Formatted cells kept in the cache (a few screenfuls)
+FORMAT_CACHE_SIZE = 4096
+
+# Results with at most this many cells are scanned for the widest entry; larger ones are sampled
+WIDTH_SCAN_CELLS = 2500
+
+# Widest column, in characters; longer entries are cut off with an ellipsis (Copy has them in full)
+MAX_CELL_CHARS = 24
+
+
+def matrix_shape(matrix):
+    shape = getattr(matrix, "shape", None)
+    if shape is not None:
+        return tuple(shape)
+    rows = len(matrix)
+    return rows, len(matrix[0]) if rows else 0
+
+
+def matrix_entry(matrix, row, col):
+    """One entry of any supported result type; a RationalMatrix entry becomes a Fraction."""
+    if hasattr(matrix, "numerators"):
+        return Fraction(int(matrix.numerators[row, col]), matrix.denominator)
+    if isinstance(matrix, (list, tuple)):
+        return matrix[row][col]
+    return matrix[row, col]
+
+
+def matrix_lines(matrix, delimiter="\t"):
+    """Yield the rows as delimited text at full precision, straight from the backing data."""
+    rows, cols = matrix_shape(matrix)
+    for i in range(rows):
+        yield delimiter.join(format_cell(matrix_entry(matrix, i, j)) for j in range(cols))
+
+
+def matrix_to_text(matrix, delimiter="\t"):
+    return "\n".join(matrix_lines(matrix, delimiter))
+
+
+def export_matrix(path, matrix):
+    """Save a result as .npy (float arrays only), .csv, or tab-separated text."""
+    if path.lower().endswith(".npy"):
+        dtype = getattr(matrix, "dtype", None)
+        if dtype is None or dtype.kind not in "iufc":
+            raise ValueError("Only float results can be saved as .npy; use .csv to keep exact values.")
+        np.save(path, matrix)
+        return
+    delimiter = "," if path.lower().endswith(".csv") else "\t"
+    with open(path, "w") as file:
+        for line in matrix_lines(matrix, delimiter):
+            file.write(line + "\n")
+
+
+class CellFormatter:
+    """Format cells on demand, keeping the most recently used ones."""
+
+    def __init__(self, matrix, format_value=format_number, cache_size=FORMAT_CACHE_SIZE):
+        self.matrix = matrix
+        self.format_value = format_value
+        self.cache = OrderedDict()
+        self.cache_size = cache_size
+        self.formatted = 0
+
+    def text(self, row, col):
+        key = (row, col)
+        text = self.cache.get(key)
+        if text is not None:
+            self.cache.move_to_end(key)
+            return text
+        text = self.format_value(matrix_entry(self.matrix, row, col))
+        self.formatted += 1
+        self.cache[key] = text
+        if len(self.cache) > self.cache_size:
+            self.cache.popitem(last=False)
+        return text
+
+    def width(self, rows, cols, sample_rows, sample_cols):
+        """Characters needed by the widest cell: of all of them for small results, else of the first screen."""
+        if rows * cols > WIDTH_SCAN_CELLS:
+            rows, cols = min(rows, sample_rows), min(cols, sample_cols)
+        widest = max((len(self.text(i, j)) for i in range(rows) for j in range(cols)), default=1)
+        return min(widest, MAX_CELL_CHARS)
+
+
+def clip(text, chars):
+    return text if len(text) <= chars else text[:chars - 1] + "…"
+
+
+class MatrixResultView:
+    """A scrollable, read-only view of a result matrix, with Copy and Export buttons."""
+
+    def __init__(
+        self,
+        master,
+        matrix,
+        format_value=format_number,
+        font=("Courier", 14),
+        bg="#2c3e50",
+        fg="white",
+        visible_rows=MAX_VISIBLE_ROWS,
+        visible_cols=MAX_VISIBLE_COLS,
+        pad=16,
+    ):
+        self.matrix = matrix
+        self.rows, self.cols = matrix_shape(matrix)
+        self.cells = CellFormatter(matrix, format_value)
+        self.visible_rows = min(self.rows, visible_rows)
+        self.visible_cols = min(self.cols, visible_cols)
+
+        self.frame = tk.Frame(master, bg=bg)
+        measure = tkfont.Font(font=font)
+        self.chars = self.cells.width(self.rows, self.cols, self.visible_rows + 1, self.visible_cols + 1)
+        self.cell_width = measure.measure("0" * self.chars) + pad
+        self.cell_height = measure.metrics("linespace") + pad // 2
+        self.margin = pad // 2
+
+        self.canvas = tk.Canvas(
+            self.frame,
+            width=max(self.visible_cols * self.cell_width, 1),
+            height=max(self.visible_rows * self.cell_height, 1),
+            scrollregion=(0, 0, self.cols * self.cell_width, self.rows * self.cell_height),
+            xscrollincrement=self.cell_width,
+            yscrollincrement=self.cell_height,
+            bg=bg,
+            highlightthickness=0,
+        )
+        self.canvas.grid(row=0, column=0)
+
+        if self.rows > self.visible_rows:
+            y_scrollbar = tk.Scrollbar(self.frame, orient="vertical", command=self.canvas.yview)
+            y_scrollbar.grid(row=0, column=1, sticky="ns")
+            self.canvas.configure(yscrollcommand=lambda *args: self._on_scroll(y_scrollbar, *args))
+        if self.cols > self.visible_cols:
+            x_scrollbar = tk.Scrollbar(self.frame, orient="horizontal", command=self.canvas.xview)
+            x_scrollbar.grid(row=1, column=0, sticky="ew")
+            self.canvas.configure(xscrollcommand=lambda *args: self._on_scroll(x_scrollbar, *args))
+
+        # One spare row and column so partially scrolled cells are still drawn
+        self.pool = [
+            self.canvas.create_text(0, 0, text="", anchor="ne", font=font, fill=fg)
+            for _ in range(min(self.rows, self.visible_rows + 1) * min(self.cols, self.visible_cols + 1))
+        ]
+        self.canvas.bind("<MouseWheel>", lambda e: self._scroll_rows(-1 if e.delta > 0 else 1))
+        self.canvas.bind("<Button-4>", lambda e: self._scroll_rows(-1))
+        self.canvas.bind("<Button-5>", lambda e: self._scroll_rows(1))
+
+        buttons = tk.Frame(self.frame, bg=bg)
+        buttons.grid(row=2, column=0, columnspan=2, pady=(5, 0))
+        tk.Button(buttons, text="Copy", command=self.copy, font=("Arial", 12)).pack(side="left", padx=5)
+        tk.Button(buttons, text="Export", command=self.export, font=("Arial", 12)).pack(side="left", padx=5)
+
+        self.layout_pending = False
+        self._layout()
+
+    # Geometry management is forwarded to the outer frame
+    def grid(self, **kwargs):
+        self.frame.grid(**kwargs)
+
+    def pack(self, **kwargs):
+        self.frame.pack(**kwargs)
+
+    def copy(self):
+        """Put the whole matrix on the clipboard as tab-separated text."""
+        self.frame.clipboard_clear()
+        self.frame.clipboard_append(matrix_to_text(self.matrix))
+
+    def export(self):
+        path = filedialog.asksaveasfilename(
+            defaultextension=".csv",
+            filetypes=[("CSV", "*.csv"), ("Tab-separated text", "*.tsv *.txt"), ("NumPy array", "*.npy")],
+        )
+        if not path:
+            return
+        try:
+            export_matrix(path, self.matrix)
+        except (OSError, ValueError) as e:
+            messagebox.showerror("Error", f"Could not export the result: {e}")
+
+    def _scroll_rows(self, step):
+        if self.rows > self.visible_rows:
+            self.canvas.yview_scroll(step, "units")
+
+    def _on_scroll(self, scrollbar, first, last):
+        scrollbar.set(first, last)
+        # Coalesce bursts of scroll events into one redraw
+        if not self.layout_pending:
+            self.layout_pending = True
+            self.canvas.after_idle(self._layout)
+
+    def _layout(self):
+        """Point the pooled text items at the cells in the current viewport."""
+        self.layout_pending = False
+        first_row = max(0, int(self.canvas.canvasy(0) // self.cell_height))
+        first_col = max(0, int(self.canvas.canvasx(0) // self.cell_width))
+        pool_cols = min(self.cols, self.visible_cols + 1)
+        for index, item in enumerate(self.pool):
+            row = first_row + index // pool_cols
+            col = first_col + index % pool_cols
+            if row >= self.rows or col >= self.cols:
+                self.canvas.itemconfigure(item, state="hidden")
+                continue
+            # Right-aligned in the cell, so columns of numbers line up
+            self.canvas.coords(item, (col + 1) * self.cell_width - self.margin, row * self.cell_height)
+            self.canvas.itemconfigure(item, text=clip(self.cells.text(row, col), self.chars), state="normal")
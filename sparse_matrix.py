@@ -0,0 +1,348 @@
+"""Sparse matrices and fill-reducing elimination.
+
+A SparseMatrix keeps one {column: value} dict per row (dictionary of keys, row by
+row), so memory and work follow the number of nonzeros instead of n^2. Entries
+are either exact Fractions or floats.
+
+Elimination picks pivots Markowitz style: the pivot a_ij minimizes
+(r_i - 1) * (c_j - 1), where r_i and c_j count the nonzeros of its row and column,
+which bounds the fill-in each step can create. Float pivots must also be at least
+PIVOT_THRESHOLD times the largest entry of their column, for stability. RREF,
+null space and column space must keep the columns in order, so they only choose
+the sparsest acceptable row within each column.
+"""
+import heapq
+import math
+from fractions import Fraction
+
+from lazy_import import LazyModule
+from matrix_structure import permutation_sign
+from numeric_backend import scientific_notation
+
+# Imported on first use, so image.py opens without waiting for NumPy
+np = LazyModule("numpy")
+
+
+# Matrices with at most this fraction of nonzeros are worth handling sparsely
+SPARSE_DENSITY = 0.1
+
+# Float pivots must be at least this fraction of the largest entry in their column
+PIVOT_THRESHOLD = 0.1
+
+# Float entries this small relative to the largest entry are treated as zero
+FLOAT_TOLERANCE = 1e-12
+
+
+class SparseMatrix:
+    """A rows x cols matrix stored as one {column: value} dict per row."""
+
+    def __init__(self, rows, cols, row_entries=None, exact=True):
+        self.rows = rows
+        self.cols = cols
+        self.row_entries = row_entries if row_entries is not None else [{} for _ in range(rows)]
+        self.exact = exact
+
+    @classmethod
+    def from_dense(cls, matrix, exact=True):
+        """Build from a 2D list of numbers, keeping only the nonzeros."""
+        convert = Fraction if exact else float
+        row_entries = [{j: convert(value) for j, value in enumerate(row) if value != 0} for row in matrix]
+        return cls(len(matrix), len(matrix[0]) if matrix else 0, row_entries, exact)
+
+    @classmethod
+    def from_strings(cls, rows, exact=True):
+        """Build from a 2D list of strings (a grid), parsing only the nonzero entries."""
+        row_entries = []
+        for row in rows:
+            entries = {}
+            for j, text in enumerate(row):
+                text = text.strip()
+                if text in ("0", "0.0", "-0"):
+                    continue
+                try:
+                    value = Fraction(text) if exact else float(Fraction(text))
+                except (ValueError, ZeroDivisionError):
+                    raise ValueError(f"Invalid input: {text}")
+                if value != 0:
+                    entries[j] = value
+            row_entries.append(entries)
+        return cls(len(rows), len(rows[0]) if rows else 0, row_entries, exact)
+
+    @classmethod
+    def from_array(cls, array, exact=None):
+        """Build from a 2D NumPy array as returned by the import paths (numbers or string tokens).
+
+        Numeric arrays are scanned for nonzeros in C; a memory-mapped .npy file is
+        read row by row, so it never has to fit in memory as a dense Python list.
+        """
+        rows, cols = array.shape
+        if array.dtype.kind in "US":
+            return cls.from_strings(array.tolist(), exact=True if exact is None else exact)
+        if exact is None:
+            exact = array.dtype.kind in "iub"
+        row_entries = []
+        for row in array:
+            (indices,) = np.nonzero(row)
+            values = row[indices].tolist()
+            if exact:
+                values = [Fraction(repr(value)) if isinstance(value, float) else Fraction(value) for value in values]
+            else:
+                values = [float(value) for value in values]
+            row_entries.append(dict(zip(indices.tolist(), values)))
+        return cls(rows, cols, row_entries, exact)
+
+    @classmethod
+    def from_grid(cls, rows, exact=True):
+        """Build from grid strings or an array from the import paths."""
+        if getattr(rows, "dtype", None) is not None:
+            return cls.from_array(rows, exact)
+        return cls.from_strings(rows, exact)
+
+    @property
+    def nnz(self):
+        return sum(len(entries) for entries in self.row_entries)
+
+    @property
+    def density(self):
+        return self.nnz / (self.rows * self.cols) if self.rows and self.cols else 0.0
+
+    def __getitem__(self, index):
+        i, j = index
+        return self.row_entries[i].get(j, Fraction(0) if self.exact else 0.0)
+
+    def to_csr(self):
+        """Return (indptr, indices, data) in compressed sparse row form."""
+        indptr = [0]
+        indices = []
+        data = []
+        for entries in self.row_entries:
+            for j in sorted(entries):
+                indices.append(j)
+                data.append(entries[j])
+            indptr.append(len(indices))
+        return indptr, indices, data
+
+    def to_dense(self):
+        zero = Fraction(0) if self.exact else 0.0
+        return [[entries.get(j, zero) for j in range(self.cols)] for entries in self.row_entries]
+
+    def copy(self):
+        return SparseMatrix(self.rows, self.cols, [dict(entries) for entries in self.row_entries], self.exact)
+
+
+def is_sparse_enough(rows):
+    """Return True if grid strings (or an imported array) have at most SPARSE_DENSITY nonzeros."""
+    if getattr(rows, "dtype", None) is not None and rows.dtype.kind not in "US":
+        return rows.size > 0 and np.count_nonzero(rows) <= SPARSE_DENSITY * rows.size
+    zeros = ("0", "0.0", "-0", "")
+    total = sum(len(row) for row in rows)
+    nonzeros = sum(1 for row in rows for text in row if text.strip() not in zeros)
+    return total > 0 and nonzeros <= SPARSE_DENSITY * total
+
+
+class _Elimination:
+    """Working copy of a sparse matrix with a column index, for in-place elimination."""
+
+    def __init__(self, matrix, track_counts=False):
+        self.exact = matrix.exact
+        self.row_entries = [dict(entries) for entries in matrix.row_entries]
+        self.column_rows = [set() for _ in range(matrix.cols)]
+        for i, entries in enumerate(self.row_entries):
+            for j in entries:
+                self.column_rows[j].add(i)
+        largest = max((abs(value) for entries in self.row_entries for value in entries.values()), default=0)
+        self.tolerance = 0 if self.exact else FLOAT_TOLERANCE * largest
+        # Lazy heap of (column count, column); stale entries are skipped when popped
+        self.heap = None
+        if track_counts:
+            self.heap = [(len(rows), j) for j, rows in enumerate(self.column_rows) if rows]
+            heapq.heapify(self.heap)
+
+    def _changed(self, column):
+        if self.heap is not None:
+            heapq.heappush(self.heap, (len(self.column_rows[column]), column))
+
+    def retire(self, row):
+        """Drop a pivoted row from the column index, so counts only cover active rows."""
+        for j in self.row_entries[row]:
+            self.column_rows[j].discard(row)
+            self._changed(j)
+
+    def acceptable_rows(self, column, candidates):
+        """Rows allowed as pivot in `column`: any nonzero when exact, large enough when float."""
+        if self.exact:
+            return candidates
+        largest = max(abs(self.row_entries[i][column]) for i in candidates)
+        return [i for i in candidates if abs(self.row_entries[i][column]) >= PIVOT_THRESHOLD * largest]
+
+    def eliminate(self, pivot_row, column, targets):
+        """Subtract multiples of the pivot row from `targets` to clear `column`."""
+        pivot_entries = self.row_entries[pivot_row]
+        pivot = pivot_entries[column]
+        for i in targets:
+            if i == pivot_row:
+                continue
+            entries = self.row_entries[i]
+            factor = entries[column] / pivot
+            for j, value in pivot_entries.items():
+                new = entries.get(j, 0) - factor * value
+                if j == column or new == 0 or abs(new) <= self.tolerance:
+                    if j in entries:
+                        del entries[j]
+                        self.column_rows[j].discard(i)
+                        self._changed(j)
+                else:
+                    if j not in entries:
+                        self.column_rows[j].add(i)
+                        self._changed(j)
+                    entries[j] = new
+
+
+def _markowitz_pivots(matrix):
+    """Eliminate with Markowitz pivoting; returns the (row, column) and value of each pivot, in order."""
+    work = _Elimination(matrix, track_counts=True)
+    pivoted_columns = set()
+    pivots = []
+    values = []
+
+    while True:
+        # Search the (up to) 4 columns with the fewest active nonzeros, as Markowitz search usually does
+        columns = []
+        while work.heap and len(columns) < 4:
+            count, column = heapq.heappop(work.heap)
+            if count and count == len(work.column_rows[column]) and column not in pivoted_columns and column not in columns:
+                columns.append(column)
+        if not columns:
+            break
+
+        best = None
+        for column in columns:
+            candidates = list(work.column_rows[column])
+            for i in work.acceptable_rows(column, candidates):
+                cost = (len(work.row_entries[i]) - 1) * (len(candidates) - 1)
+                if best is None or cost < best[0]:
+                    best = (cost, i, column)
+        _, pivot_row, pivot_column = best
+        for column in columns:
+            if column != pivot_column:
+                heapq.heappush(work.heap, (len(work.column_rows[column]), column))
+
+        values.append(work.row_entries[pivot_row][pivot_column])
+        work.eliminate(pivot_row, pivot_column, list(work.column_rows[pivot_column]))
+        work.retire(pivot_row)
+        pivots.append((pivot_row, pivot_column))
+        pivoted_columns.add(pivot_column)
+    return pivots, values
+
+
+def _determinant(matrix, pivots, values):
+    if len(pivots) < matrix.rows:
+        return Fraction(0) if matrix.exact else 0.0
+    # det(A) = sign of the row -> column pivot assignment times the product of pivots
+    assignment = [0] * matrix.rows
+    for row, column in pivots:
+        assignment[row] = column
+    sign = permutation_sign(assignment)
+    if matrix.exact:
+        product = Fraction(1)
+        for value in values:
+            product *= value
+        return sign * product
+
+    product = sign * math.prod(values)
+    if product != 0 and math.isfinite(product):
+        return product
+    # The product left the float range: report it in scientific notation from log10|det|
+    negative = sum(value < 0 for value in values) % 2 == 1
+    log10_magnitude = math.fsum(math.log10(abs(value)) for value in values)
+    return scientific_notation(-sign if negative else sign, log10_magnitude)
+
+
+def markowitz_eliminate(matrix):
+    """Gaussian elimination with Markowitz pivoting; returns (rank, pivots, determinant).
+
+    `pivots` lists the (row, column) of each pivot in elimination order. The
+    determinant is None for non-square matrices. A float determinant outside the
+    float64 range is returned as a string in scientific notation.
+    """
+    pivots, values = _markowitz_pivots(matrix)
+    determinant = _determinant(matrix, pivots, values) if matrix.rows == matrix.cols else None
+    return len(pivots), pivots, determinant
+
+
+def float_determinant(matrix):
+    """Return (determinant, pivot ratio) of a square float SparseMatrix.
+
+    The pivot ratio, the largest pivot magnitude over the smallest, is a cheap
+    estimate of the condition number (it is the condition number of a diagonal
+    matrix); it is infinite when the elimination finds the matrix singular.
+    """
+    if matrix.rows != matrix.cols:
+        raise ValueError("Determinant is only defined for square matrices!")
+    pivots, values = _markowitz_pivots(matrix)
+    if len(pivots) < matrix.rows:
+        return 0.0, math.inf
+    magnitudes = [abs(value) for value in values]
+    ratio = max(magnitudes) / min(magnitudes) if magnitudes else 1.0
+    return _determinant(matrix, pivots, values), ratio
+
+
+def rank(matrix):
+    return markowitz_eliminate(matrix)[0]
+
+
+def determinant(matrix):
+    if matrix.rows != matrix.cols:
+        raise ValueError("Determinant is only defined for square matrices!")
+    return markowitz_eliminate(matrix)[2]
+
+
+def rref(matrix):
+    """Return (RREF as a SparseMatrix, pivot columns) by sparse Gauss-Jordan elimination."""
+    work = _Elimination(matrix)
+    unused_rows = set(range(matrix.rows))
+    pivot_rows = []
+    pivot_columns = []
+
+    for column in range(matrix.cols):
+        candidates = [i for i in work.column_rows[column] if i in unused_rows]
+        if not candidates:
+            continue
+        # Within the column, the sparsest acceptable row creates the least fill-in
+        pivot_row = min(work.acceptable_rows(column, candidates), key=lambda i: len(work.row_entries[i]))
+        entries = work.row_entries[pivot_row]
+        pivot = entries[column]
+        for j in entries:
+            entries[j] /= pivot
+        work.eliminate(pivot_row, column, list(work.column_rows[column]))
+        unused_rows.discard(pivot_row)
+        pivot_rows.append(pivot_row)
+        pivot_columns.append(column)
+
+    # Pivot rows in column order, then the zero rows
+    ordered = [work.row_entries[i] for i in pivot_rows] + [{} for _ in range(matrix.rows - len(pivot_rows))]
+    return SparseMatrix(matrix.rows, matrix.cols, ordered, matrix.exact), tuple(pivot_columns)
+
+
+def nullspace(matrix):
+    """Return a null space basis (one vector per free column), as dense lists."""
+    reduced, pivots = rref(matrix)
+    zero = Fraction(0) if matrix.exact else 0.0
+    one = Fraction(1) if matrix.exact else 1.0
+    pivot_set = set(pivots)
+    basis = []
+    for free in (c for c in range(matrix.cols) if c not in pivot_set):
+        vector = [zero] * matrix.cols
+        vector[free] = one
+        for i, pivot in enumerate(pivots):
+            value = reduced.row_entries[i].get(free)
+            if value is not None:
+                vector[pivot] = -value
+        basis.append(vector)
+    return basis
+
+
+def columnspace(matrix):
+    """Return a column space basis: the pivot columns of A, as dense lists."""
+    _, pivots = rref(matrix)
+    return [[matrix[i, c] for i in range(matrix.rows)] for c in pivots]
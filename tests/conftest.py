@@ -0,0 +1,13 @@
+import pytest
+
+import result_cache
+
+
+@pytest.fixture(autouse=True)
+def result_cache_in_tmp_path(tmp_path, monkeypatch):
+    """Keep the persistent result cache of every test in its own temporary directory, never in ~/.cache."""
+    monkeypatch.setenv("LINALG_RESULT_CACHE", str(tmp_path / "results.sqlite"))
+    monkeypatch.setattr(result_cache, "_default_cache", None)
+    yield
+    if result_cache._default_cache is not None:
+        result_cache._default_cache.close()
@@ -0,0 +1,68 @@
+from fractions import Fraction
+
+import numpy as np
+import pytest
+
+import benchmark
+
+
+@pytest.mark.parametrize("kind", benchmark.MATRIX_KINDS)
+def test_matrices_are_reproducible(kind):
+    matrix = benchmark.make_matrix(kind, 6, seed=4)
+    assert matrix == benchmark.make_matrix(kind, 6, seed=4)
+    assert matrix != benchmark.make_matrix(kind, 6, seed=5)
+    assert np.linalg.matrix_rank(np.array(benchmark.as_fractions(matrix), dtype=float)) == 6
+
+
+def test_kinds_have_the_promised_entries():
+    assert isinstance(benchmark.make_matrix("rational", 3)[0][0], Fraction)
+    assert isinstance(benchmark.make_matrix("float", 3)[0][0], float)
+    structured = np.array(benchmark.make_matrix("structured", 8))
+    assert np.array_equal(structured, np.triu(structured))
+
+
+def test_backends_agree_on_the_determinant():
+    matrix = benchmark.make_matrix("rational", 5)
+    values = {}
+    for name in ("laplace", "sympy.det", "engine.det", "dynamic.det", "numpy.det"):
+        function, prepare, _ = benchmark.BACKENDS[name]
+        result = function(prepare(matrix))
+        values[name] = float(result[0] if isinstance(result, tuple) else result)
+    assert max(values.values()) == pytest.approx(min(values.values()))
+
+
+def test_scaling_exponent_of_a_cubic_series():
+    sizes = [16, 32, 64, 128]
+    assert benchmark.scaling_exponent(sizes, [1e-6 * size ** 3 for size in sizes]) == pytest.approx(3)
+    # Timings under the noise floor are left out
+    assert benchmark.scaling_exponent([2, 4], [1e-7, 2e-7]) is None
+
+
+def test_laplace_series_stops_at_its_largest_size():
+    results = list(benchmark.run_series("laplace", "integer", [2, 4, 8, 16], repeats=1))
+    assert [result["size"] for result in results] == [2, 4, 8]
+    assert all(result["seconds"] > 0 and result["peak_bytes"] > 0 for result in results)
+
+
+def test_regressions_are_flagged_against_the_baseline():
+    report = benchmark.run_benchmarks(["numpy.det", "couple.AxB"], ["float", "integer"], [2, 4], repeats=1)
+    assert len(report["results"]) == 8 and len(report["scaling"]) == 4
+    assert benchmark.compare(report, report) == []
+
+    baseline = {"results": [dict(result) for result in report["results"]]}
+    slow = dict(report["results"][0], seconds=1.0, peak_bytes=10 ** 6)
+    baseline["results"][0].update(seconds=0.1, peak_bytes=10 ** 5)
+    messages = benchmark.compare({"results": [slow]}, baseline)
+    assert len(messages) == 2 and "1s, was 0.1s" in messages[0] and "peak" in messages[1]
+
+
+def test_a_case_that_runs_too_long_is_stopped():
+    runner = benchmark.CaseRunner(timeout=0.5)
+    try:
+        with pytest.raises(TimeoutError):
+            runner.run("laplace", "integer", 8, repeats=50)
+        # A fresh child process takes the next case
+        seconds, _ = runner.run("numpy.det", "float", 4, repeats=1)
+        assert seconds < 0.5
+    finally:
+        runner.close()
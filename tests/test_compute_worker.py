@@ -0,0 +1,95 @@
+import threading
+import time
+
+import pytest
+
+import dynamic_operations
+from compute_worker import BackgroundWorker, JobCancelled
+
+
+class FakeRoot:
+    """Stands in for Tk: `after` callbacks are queued and run by `run_until`."""
+
+    def __init__(self):
+        self.pending = []
+
+    def after(self, delay_ms, callback, *args):
+        self.pending.append((callback, args))
+
+    def run_until(self, predicate, timeout=30):
+        deadline = time.monotonic() + timeout
+        while not predicate():
+            assert time.monotonic() < deadline, "timed out waiting for the worker"
+            if self.pending:
+                callback, args = self.pending.pop(0)
+                callback(*args)
+            time.sleep(0.005)
+
+
+@pytest.fixture
+def worker():
+    progress = []
+    worker = BackgroundWorker(FakeRoot(), on_progress=lambda message, elapsed: progress.append(message))
+    worker.progress = progress
+    yield worker
+    worker.shutdown()
+
+
+def submit(worker, function, args, **kwargs):
+    outcome = {}
+    worker.submit(
+        function.__name__, function, args,
+        on_done=lambda result: outcome.setdefault("done", result),
+        on_error=lambda error: outcome.setdefault("error", error),
+        on_stats=lambda stats: outcome.setdefault("stats", stats),
+        **kwargs,
+    )
+    return outcome
+
+
+def test_result_and_stats_come_back_on_the_event_loop(worker):
+    outcome = submit(worker, dynamic_operations.determinant, ([["1", "2"], ["3", "4"]], "exact"))
+    assert worker.busy
+    worker.root.run_until(lambda: outcome)
+    assert outcome["done"][0] == -2 and "compute" in outcome["stats"]
+    assert not worker.busy and worker.progress[-1] == "determinant: done"
+
+
+def test_errors_are_pickled_back(worker):
+    outcome = submit(worker, dynamic_operations.inverse, ([["1", "2"], ["2", "4"]], "exact"))
+    worker.root.run_until(lambda: "error" in outcome)
+    assert isinstance(outcome["error"], dynamic_operations.OperationError)
+    assert worker.progress[-1] == "inverse: failed"
+
+    # An unpicklable result becomes an error instead of breaking the protocol
+    outcome = submit(worker, threading.Lock, ())
+    worker.root.run_until(lambda: "error" in outcome)
+    assert "pickle" in str(outcome["error"])
+
+
+def test_cancel_kills_the_worker_and_the_next_job_gets_a_fresh_one(worker):
+    outcome = submit(worker, time.sleep, (30,))
+    process = worker.process
+    worker.cancel()
+    assert isinstance(outcome["error"], JobCancelled) and str(outcome["error"]) == "Cancelled"
+    assert process.poll() is not None and worker.process is None and not worker.busy
+
+    outcome = submit(worker, dynamic_operations.transpose, ([["1", "2"]],))
+    worker.root.run_until(lambda: outcome)
+    assert outcome["done"].shape == (2, 1)
+
+
+def test_new_job_supersedes_the_running_one(worker):
+    first = submit(worker, time.sleep, (30,))
+    second = submit(worker, dynamic_operations.determinant, ([["5"]], "exact"))
+    assert str(first["error"]) == "Superseded by a new job"
+    worker.root.run_until(lambda: second)
+    assert second["done"][0] == 5
+
+
+def test_time_budget(worker):
+    outcome = submit(worker, time.sleep, (30,), time_budget=0.2)
+    started = time.monotonic()
+    worker.root.run_until(lambda: outcome)
+    assert str(outcome["error"]) == "Time budget exceeded" and time.monotonic() - started < 10
+    assert worker.progress[-1] == "sleep: time budget exceeded"
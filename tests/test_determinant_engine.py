@@ -0,0 +1,159 @@
+import random
+from fractions import Fraction
+
+import pytest
+import sympy as sp
+
+from determinant_engine import (
+    LAPLACE_MAX_SIZE,
+    MODULAR_POOL_MIN_SIZE,
+    MODULAR_PRIME_START,
+    determinant,
+    determinant_bareiss,
+    determinant_minor_expansion,
+    determinant_mod_p,
+    determinant_modular,
+    determinant_modular_integer,
+    determinant_recursive,
+    is_prime,
+    word_primes,
+)
+
+
+def random_matrix(rng, size, rational=False, bound=20):
+    if rational:
+        return [[Fraction(rng.randint(-bound, bound), rng.randint(1, bound)) for _ in range(size)] for _ in range(size)]
+    return [[Fraction(rng.randint(-bound, bound)) for _ in range(size)] for _ in range(size)]
+
+
+def sympy_determinant(matrix):
+    value = sp.Matrix([[sp.Rational(v.numerator, v.denominator) for v in row] for row in matrix]).det()
+    return Fraction(int(value.p), int(value.q))
+
+
+@pytest.mark.parametrize("size", range(1, 13))
+@pytest.mark.parametrize("rational", [False, True])
+def test_bareiss_matches_sympy(size, rational):
+    rng = random.Random(size * 2 + rational)
+    for _ in range(5):
+        matrix = random_matrix(rng, size, rational)
+        assert determinant_bareiss(matrix) == sympy_determinant(matrix)
+
+
+def test_bareiss_singular_matrices():
+    rng = random.Random(1)
+    for size in range(2, 8):
+        matrix = random_matrix(rng, size)
+        matrix[-1] = [2 * value for value in matrix[0]]
+        assert determinant_bareiss(matrix) == 0
+    assert determinant_bareiss([[0, 0], [0, 0]]) == 0
+    assert determinant_bareiss([[1, 2, 3], [0, 0, 0], [4, 5, 6]]) == 0
+
+
+def test_bareiss_zero_pivot_needs_row_swap():
+    assert determinant_bareiss([[0, 1], [1, 0]]) == -1
+    assert determinant_bareiss([[0, 0, 1], [0, 1, 0], [1, 0, 0]]) == -1
+    assert determinant_bareiss([[0, 2, 1], [3, 0, 0], [0, 0, 4]]) == -24
+
+
+def test_bareiss_edge_sizes():
+    assert determinant_bareiss([]) == 1
+    assert determinant_bareiss([[Fraction(-7, 3)]]) == Fraction(-7, 3)
+    with pytest.raises(ValueError):
+        determinant_bareiss([[1, 2], [3, 4], [5, 6]])
+
+
+def test_bareiss_large_entries_stay_exact():
+    rng = random.Random(7)
+    matrix = random_matrix(rng, 10, bound=10 ** 30)
+    assert determinant_bareiss(matrix) == sympy_determinant(matrix)
+
+
+@pytest.mark.parametrize("size", range(1, 7))
+def test_laplace_matches_bareiss(size):
+    rng = random.Random(100 + size)
+    matrix = random_matrix(rng, size, rational=True)
+    assert determinant_recursive(matrix) == determinant_bareiss(matrix)
+    assert determinant(matrix, method="laplace") == determinant_bareiss(matrix)
+
+
+def test_laplace_size_limit():
+    size = LAPLACE_MAX_SIZE + 1
+    with pytest.raises(ValueError):
+        determinant([[int(i == j) for j in range(size)] for i in range(size)], method="laplace")
+
+
+def test_unknown_method():
+    with pytest.raises(ValueError):
+        determinant([[1]], method="gauss")
+
+
+@pytest.mark.parametrize("size", [1, 2, 5, 9, 14])
+def test_modular_matches_bareiss(size):
+    rng = random.Random(200 + size)
+    for rational in (False, True):
+        matrix = random_matrix(rng, size, rational)
+        assert determinant_modular(matrix, workers=1) == determinant_bareiss(matrix)
+
+
+def test_modular_needs_several_primes():
+    # |det| is far beyond one 62-bit prime, so the CRT has to combine many residues
+    rng = random.Random(3)
+    matrix = random_matrix(rng, 8, bound=10 ** 40)
+    rows = [[int(value) for value in row] for row in matrix]
+    assert abs(determinant_bareiss(matrix)) > 2 ** 200
+    assert determinant_modular_integer(rows, workers=1) == determinant_bareiss(matrix)
+
+
+def test_modular_signs_and_singular():
+    assert determinant_modular_integer([[0, 1], [1, 0]], workers=1) == -1
+    assert determinant_modular_integer([[-5]], workers=1) == -5
+    assert determinant_modular_integer([[1, 2], [2, 4]], workers=1) == 0
+    assert determinant_modular_integer([], workers=1) == 1
+
+
+def test_modular_process_pool():
+    rng = random.Random(4)
+    matrix = random_matrix(rng, MODULAR_POOL_MIN_SIZE, bound=5)
+    assert determinant_modular(matrix, workers=2) == determinant_bareiss(matrix)
+
+
+def test_determinant_mod_p():
+    rng = random.Random(5)
+    p = word_primes(1)[0]
+    for size in range(1, 8):
+        rows = [[rng.randint(-100, 100) for _ in range(size)] for _ in range(size)]
+        expected = determinant_bareiss([[Fraction(v) for v in row] for row in rows])
+        assert determinant_mod_p(rows, p) == expected % p
+        assert determinant_mod_p(rows, 7) == expected % 7
+
+
+def test_word_primes_are_prime():
+    primes = word_primes(5)
+    assert primes == sorted(primes, reverse=True)
+    assert all(p < MODULAR_PRIME_START and sp.isprime(p) for p in primes)
+    assert [n for n in range(100) if is_prime(n)] == list(sp.primerange(100))
+
+
+@pytest.mark.parametrize("size", range(0, 9))
+def test_minor_expansion_matches_bareiss(size):
+    rng = random.Random(300 + size)
+    matrix = random_matrix(rng, size, rational=True)
+    assert determinant_minor_expansion(matrix) == determinant_bareiss(matrix)
+
+
+def test_minor_expansion_symbolic_entries():
+    x, y = sp.symbols("x y")
+    matrix = [[x, 1, 0], [y, x, 1], [0, y, x]]
+    expected = sp.Matrix(matrix).det()
+    assert sp.expand(determinant_minor_expansion(matrix) - expected) == 0
+
+
+def test_minor_expansion_reuses_minors():
+    size = 10
+    rng = random.Random(8)
+    stats = {}
+    determinant_minor_expansion(random_matrix(rng, size), stats=stats)
+    # Each of the 2^n - 1 column subsets is expanded at most once
+    assert stats["minors_computed"] <= 2 ** size - 1
+    assert stats["minors_reused"] > 0
@@ -0,0 +1,73 @@
+import math
+import random
+from fractions import Fraction
+
+import mpmath
+import numpy as np
+import pytest
+
+from exponential_engine import expm, scalar_power, scalar_power_digits
+
+
+def mpmath_expm(a, dps=40):
+    with mpmath.workdps(dps):
+        result = mpmath.expm(mpmath.matrix(a.tolist()))
+        return np.array([[float(result[i, j]) for j in range(result.cols)] for i in range(result.rows)])
+
+
+@pytest.mark.parametrize("scale", [1e-3, 0.1, 0.5, 1.0, 2.0, 5.0, 20.0])
+def test_expm_matches_mpmath(scale):
+    rng = np.random.default_rng(int(scale * 1000))
+    for size in (1, 2, 4, 7):
+        a = rng.standard_normal((size, size))
+        a *= scale / max(np.linalg.norm(a, 1), 1e-300)
+        result, degree, squarings = expm(a)
+        expected = mpmath_expm(a)
+        assert np.allclose(result, expected, rtol=1e-12, atol=1e-14 * np.abs(expected).max())
+
+
+def test_expm_degree_and_squarings():
+    _, degree, squarings = expm(np.eye(3) * 1e-3)
+    assert (degree, squarings) == (3, 0)
+    _, degree, squarings = expm(np.eye(3) * 40)
+    assert degree == 13 and squarings > 0
+
+
+def test_expm_known_values():
+    # Rotation generator: exp(t J) is a rotation by t
+    t = 0.75
+    result, _, _ = expm(np.array([[0.0, -t], [t, 0.0]]))
+    assert np.allclose(result, [[math.cos(t), -math.sin(t)], [math.sin(t), math.cos(t)]], rtol=0, atol=1e-15)
+    # Nilpotent: exp(N) = I + N + N^2/2
+    result, _, _ = expm(np.array([[0.0, 1.0, 2.0], [0.0, 0.0, 3.0], [0.0, 0.0, 0.0]]))
+    assert np.allclose(result, [[1, 1, 3.5], [0, 1, 3], [0, 0, 1]], rtol=0, atol=1e-14)
+    assert expm(np.zeros((0, 0)))[0].shape == (0, 0)
+
+
+@pytest.mark.parametrize("scalar", ["e", "pi", Fraction(2), Fraction(1, 3)])
+def test_scalar_power_matches_mpmath(scalar):
+    rng = random.Random(str(scalar))
+    matrix = [[Fraction(rng.randint(-6, 6), rng.randint(1, 3)) for _ in range(3)] for _ in range(3)]
+    result, note = scalar_power([[float(v) for v in row] for row in matrix], scalar)
+    log_n = {"e": 1, "pi": mpmath.log(mpmath.pi)}.get(scalar)
+    if log_n is None:
+        log_n = mpmath.log(mpmath.mpf(scalar.numerator) / scalar.denominator)
+    expected = mpmath_expm(np.array([[float(v) for v in row] for row in matrix]) * float(log_n))
+    assert np.allclose(result, expected, rtol=1e-11)
+    assert note.startswith("float64 Padé")
+
+
+@pytest.mark.filterwarnings("ignore:overflow:RuntimeWarning")
+def test_scalar_power_overflow():
+    with pytest.raises(OverflowError):
+        scalar_power([[1000.0]], "e")
+
+
+def test_scalar_power_digits():
+    digits = 50
+    result = scalar_power_digits([[Fraction(1)]], "e", digits)
+    with mpmath.workdps(digits + 10):
+        assert result == [[mpmath.nstr(mpmath.e, digits)]]
+    result = scalar_power_digits([[Fraction(1, 2), Fraction(0)], [Fraction(0), Fraction(2)]], Fraction(4), 30)
+    assert result[0][0] == "2.0" and mpmath.mpf(result[1][1]) == 16
+    assert mpmath.mpf(result[0][1]) == 0
@@ -0,0 +1,85 @@
+import random
+from fractions import Fraction
+
+import pytest
+import sympy as sp
+
+from factorization_cache import Factorization, FactorizationCache, SingularMatrixError, matrix_key
+
+
+def random_matrix(rng, rows, cols, bound=9):
+    return [[Fraction(rng.randint(-bound, bound), rng.randint(1, 3)) for _ in range(cols)] for _ in range(rows)]
+
+
+def to_sympy(matrix):
+    return sp.Matrix([[sp.Rational(v.numerator, v.denominator) for v in row] for row in matrix])
+
+
+def to_fractions(sympy_matrix):
+    return [[Fraction(int(v.p), int(v.q)) for v in row] for row in sympy_matrix.tolist()]
+
+
+@pytest.mark.parametrize("shape", [(1, 1), (2, 2), (3, 5), (5, 3), (6, 6), (8, 8)])
+def test_factorization_matches_sympy(shape):
+    rng = random.Random(sum(shape))
+    for _ in range(5):
+        matrix = random_matrix(rng, *shape)
+        # Make some inputs rank deficient
+        if shape[0] > 1 and rng.random() < 0.5:
+            matrix[-1] = [a + b for a, b in zip(matrix[0], matrix[1 % shape[0]])]
+        factorization = Factorization(matrix)
+        expected = to_sympy(matrix)
+        expected_rref, expected_pivots = expected.rref()
+
+        assert factorization.rank == expected.rank()
+        assert factorization.pivots == expected_pivots
+        assert factorization.rref == to_fractions(expected_rref)
+        assert factorization.columnspace() == [[row[c] for row in matrix] for c in expected_pivots]
+        for vector in factorization.nullspace():
+            assert expected * sp.Matrix(vector) == sp.zeros(shape[0], 1)
+        assert len(factorization.nullspace()) == shape[1] - expected.rank()
+
+        if shape[0] == shape[1]:
+            assert factorization.determinant() == to_fractions(sp.Matrix([[expected.det()]]))[0][0]
+            if expected.det() != 0:
+                assert factorization.inverse() == to_fractions(expected.inv())
+            else:
+                with pytest.raises(SingularMatrixError):
+                    factorization.inverse()
+
+
+def test_non_square():
+    factorization = Factorization([[1, 2, 3], [4, 5, 6]])
+    with pytest.raises(ValueError):
+        factorization.determinant()
+    with pytest.raises(SingularMatrixError):
+        factorization.inverse()
+
+
+def test_zero_matrix():
+    factorization = Factorization([[0, 0], [0, 0]])
+    assert factorization.rank == 0
+    assert factorization.determinant() == 0
+    assert factorization.columnspace() == []
+    assert factorization.nullspace() == [[1, 0], [0, 1]]
+
+
+def test_matrix_key_ignores_how_entries_are_written():
+    assert matrix_key([[Fraction(1, 2), Fraction(2)]]) == matrix_key([[Fraction(2, 4), Fraction(4, 2)]])
+    assert matrix_key([[Fraction(1), Fraction(2)]]) != matrix_key([[Fraction(1)], [Fraction(2)]])
+
+
+def test_cache_hits_and_eviction():
+    cache = FactorizationCache()
+    matrix = [[1, 2], [3, 4]]
+    first = cache.get(matrix)
+    assert cache.get([["1", "2"], ["3", "4"]]) is first
+    assert cache.stats()["hits"] == 1 and cache.stats()["misses"] == 1
+
+    # A cache that only fits one factorization evicts the least recently used one
+    small = FactorizationCache(max_bytes=first.estimated_bytes())
+    small.get(matrix)
+    small.get([[5, 6], [7, 8]])
+    assert small.stats()["evictions"] == 1
+    assert small.stats()["entries"] == 1
+    assert small.stats()["bytes"] <= small.max_bytes
@@ -0,0 +1,97 @@
+import json
+import os
+import pstats
+import subprocess
+import sys
+
+import numpy as np
+import pytest
+
+import compute_worker
+import dynamic_operations
+import instrumentation
+from instrumentation import OperationTrace, TraceLog, measure_call, phase
+
+
+def test_parse_and_compute_are_split():
+    rows = [[str(value) for value in row] for row in np.random.default_rng(0).integers(-9, 9, (30, 30))]
+    stats = {}
+    value, note = measure_call(dynamic_operations.determinant, (rows, "exact"), stats)
+    assert note.startswith("exact") and value != 0
+    assert stats["parse"] > 0 and stats["compute"] > 0
+    assert stats["peak_bytes"] > 0
+
+
+def test_nested_phases_are_counted_once():
+    def job():
+        with phase("parse"):
+            with phase("parse"):
+                sum(range(10 ** 5))
+        return "done"
+
+    stats = {}
+    assert measure_call(job, (), stats, trace_memory=False) == "done"
+    assert "peak_bytes" not in stats
+    assert 0 < stats["parse"] and stats["compute"] < stats["parse"]
+    # Outside a measured call the phases cost nothing and record nothing
+    with phase("parse"):
+        pass
+    assert instrumentation._active is None
+
+
+def test_stats_survive_an_error(tmp_path):
+    stats = {}
+    path = tmp_path / "profiles" / "inverse.prof"
+    with pytest.raises(dynamic_operations.OperationError):
+        measure_call(dynamic_operations.inverse, ([["1", "2"], ["2", "4"]], "exact"), stats, profile_path=str(path))
+    assert "compute" in stats and stats["profile"] == str(path)
+    assert pstats.Stats(str(path)).total_calls > 0
+
+
+def test_trace_summary_and_log(tmp_path, monkeypatch):
+    trace = OperationTrace("Determinant", [["1", "2"], ["3", "4"]])
+    trace.add("read", 0.002)
+    trace.merge({"parse": 0.01, "compute": 0.5, "peak_bytes": 3 * 1024 * 1024})
+    with trace.phase("render"):
+        pass
+    trace.note_result((-2, "exact: small matrix"))
+    assert trace.summary().startswith("Determinant 2x2 text: done; read 2 ms, parse 10 ms, compute 500 ms, render 0 ms")
+    assert trace.summary().endswith("peak 3.0 MiB")
+
+    monkeypatch.setenv("LINALG_TRACE_FILE", str(tmp_path / "live.jsonl"))
+    log = TraceLog(max_traces=2)
+    for _ in range(3):
+        log.append(trace)
+    assert len(log) == 2
+    assert log.export(str(tmp_path / "export.jsonl")) == 2
+    records = [json.loads(line) for line in open(tmp_path / "live.jsonl")]
+    assert len(records) == 3
+    assert records[0]["backend"] == "exact: small matrix"
+    assert list(records[0]["phases"]) == ["read", "parse", "compute", "render"]
+    assert (records[0]["rows"], records[0]["cols"], records[0]["matrix_type"]) == (2, 2, "text")
+
+
+def test_imported_arrays_are_described_by_dtype():
+    assert OperationTrace("RREF", np.zeros((3, 5))).summary().startswith("RREF 3x5 float64: done")
+
+
+def test_worker_sends_stats_with_the_result():
+    process = subprocess.Popen(
+        [sys.executable, os.path.abspath(compute_worker.__file__)],
+        stdin=subprocess.PIPE, stdout=subprocess.PIPE, cwd=os.path.dirname(os.path.abspath(compute_worker.__file__)),
+    )
+    try:
+        job = (1, "dynamic_operations", "determinant", ([["1", "2"], ["3", "4"]], "exact"), {"trace_memory": True})
+        compute_worker.write_message(process.stdin, job)
+        assert compute_worker.read_message(process.stdout) == ("progress", 1, "computing", None)
+        kind, job_id, (value, _), stats = compute_worker.read_message(process.stdout)
+        assert (kind, job_id, value) == ("done", 1, -2)
+        assert {"parse", "compute", "peak_bytes"} <= set(stats)
+
+        compute_worker.write_message(process.stdin, (2, "dynamic_operations", "inverse", ([["0"]], "exact"), {}))
+        compute_worker.read_message(process.stdout)
+        kind, job_id, error, stats = compute_worker.read_message(process.stdout)
+        assert (kind, job_id) == ("error", 2) and "compute" in stats
+    finally:
+        process.stdin.close()
+        process.wait(timeout=30)
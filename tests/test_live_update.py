@@ -0,0 +1,76 @@
+import random
+from fractions import Fraction
+
+import numpy as np
+import pytest
+import sympy as sp
+
+import dynamic_operations
+from live_update import REFACTOR_INTERVAL, LiveMatrix
+
+
+def to_sympy(matrix):
+    return sp.Matrix([[sp.Rational(v.numerator, v.denominator) for v in row] for row in matrix])
+
+
+def apply_edit(live, row, col, value):
+    if not live.update(row, col, value):
+        live.refactor()
+
+
+@pytest.mark.parametrize("size", [1, 2, 5, 8])
+def test_exact_updates_match_sympy(size):
+    rng = random.Random(size)
+    matrix = [[Fraction(rng.randint(-4, 4)) for _ in range(size)] for _ in range(size)]
+    live = LiveMatrix(matrix)
+    for _ in range(60):
+        # Small integers make singular matrices, and edits out of them, common
+        apply_edit(live, rng.randrange(size), rng.randrange(size), Fraction(rng.randint(-3, 3), rng.randint(1, 2)))
+        expected = to_sympy(live.matrix)
+        assert live.determinant == expected.det()
+        assert live.rank == expected.rank()
+        if expected.det() != 0:
+            assert to_sympy(live.inverse) == expected.inv()
+        else:
+            assert live.inverse is None
+
+
+def test_edit_that_makes_the_matrix_singular():
+    live = LiveMatrix([[Fraction(2), Fraction(1)], [Fraction(4), Fraction(3)]])
+    assert live.update(1, 1, Fraction(2))
+    assert (live.determinant, live.rank, live.inverse) == (0, 1, None)
+    assert live.updates == 0
+    # Nothing to update from a singular matrix
+    assert not live.update(0, 0, Fraction(5))
+
+
+def test_float_updates_match_numpy():
+    rng = np.random.default_rng(0)
+    size = 40
+    live = LiveMatrix(rng.standard_normal((size, size)) + size * np.eye(size), exact=False)
+    refactors = 0
+    for _ in range(2 * REFACTOR_INTERVAL):
+        row, col = rng.integers(size, size=2)
+        if not live.update(row, col, float(rng.standard_normal())):
+            live.refactor()
+            refactors += 1
+        assert live.determinant == pytest.approx(np.linalg.det(live.matrix), rel=1e-8)
+        assert np.allclose(live.inverse, np.linalg.inv(live.matrix), atol=1e-10)
+    assert refactors == 1
+    assert live.updates <= REFACTOR_INTERVAL
+
+
+def test_rectangular_matrix_only_tracks_rank():
+    live = LiveMatrix([[Fraction(1), Fraction(2), Fraction(3)], [Fraction(2), Fraction(4), Fraction(6)]])
+    assert (live.rank, live.determinant, live.inverse) == (1, None, None)
+    apply_edit(live, 1, 2, Fraction(7))
+    assert live.rank == 2
+
+
+def test_live_matrix_job_picks_the_backend():
+    live, note = dynamic_operations.live_matrix([["1", "2"], ["3", "4"]], "auto")
+    assert live.exact and note.startswith("exact") and live.determinant == -2
+    live, note = dynamic_operations.live_matrix([["1.5", "2"], ["3", "4"]], "auto")
+    assert not live.exact and note.startswith("float64") and live.determinant == pytest.approx(0)
+    with pytest.raises(ValueError):
+        live.parse("1/")
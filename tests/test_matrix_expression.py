@@ -0,0 +1,81 @@
+import numpy as np
+import pytest
+
+from matrix_expression import Leaf, Product, chain_order, evaluate_expression, parse
+from rational_matrix import RationalMatrix
+
+
+def random_values(rng, shapes):
+    return {name: rng.standard_normal(shape) for name, shape in shapes.items()}
+
+
+def test_chain_order_textbook_example():
+    # Cormen et al., section 15.2: the optimum is ((A1(A2A3))((A4A5)A6))
+    cost, split = chain_order([30, 35, 15, 5, 10, 20, 25])
+    assert cost == 15125
+    assert split[0][5] == 2
+
+
+@pytest.mark.parametrize("text, expected", [
+    ("(A*B*C + D)^T * E", lambda v: (v["A"] @ v["B"] @ v["C"] + v["D"]).T @ v["E"]),
+    ("E^T*(A*B*C + D) - E^T*(C^T*B^T*A^T)^T", lambda v: v["E"].T @ v["D"]),
+    ("-A*-B*C - D + C", lambda v: v["A"] @ v["B"] @ v["C"] - v["D"] + v["C"]),
+    ("(D' - C^T^T')'", lambda v: v["D"] - v["C"]),
+    ("A @ (B @ A)^T'", lambda v: v["A"] @ v["B"] @ v["A"]),
+])
+def test_expressions_match_numpy(text, expected):
+    rng = np.random.default_rng(len(text))
+    values = random_values(rng, {"A": (60, 4), "B": (4, 60), "C": (60, 3), "D": (60, 3), "E": (60, 2)})
+    result, _ = evaluate_expression(text, values)
+    assert np.allclose(result, expected(values))
+
+
+def test_mismatched_chain_needs_far_fewer_multiplications():
+    rng = np.random.default_rng(1)
+    values = random_values(rng, {"A": (400, 2), "B": (2, 400), "C": (400, 2)})
+    node, left_to_right = parse("A*B*C", {name: value.shape for name, value in values.items()})
+    assert isinstance(node, Product) and node.order() == "(A*(B*C))"
+    assert left_to_right == 400 * 2 * 400 + 400 * 400 * 2
+    assert node.multiplications() * 100 < left_to_right
+
+
+def test_double_negation_keeps_the_chain_flat():
+    node, _ = parse("-A*-B*C", {"A": (2, 3), "B": (3, 4), "C": (4, 2)})
+    assert isinstance(node, Product) and [str(factor) for factor in node.factors] == ["A", "B", "C"]
+
+
+def test_transposes_reach_the_leaves():
+    node, _ = parse("((A*B)^T + C)^T", {"A": (2, 3), "B": (3, 4), "C": (4, 2)})
+    product, leaf = (term for _, term in node.terms)
+    assert [str(factor) for factor in product.factors] == ["A", "B"]
+    assert isinstance(leaf, Leaf) and leaf.transposed
+
+
+def test_inputs_are_not_modified():
+    rng = np.random.default_rng(2)
+    values = random_values(rng, {"A": (3, 3), "B": (3, 3)})
+    copies = {name: value.copy() for name, value in values.items()}
+    result, _ = evaluate_expression("A + B - A*B", values)
+    result[...] = 0
+    for name in values:
+        assert np.array_equal(values[name], copies[name])
+
+
+def test_exact_values():
+    a = RationalMatrix.from_values([["1/2", "1/3"], ["1", "-2"]])
+    b = RationalMatrix.from_values([["3", "1/5"], ["0", "1/7"]])
+    result, _ = evaluate_expression("(A*B)^T - B^T*A^T + A - -A", {"A": a, "B": b})
+    assert result.to_fractions() == (a + a).to_fractions()
+
+
+@pytest.mark.parametrize("text, message", [
+    ("A*A", "Cannot multiply"),
+    ("A+B", "Cannot add"),
+    ("(A*B", "Missing closing"),
+    ("A*B)", "Unexpected"),
+    ("A*F", "Unknown matrix"),
+    ("A*", "ends too early"),
+])
+def test_invalid_expressions(text, message):
+    with pytest.raises(ValueError, match=message):
+        parse(text, {"A": (2, 3), "B": (3, 2)})
@@ -0,0 +1,93 @@
+import tkinter as tk
+
+import numpy as np
+import pytest
+
+from matrix_grid import MAX_MATRIX_SIZE, MAX_VISIBLE_COLS, MAX_VISIBLE_ROWS, MatrixGrid, format_cell
+
+
+@pytest.fixture
+def root():
+    try:
+        root = tk.Tk()
+    except tk.TclError:
+        pytest.skip("no display")
+    yield root
+    root.destroy()
+
+
+def make_grid(root, rows, cols, **kwargs):
+    grid = MatrixGrid(root, rows, cols, **kwargs)
+    grid.pack()
+    root.update_idletasks()
+    return grid
+
+
+def scroll_to(root, grid, row, col):
+    grid.canvas.yview_moveto(row / grid.rows)
+    grid.canvas.xview_moveto(col / grid.cols)
+    grid._layout()
+    root.update_idletasks()
+
+
+def test_size_guard():
+    # Checked before any widget is created
+    with pytest.raises(ValueError, match="Maximum matrix size"):
+        MatrixGrid(None, MAX_MATRIX_SIZE + 1, 1)
+    with pytest.raises(ValueError, match="at least one row"):
+        MatrixGrid(None, 0, 3)
+
+
+def test_format_cell():
+    assert format_cell(np.float64(3.0)) == "3"
+    assert format_cell(0.1) == "0.1"
+    assert format_cell(np.int64(-7)) == "-7"
+    assert format_cell(2.0 ** 60) == repr(2.0 ** 60)
+    assert format_cell("1/3") == "1/3"
+
+
+def test_pool_is_recycled_while_scrolling(root):
+    source = np.arange(1000 * 1000).reshape(1000, 1000)
+    grid = make_grid(root, 1000, 1000)
+    grid.load(source)
+    assert len(grid.pool) == (MAX_VISIBLE_ROWS + 1) * (MAX_VISIBLE_COLS + 1)
+    entries = {entry for entry, _ in grid.pool}
+
+    scroll_to(root, grid, 500, 300)
+    assert {entry for entry, _ in grid.pool} == entries
+    first_row, first_col = grid._first_visible()
+    assert 495 <= first_row <= 505 and 295 <= first_col <= 305
+    assert grid.entry_of_cell[(first_row, first_col)].get() == str(source[first_row, first_col])
+    assert grid.unedited_source() is source
+
+
+def test_edits_survive_scrolling(root):
+    grid = make_grid(root, 200, 200)
+    grid.load(np.zeros((200, 200)))
+    grid.entry_of_cell[(1, 2)].insert(tk.END, "5")
+    scroll_to(root, grid, 150, 150)
+    assert (1, 2) not in grid.entry_of_cell
+    assert grid.get(1, 2) == "05" and grid.unedited_source() is None
+    scroll_to(root, grid, 0, 0)
+    assert grid.entry_of_cell[(1, 2)].get() == "05"
+    assert grid.values()[1][2] == "05" and grid.values()[1][3] == "0"
+
+
+def test_on_edit_reports_only_text_changes(root):
+    edits = []
+    grid = make_grid(root, 50, 50, on_edit=lambda row, col: edits.append((row, col)))
+    grid.load([[str(i + j) for j in range(50)] for i in range(50)])
+    grid[3][4].insert(0, "1")
+    scroll_to(root, grid, 40, 40)
+    scroll_to(root, grid, 0, 0)
+    assert edits == []
+
+    entry = grid.entry_of_cell[(2, 3)]
+    entry.insert(tk.END, "9")
+    entry.delete(0)
+    assert edits == [(2, 3), (2, 3)]
+    # Arrow keys move the focus without changing any text
+    grid._move(entry, 1, 0)
+    entry.icursor(0)
+    assert edits == [(2, 3), (2, 3)]
+    assert grid.get(2, 3) == "9"
@@ -0,0 +1,130 @@
+import random
+from fractions import Fraction
+
+import pytest
+import sympy as sp
+
+from factorization_cache import SingularMatrixError
+from matrix_structure import analyze, determinant, eigenvalues, inverse, permutation_sign, power
+
+
+def to_sympy(matrix):
+    return sp.Matrix([[sp.Rational(v.numerator, v.denominator) for v in row] for row in matrix])
+
+
+def to_fractions(sympy_matrix):
+    return [[Fraction(int(v.p), int(v.q)) for v in row] for row in sympy_matrix.tolist()]
+
+
+def random_entry(rng):
+    return Fraction(rng.randint(-9, 9), rng.randint(1, 3))
+
+
+def banded(rng, size, lower, upper, nonzero_diagonal=True):
+    matrix = [[Fraction(0)] * size for _ in range(size)]
+    for i in range(size):
+        for j in range(max(0, i - lower), min(size, i + upper + 1)):
+            matrix[i][j] = random_entry(rng)
+        if nonzero_diagonal and matrix[i][i] == 0:
+            matrix[i][i] = Fraction(1)
+    return matrix
+
+
+def permutation_matrix(permutation):
+    return [[Fraction(int(permutation[i] == j)) for j in range(len(permutation))] for i in range(len(permutation))]
+
+
+def block_diagonal(blocks):
+    size = sum(len(block) for block in blocks)
+    matrix = [[Fraction(0)] * size for _ in range(size)]
+    start = 0
+    for block in blocks:
+        for i, row in enumerate(block):
+            matrix[start + i][start:start + len(block)] = row
+        start += len(block)
+    return matrix
+
+
+def structured_matrices(seed):
+    rng = random.Random(seed)
+    permutation = list(range(6))
+    rng.shuffle(permutation)
+    dense = lambda size: [[random_entry(rng) for _ in range(size)] for _ in range(size)]
+    return {
+        "diagonal": banded(rng, 6, 0, 0),
+        "upper triangular": banded(rng, 6, 0, 5),
+        "lower triangular": banded(rng, 6, 5, 0),
+        "tridiagonal": banded(rng, 6, 1, 1),
+        "permutation": permutation_matrix(permutation),
+        "block diagonal": block_diagonal([dense(2), dense(3), dense(1)]),
+    }
+
+
+def test_analyze_names():
+    matrices = structured_matrices(0)
+    for name, matrix in matrices.items():
+        assert name in analyze(matrix).name
+    assert analyze(matrices["block diagonal"]).blocks == [(0, 2), (2, 5), (5, 6)]
+    assert analyze([[Fraction(1), Fraction(2)]]).name == "rectangular"
+    assert analyze([[1, 2, 0], [3, 4, 5], [0, 6, 7]]).tridiagonal
+
+
+@pytest.mark.parametrize("seed", range(10))
+def test_determinant_matches_sympy(seed):
+    for name, matrix in structured_matrices(seed).items():
+        value = determinant(matrix, analyze(matrix), dense=lambda block: to_sympy(block).det())
+        assert value == to_sympy(matrix).det(), name
+
+
+@pytest.mark.parametrize("seed", range(10))
+def test_inverse_matches_sympy(seed):
+    for name, matrix in structured_matrices(seed).items():
+        result = inverse(matrix, analyze(matrix))
+        # Only diagonal, permutation and triangular matrices have an inverse kernel
+        assert (result is None) == (name in ("tridiagonal", "block diagonal")), name
+        if result is not None:
+            assert result == to_fractions(to_sympy(matrix).inv()), name
+
+
+def test_inverse_singular_triangular():
+    with pytest.raises(SingularMatrixError):
+        inverse([[1, 2], [0, 0]], analyze([[1, 2], [0, 0]]))
+
+
+@pytest.mark.parametrize("seed", range(10))
+def test_eigenvalues_match_sympy(seed):
+    for name, matrix in structured_matrices(seed).items():
+        values = eigenvalues(matrix, analyze(matrix), dense=lambda block: list(to_sympy(block).eigenvals()))
+        # Tridiagonal and permutation matrices only have a shortcut when they split into blocks
+        assert values is not None or name in ("tridiagonal", "permutation"), name
+        if values is not None:
+            assert sorted(map(complex, values), key=lambda z: (z.real, z.imag)) == pytest.approx(
+                sorted(map(complex, to_sympy(matrix).eigenvals()), key=lambda z: (z.real, z.imag))
+            )
+
+
+@pytest.mark.parametrize("n", [0, 1, 2, 5, 13])
+def test_power_matches_sympy(n):
+    for name, matrix in structured_matrices(n).items():
+        result = power(matrix, analyze(matrix), n, dense=lambda block, k: to_fractions(to_sympy(block) ** k))
+        assert result is not None or name in ("upper triangular", "lower triangular", "tridiagonal"), name
+        if result is not None:
+            assert result == to_fractions(to_sympy(matrix) ** n), name
+
+
+def test_permutation_sign():
+    rng = random.Random(1)
+    for size in range(1, 8):
+        permutation = list(range(size))
+        rng.shuffle(permutation)
+        assert permutation_sign(permutation) == to_sympy(permutation_matrix(permutation)).det()
+
+
+def test_edge_cases():
+    one = [[Fraction(5, 2)]]
+    assert determinant(one, analyze(one)) == Fraction(5, 2)
+    assert inverse(one, analyze(one)) == [[Fraction(2, 5)]]
+    assert power(one, analyze(one), 3) == [[Fraction(125, 8)]]
+    assert analyze([]).square
+    assert power([[1, 2], [3, 4]], analyze([[1, 2], [3, 4]]), -1) is None
+    assert determinant([[1, 2], [3, 4], [5, 6]], analyze([[1, 2], [3, 4], [5, 6]])) is None
@@ -0,0 +1,85 @@
+import math
+
+import numpy as np
+import pytest
+import sympy as sp
+
+import dynamic_operations
+import numeric_backend
+from numeric_backend import UnreliableResult, check_condition, scientific_notation
+
+
+def orthogonal(rng, n):
+    q, _ = np.linalg.qr(rng.standard_normal((n, n)))
+    return q
+
+
+def log10_of(text):
+    """log10 of |x| for a number written as '<mantissa>e<exponent>'."""
+    mantissa, exponent = text.split("e")
+    return math.log10(abs(float(mantissa))) + int(exponent)
+
+
+def test_scientific_notation():
+    assert scientific_notation(1.0, 600.5) == f"{10 ** 0.5:.10g}e+600"
+    assert scientific_notation(-1.0, -589.25) == f"{-(10 ** 0.75):.10g}e-590"
+
+
+@pytest.mark.parametrize("scale, log10_det", [(0.01, -600.0), (10.0, 310.0)])
+def test_determinant_outside_the_float_range(scale, log10_det):
+    # scale * Q has |det| = scale^n and condition number 1
+    n = round(log10_det / math.log10(scale))
+    a = scale * orthogonal(np.random.default_rng(n), n)
+    value, note = numeric_backend.determinant(a)
+    assert isinstance(value, str) and note.startswith("condition number 1.0e+00")
+    assert log10_of(value) == pytest.approx(log10_det, abs=1e-8)
+    assert value.startswith("-") == (np.linalg.slogdet(a)[0] < 0)
+
+
+def test_tiny_determinant_of_decimal_grid_is_not_zero():
+    rng = np.random.default_rng(3)
+    a = np.diag(rng.uniform(0.001, 0.01, 300)) + rng.uniform(-1e-5, 1e-5, (300, 300))
+    rows = [[repr(value) for value in row] for row in a.tolist()]
+    value, note = dynamic_operations.determinant(rows)
+    assert note.startswith("float64 LAPACK: decimal inputs")
+    assert log10_of(value) == pytest.approx(np.linalg.slogdet(a)[1] / math.log(10), abs=1e-8)
+
+
+def test_determinant_in_range_matches_numpy():
+    a = np.random.default_rng(0).standard_normal((20, 20))
+    value, _ = numeric_backend.determinant(a)
+    assert value == pytest.approx(np.linalg.det(a), rel=1e-10)
+
+
+def test_check_condition():
+    assert check_condition(np.eye(3)) == pytest.approx(1.0)
+    with pytest.raises(UnreliableResult):
+        check_condition(np.array([[1.0, 1.0], [1.0, 1.0 + 1e-13]]))
+    with pytest.raises(UnreliableResult):
+        check_condition(np.zeros((2, 2)))
+
+
+def test_ill_conditioned_decimal_matrix_falls_back_to_exact():
+    # A 12x12 Hilbert matrix (condition number ~1e16) with decimal entries
+    hilbert = sp.Matrix(12, 12, lambda i, j: sp.Rational(1, i + j + 1))
+    rows = [[f"{float(hilbert[i, j]):.17g}" for j in range(12)] for i in range(12)]
+    value, note = dynamic_operations.determinant(rows)
+    assert note.startswith("exact: decimal inputs, but condition number")
+    expected = sp.Matrix([[sp.Rational(entry) for entry in row] for row in rows]).det()
+    assert sp.Rational(value.numerator, value.denominator) == expected
+
+
+@pytest.mark.parametrize("eigenvalues", [[3.0, -1.0, 2.5, 0.5, 7.0], [2.0, 2.0, 2.0, -1.0, 5.0], [4.0] * 5])
+def test_symmetric_eigendecomposition(eigenvalues):
+    q = orthogonal(np.random.default_rng(len(set(eigenvalues))), 5)
+    a = q @ np.diag(eigenvalues) @ q.T
+    # Rounding leaves A slightly asymmetric, which is accepted
+    values, p = numeric_backend.symmetric_eigendecomposition(a)
+    assert np.allclose(p.T @ p, np.eye(5), atol=1e-12)
+    assert np.allclose(p @ np.diag(values) @ p.T, a, atol=1e-12)
+    assert np.allclose(values, sorted(eigenvalues))
+
+
+def test_symmetric_eigendecomposition_rejects_asymmetric_input():
+    with pytest.raises(ValueError, match="symmetric"):
+        numeric_backend.symmetric_eigendecomposition(np.array([[1.0, 2.0], [2.001, 1.0]]))
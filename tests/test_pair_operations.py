@@ -0,0 +1,55 @@
+import random
+from fractions import Fraction
+
+import numpy as np
+import pytest
+
+from pair_operations import PAIR_OPERATIONS, apply, result_shape
+from rational_matrix import RationalMatrix
+
+
+# Matrix shapes of A and B that fit each operation
+SHAPES = {"AxB": ((3, 4), (4, 2)), "BxA": ((4, 2), (3, 4)), "A+B": ((3, 3), (3, 3)), "A-B": ((3, 3), (3, 3))}
+
+
+@pytest.mark.parametrize("operation", sorted(PAIR_OPERATIONS))
+@pytest.mark.parametrize("stacked", [(False, False), (False, True), (True, False), (True, True), (True, "one")])
+def test_broadcasting_matches_numpy(operation, stacked):
+    rng = np.random.default_rng(len(operation) + 3 * stacked[0] + 5 * bool(stacked[1]))
+    shape_a, shape_b = SHAPES[operation]
+    a = rng.standard_normal(((37,) if stacked[0] else ()) + shape_a)
+    b_batch = (1,) if stacked[1] == "one" else (37,) if stacked[1] else ()
+    b = rng.standard_normal(b_batch + shape_b)
+    result = apply(operation, a, b, chunk_size=8)
+    assert result.shape == result_shape(operation, a.shape, b.shape)
+    assert np.allclose(result, PAIR_OPERATIONS[operation](a, b))
+
+
+def test_exact_stacks_match_fractions():
+    rng = random.Random(3)
+    a = [[Fraction(rng.randint(-9, 9), rng.randint(1, 6)) for _ in range(3)] for _ in range(2)]
+    stack = [[[Fraction(rng.randint(-9, 9), rng.randint(1, 6)) for _ in range(2)] for _ in range(3)] for _ in range(11)]
+    result = apply("AxB", RationalMatrix.from_values(a), RationalMatrix.from_values(stack), chunk_size=4)
+    for k, b in enumerate(stack):
+        expected = [[sum(a[i][t] * b[t][j] for t in range(3)) for j in range(2)] for i in range(2)]
+        assert result[k].to_fractions() == expected
+
+
+def test_memory_mapped_output(tmp_path):
+    rng = np.random.default_rng(0)
+    a = rng.standard_normal((5, 5))
+    np.save(tmp_path / "b.npy", rng.standard_normal((100, 5, 5)))
+    b = np.load(tmp_path / "b.npy", mmap_mode="r")
+    out = np.lib.format.open_memmap(tmp_path / "out.npy", mode="w+", dtype=np.float64, shape=(100, 5, 5))
+    apply("BxA", a, b, chunk_size=16, out=out)
+    out.flush()
+    assert np.allclose(np.load(tmp_path / "out.npy"), b @ a)
+
+
+def test_incompatible_operands():
+    with pytest.raises(ValueError, match="not compatible"):
+        result_shape("AxB", (2, 3), (2, 3))
+    with pytest.raises(ValueError, match="broadcast"):
+        result_shape("A+B", (4, 2, 2), (3, 2, 2))
+    with pytest.raises(TypeError):
+        apply("A+B", np.zeros((2, 2)), RationalMatrix.from_values([["1", "2"], ["3", "4"]]))
@@ -0,0 +1,90 @@
+import random
+from fractions import Fraction
+
+import pytest
+import sympy as sp
+
+from power_engine import matrix_power
+
+
+def random_matrix(rng, size, rational=False, bound=5):
+    return [
+        [Fraction(rng.randint(-bound, bound), rng.randint(1, 4) if rational else 1) for _ in range(size)]
+        for _ in range(size)
+    ]
+
+
+def to_sympy(matrix):
+    return sp.Matrix([[sp.Rational(v.numerator, v.denominator) for v in row] for row in matrix])
+
+
+def sympy_power(matrix, n):
+    return [[Fraction(int(v.p), int(v.q)) for v in row] for row in (to_sympy(matrix) ** n).tolist()]
+
+
+def sympy_power_mod(matrix, n, modulus):
+    # Square and multiply with sympy integers, reducing after every product
+    reduce = lambda m: m.applyfunc(lambda v: v % modulus)
+    result, base = reduce(sp.eye(len(matrix))), reduce(to_sympy(matrix))
+    while n:
+        if n & 1:
+            result = reduce(result * base)
+        base = reduce(base * base)
+        n >>= 1
+    return [[int(v) for v in row] for row in result.tolist()]
+
+
+@pytest.mark.parametrize("method", ["binary", "cayley-hamilton", "auto"])
+@pytest.mark.parametrize("size", [1, 2, 3, 5])
+def test_power_matches_sympy(method, size):
+    rng = random.Random(size)
+    for n in (0, 1, 2, 7, 64, 129):
+        for rational in (False, True):
+            matrix = random_matrix(rng, size, rational)
+            assert matrix_power(matrix, n, method=method) == sympy_power(matrix, n)
+
+
+@pytest.mark.parametrize("method", ["binary", "cayley-hamilton", "auto"])
+@pytest.mark.parametrize("modulus", [1, 2, 7, 10 ** 9 + 7, 2 ** 64])
+def test_power_mod_m(method, modulus):
+    rng = random.Random(modulus % 1000)
+    for size in (1, 2, 4):
+        for n in (0, 5, 10 ** 6 + 3):
+            matrix = random_matrix(rng, size)
+            assert matrix_power(matrix, n, modulus=modulus, method=method) == sympy_power_mod(matrix, n, modulus)
+
+
+def test_huge_exponent_mod_m_methods_agree():
+    rng = random.Random(11)
+    matrix = random_matrix(rng, 4, rational=True)
+    matrix = [[value if value.denominator % 3 else value * 3 for value in row] for row in matrix]
+    n = 2 ** 300 + 17
+    modulus = 10 ** 9 + 7
+    assert matrix_power(matrix, n, modulus=modulus, method="binary") == matrix_power(
+        matrix, n, modulus=modulus, method="cayley-hamilton"
+    )
+
+
+def test_rational_power_mod_m():
+    # (1/2)^3 mod 7 = 8^(-1) mod 7 = 1
+    assert matrix_power([[Fraction(1, 2)]], 3, modulus=7) == [[1]]
+    with pytest.raises(ValueError):
+        matrix_power([[Fraction(1, 7)]], 3, modulus=7)
+
+
+def test_fibonacci():
+    n = 1000
+    assert matrix_power([[1, 1], [1, 0]], n)[0][1] == sp.fibonacci(n)
+    assert matrix_power([[1, 1], [1, 0]], n, method="cayley-hamilton")[0][1] == sp.fibonacci(n)
+
+
+def test_edge_cases():
+    assert matrix_power([], 5) == []
+    assert matrix_power([[Fraction(3, 2)]], 5, method="cayley-hamilton") == [[Fraction(243, 32)]]
+    assert matrix_power([[0, 0], [0, 0]], 0) == [[1, 0], [0, 1]]
+    with pytest.raises(ValueError):
+        matrix_power([[1]], -1)
+    with pytest.raises(ValueError):
+        matrix_power([[1]], 2, modulus=0)
+    with pytest.raises(ValueError):
+        matrix_power([[1]], 2, method="eigen")
@@ -0,0 +1,113 @@
+import json
+import random
+from fractions import Fraction
+
+import numpy as np
+import pytest
+import sympy as sp
+
+import batch_cli
+import matrix_operations
+from matrix_operations import run_operation
+from rank_engine import DEFAULT_MAX_ERROR, exact_rank, modular_rank, rank, rank_mod_p, ranks
+
+
+def low_rank_matrix(rng, rows, cols, rank_value):
+    left = [[Fraction(rng.randint(-5, 5), rng.randint(1, 3)) for _ in range(rank_value)] for _ in range(rows)]
+    right = [[Fraction(rng.randint(-5, 5), rng.randint(1, 3)) for _ in range(cols)] for _ in range(rank_value)]
+    return [
+        [sum((left[i][t] * right[t][j] for t in range(rank_value)), Fraction(0)) for j in range(cols)]
+        for i in range(rows)
+    ]
+
+
+def sympy_rank(matrix):
+    return sp.Matrix([[sp.Rational(v.numerator, v.denominator) for v in row] for row in matrix]).rank()
+
+
+@pytest.mark.parametrize("seed", range(20))
+def test_modular_and_exact_match_sympy(seed):
+    rng = random.Random(seed)
+    rows, cols = rng.randint(1, 7), rng.randint(1, 7)
+    matrix = low_rank_matrix(rng, rows, cols, rng.randint(0, min(rows, cols)))
+    expected = sympy_rank(matrix)
+    assert rank(matrix, rng=random.Random(seed))[0] == expected
+    assert rank(matrix, "exact")[0] == expected
+    assert exact_rank(matrix) == expected
+
+
+def test_full_rank_is_certain():
+    value, error = modular_rank([["1/2", "1/3"], ["1/4", "1/5"]], rng=random.Random(0))
+    assert (value, error) == (2, 0.0)
+    assert rank([["1", "2"], ["3", "4"]])[1] == "modular: certain"
+
+
+def test_deficient_rank_states_its_error_bound():
+    matrix = np.random.default_rng(0).integers(-100, 100, (12, 12))
+    matrix[-1] = matrix[0] - 3 * matrix[1]
+    value, error = modular_rank(matrix, rng=random.Random(1))
+    assert value == 11 and 0 < error <= DEFAULT_MAX_ERROR
+    value, note = rank(matrix, confirm=True, rng=random.Random(1))
+    assert value == 11 and note == "modular: confirmed by exact elimination"
+
+
+def test_rank_mod_p_drops_when_p_divides_the_determinant():
+    p = 2 ** 31 - 1
+    assert rank_mod_p(np.array([[p, 0], [0, 1]]), p) == 1
+    assert rank_mod_p(np.array([[p + 1, 0], [0, 1]]), p) == 2
+
+
+def test_numeric_tolerance():
+    nearly_singular = [[1.0, 1.0], [1.0, 1.0 + 1e-10]]
+    assert rank(nearly_singular, "numeric")[0] == 2
+    assert rank(nearly_singular, "numeric", tolerance=1e-8) == (1, "numeric: SVD with tolerance 1e-08")
+    # The same matrix as fractions is exactly of full rank
+    assert rank([["1", "1"], ["1", "1.0000000001"]])[0] == 2
+
+
+def test_batches_of_matrices():
+    rng = np.random.default_rng(3)
+    stack = rng.standard_normal((6, 5, 4))
+    stack[::2, :, -1] = stack[::2, :, 0]
+    expected = [int(np.linalg.matrix_rank(matrix)) for matrix in stack]
+    assert [value for value, _ in ranks(stack, "numeric")] == expected
+    integers = rng.integers(-9, 9, (6, 5, 4))
+    integers[::2, :, -1] = 2 * integers[::2, :, 0]
+    assert [value for value, _ in ranks(integers, rng=random.Random(0))] == [3, 4, 3, 4, 3, 4]
+
+
+def test_properties_operation_and_batch_options():
+    rows = [["1/3", "2/3"], ["1/7", "2/7"]]
+    result = run_operation("properties", rows)
+    assert result["rank"] == 1 and result["method"].startswith("modular")
+    result = run_operation("properties", rows, {"mode": "numeric", "tolerance": 1e-12})
+    assert result == {"rank": 1, "result": "The matrix is neither one-to-one nor onto.",
+                      "method": "numeric: SVD with tolerance 1e-12"}
+    records = [(0, rows), (1, [["1", "0"], ["0", "1"]])]
+    results = list(batch_cli.run_batch("properties", records, workers=1, options={"mode": "exact"}))
+    assert [record["result"]["rank"] for record in results] == [1, 2]
+
+
+def test_numeric_batches_share_one_batched_svd(tmp_path, monkeypatch):
+    stack = np.random.default_rng(4).standard_normal((10, 4, 3))
+    stack[::3, :, -1] = stack[::3, :, 0]
+    np.save(tmp_path / "stack.npy", stack)
+    calls = []
+
+    def recording_ranks(matrices, *args, **kwargs):
+        calls.append(matrices.shape)
+        return ranks(matrices, *args, **kwargs)
+
+    monkeypatch.setattr(matrix_operations, "matrix_ranks", recording_ranks)
+    argv = ["properties", str(tmp_path / "stack.npy"), "-o", str(tmp_path / "out.jsonl"), "--workers", "1",
+            "--chunk-size", "8", "--rank-mode", "numeric"]
+    assert batch_cli.main(argv) == 0
+    results = [json.loads(line) for line in open(tmp_path / "out.jsonl")]
+    assert [record["result"]["rank"] for record in results] == [int(np.linalg.matrix_rank(m)) for m in stack]
+    assert calls == [(8, 4, 3), (2, 4, 3)]
+
+    # Mixed shapes are stacked separately, and a bad matrix only fails itself
+    results = matrix_operations.run_operations("properties", [[["1", "2"]], [["1/2"]], [["x"]], [["3", "6"]]],
+                                               {"mode": "numeric"})
+    assert [result["rank"] for result in results[:2] + results[3:]] == [1, 1, 1]
+    assert isinstance(results[2], ValueError)
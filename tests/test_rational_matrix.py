@@ -0,0 +1,79 @@
+import random
+from fractions import Fraction
+
+import numpy as np
+import pytest
+import sympy as sp
+
+from rational_matrix import INT64_LIMIT, RationalMatrix, integer_add, integer_matmul
+
+
+def random_fractions(rng, rows, cols, numerator=9, denominator=9):
+    return [
+        [Fraction(rng.randint(-numerator, numerator), rng.randint(1, denominator)) for _ in range(cols)]
+        for _ in range(rows)
+    ]
+
+
+def to_sympy(matrix):
+    return sp.Matrix([[sp.Rational(v.numerator, v.denominator) for v in row] for row in matrix])
+
+
+def from_sympy(matrix):
+    return [[Fraction(int(v.p), int(v.q)) for v in row] for row in matrix.tolist()]
+
+
+@pytest.mark.parametrize("shape", [(1, 1, 1), (3, 4, 2), (6, 6, 6), (10, 7, 12)])
+def test_products_and_sums_match_sympy(shape):
+    m, k, n = shape
+    rng = random.Random(m * 100 + k * 10 + n)
+    a = random_fractions(rng, m, k)
+    b = random_fractions(rng, k, n)
+    c = random_fractions(rng, m, k)
+    exact_a, exact_b, exact_c = (RationalMatrix.from_values(x) for x in (a, b, c))
+
+    assert (exact_a @ exact_b).to_fractions() == from_sympy(to_sympy(a) * to_sympy(b))
+    assert (exact_a + exact_c).to_fractions() == from_sympy(to_sympy(a) + to_sympy(c))
+    assert (exact_a - exact_c).to_fractions() == from_sympy(to_sympy(a) - to_sympy(c))
+    assert exact_a.T.to_fractions() == from_sympy(to_sympy(a).T)
+
+
+def test_large_denominators_switch_to_bignum():
+    rng = random.Random(7)
+    a = random_fractions(rng, 8, 8, numerator=10**12, denominator=10**9)
+    b = random_fractions(rng, 8, 8, numerator=10**12, denominator=10**9)
+    exact_a = RationalMatrix.from_values(a)
+    assert exact_a.numerators.dtype == object
+    assert (exact_a @ RationalMatrix.from_values(b)).to_fractions() == from_sympy(to_sympy(a) * to_sympy(b))
+
+
+@pytest.mark.parametrize("bits", [20, 31, 40, 62, 200])
+def test_integer_matmul_is_exact(bits):
+    rng = random.Random(bits)
+    limit = 2 ** bits
+    x = np.array([[rng.randint(-limit, limit) for _ in range(9)] for _ in range(5)], dtype=object)
+    y = np.array([[rng.randint(-limit, limit) for _ in range(4)] for _ in range(9)], dtype=object)
+    expected = x.dot(y)
+    if bits <= 62:
+        x, y = x.astype(np.int64), y.astype(np.int64)
+    assert (integer_matmul(x, y) == expected).all()
+
+
+def test_integer_add_does_not_wrap():
+    x = np.array([[INT64_LIMIT, -INT64_LIMIT]], dtype=np.int64)
+    assert integer_add(x, x).tolist() == [[2 * INT64_LIMIT, -2 * INT64_LIMIT]]
+    assert integer_add(x, x, 1, -1).tolist() == [[0, 0]]
+
+
+def test_inputs_are_read_exactly():
+    strings = [[" 1/2", "-3", "0.25"], ["1e2", "2/4", "-7/3"]]
+    expected = [[Fraction(1, 2), Fraction(-3), Fraction(1, 4)], [Fraction(100), Fraction(1, 2), Fraction(-7, 3)]]
+    assert RationalMatrix.from_values(strings).to_fractions() == expected
+    assert RationalMatrix.from_values(np.array([["1/2", "3"]])).to_fractions() == [[Fraction(1, 2), Fraction(3)]]
+    assert RationalMatrix.from_values(np.array([[0.1, 2.0]])).to_fractions() == [[Fraction(1, 10), Fraction(2)]]
+    integers = RationalMatrix.from_values(np.arange(6).reshape(2, 3))
+    assert integers.denominator == 1 and integers.numerators.dtype == np.int64
+    with pytest.raises(ValueError):
+        RationalMatrix.from_values([["1/0"]])
+    with pytest.raises(ValueError):
+        RationalMatrix.from_values([["abc"]])
@@ -0,0 +1,114 @@
+import itertools
+import sqlite3
+from fractions import Fraction
+
+import pytest
+import sympy as sp
+
+import result_cache
+from result_cache import ResultCache, default_cache, persistent_result
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    """Make every timestamp distinct, so the LRU order does not depend on the clock resolution."""
+    ticks = itertools.count(1)
+    monkeypatch.setattr(result_cache.time, "time", lambda: float(next(ticks)))
+
+
+def counted(version=1):
+    calls = []
+
+    @persistent_result("trace", version)
+    def trace(matrix, scale=1):
+        calls.append(matrix)
+        return scale * sum(matrix[i][i] for i in range(len(matrix)))
+
+    return trace, calls
+
+
+def test_hits_and_misses(tmp_path):
+    trace, calls = counted()
+    half = [[Fraction(1, 2), 0], [0, 1]]
+    assert trace(half) == Fraction(3, 2)
+    # The same values written as sympy Rationals share the entry
+    assert trace([[sp.Rational(1, 2), 0], [0, 1]]) == Fraction(3, 2)
+    assert len(calls) == 1
+    assert default_cache().path == str(tmp_path / "results.sqlite")
+    assert default_cache().stats()["hits"] == 1 and default_cache().stats()["misses"] == 1
+
+    # Another matrix or other parameters are other keys
+    assert trace([[Fraction(1, 3), 0], [0, 1]]) == Fraction(4, 3)
+    assert trace(half, 2) == 3
+    assert len(calls) == 3 and default_cache().stats()["entries"] == 3
+
+
+def test_version_change_invalidates():
+    trace, calls = counted(version=1)
+    matrix = [[Fraction(2)]]
+    trace(matrix)
+    trace(matrix)
+    newer, newer_calls = counted(version=2)
+    newer(matrix)
+    newer(matrix)
+    assert len(calls) == 1 and len(newer_calls) == 1
+    # The newer result replaced the old one under the same key
+    assert default_cache().stats()["entries"] == 1
+
+
+def test_least_recently_used_entries_are_evicted_first(tmp_path, clock):
+    value = b"x" * 1000
+    cache = ResultCache(str(tmp_path / "small.sqlite"), max_bytes=3500)
+    for key in "abc":
+        cache.put(key, "v1", value)
+    assert cache.get("a", "v1") == (True, value)
+    cache.put("d", "v1", value)
+    assert cache.get("b", "v1") == (False, None)
+    assert all(cache.get(key, "v1")[0] for key in "acd")
+    cache.put("e", "v1", value)
+    assert cache.get("a", "v1") == (False, None)
+    assert cache.stats()["entries"] == 3 and cache.stats()["bytes"] <= 3500
+    # Anything bigger than the whole cache is not stored
+    cache.put("huge", "v1", b"x" * 4000)
+    assert cache.get("huge", "v1") == (False, None)
+    cache.close()
+
+
+def test_disabled_cache(monkeypatch):
+    monkeypatch.setenv("LINALG_RESULT_CACHE", "")
+    trace, calls = counted()
+    trace([[Fraction(1)]])
+    trace([[Fraction(1)]])
+    assert default_cache() is None and len(calls) == 2
+
+
+def test_corrupt_database_is_not_used(tmp_path):
+    (tmp_path / "results.sqlite").write_bytes(b"not a database" * 100)
+    trace, calls = counted()
+    assert trace([[Fraction(5)]]) == 5
+    assert default_cache() is None and len(calls) == 1
+
+
+def test_corrupt_entry_is_recomputed():
+    trace, calls = counted()
+    trace([[Fraction(5)]])
+    with default_cache().connection as connection:
+        connection.execute("UPDATE results SET value = ?", (b"garbage",))
+    assert trace([[Fraction(5)]]) == 5
+    assert len(calls) == 2
+
+
+def test_locked_database_falls_back_to_computing(monkeypatch):
+    monkeypatch.setattr(result_cache, "LOCK_TIMEOUT", 0.05)
+    trace, calls = counted()
+    trace([[Fraction(7)]])
+    other = sqlite3.connect(default_cache().path)
+    other.execute("BEGIN EXCLUSIVE")
+    try:
+        assert trace([[Fraction(7)]]) == 7
+        assert trace([[Fraction(8)]]) == 8
+    finally:
+        other.rollback()
+        other.close()
+    assert len(calls) == 3
+    assert trace([[Fraction(7)]]) == 7 and len(calls) == 3
@@ -0,0 +1,66 @@
+from fractions import Fraction
+
+import numpy as np
+import pytest
+import sympy as sp
+
+from matrix_import import parse_text
+from matrix_view import MatrixView
+from rational_matrix import RationalMatrix
+from result_view import CellFormatter, MAX_CELL_CHARS, clip, export_matrix, matrix_shape, matrix_to_text
+
+
+@pytest.mark.parametrize("matrix", [
+    np.array([[0.5, 2.0], [-1.0, 1e-20]]),
+    MatrixView.from_rows([[Fraction(1, 2), 2], [-1, Fraction(1, 3)]]),
+    sp.Matrix([[sp.Rational(1, 2), 2], [-1, sp.sqrt(2)]]),
+    RationalMatrix.from_values([["1/2", "2"], ["-1", "1/3"]]),
+    [[1, 2], [3, 4]],
+])
+def test_every_result_type_has_shape_and_text(matrix):
+    assert matrix_shape(matrix) == (2, 2)
+    lines = matrix_to_text(matrix).split("\n")
+    assert len(lines) == 2 and all(len(line.split("\t")) == 2 for line in lines)
+
+
+def test_copied_text_is_full_precision_and_reads_back():
+    array = np.random.default_rng(0).standard_normal((30, 20))
+    assert np.array_equal(parse_text(matrix_to_text(array)), array)
+    exact = RationalMatrix.from_values([["1/3", "2/7"], ["5", "-1/9"]])
+    assert matrix_to_text(exact, ",") == "1/3,2/7\n5,-1/9"
+
+
+def test_formatter_formats_each_cell_once_within_the_cache():
+    array = np.arange(1000 * 1000, dtype=float).reshape(1000, 1000) / 7
+    cells = CellFormatter(array, cache_size=100)
+    for _ in range(3):
+        for i in range(5):
+            for j in range(10):
+                cells.text(i, j)
+    assert cells.formatted == 50
+    # Scrolling far away evicts the oldest cells, keeping the cache bounded
+    for j in range(200):
+        cells.text(999, j)
+    assert len(cells.cache) == 100
+    cells.text(0, 0)
+    assert cells.formatted == 251
+
+
+def test_width_is_sampled_for_large_results():
+    array = np.ones((1000, 1000))
+    array[-1, -1] = 1 / 3
+    cells = CellFormatter(array)
+    assert cells.width(1000, 1000, 16, 9) == 1
+    assert cells.formatted == 16 * 9
+    assert CellFormatter(array[-3:, -3:]).width(3, 3, 16, 9) == len("0.3333333333")
+    assert clip("x" * 40, MAX_CELL_CHARS) == "x" * (MAX_CELL_CHARS - 1) + "…"
+
+
+def test_export(tmp_path):
+    array = np.random.default_rng(1).standard_normal((4, 3))
+    export_matrix(str(tmp_path / "result.npy"), array)
+    assert np.array_equal(np.load(tmp_path / "result.npy"), array)
+    export_matrix(str(tmp_path / "result.csv"), array)
+    assert np.array_equal(parse_text((tmp_path / "result.csv").read_text()), array)
+    with pytest.raises(ValueError):
+        export_matrix(str(tmp_path / "exact.npy"), [[Fraction(1, 3)]])
@@ -0,0 +1,131 @@
+import random
+from fractions import Fraction
+
+import numpy as np
+import pytest
+import sympy as sp
+
+import dynamic_operations
+import sparse_matrix
+from sparse_matrix import SparseMatrix, is_sparse_enough
+
+
+def random_sparse(rng, rows, cols, density=0.15, rational=True):
+    matrix = [[Fraction(0)] * cols for _ in range(rows)]
+    for i in range(rows):
+        for j in range(cols):
+            if rng.random() < density:
+                matrix[i][j] = Fraction(rng.randint(-9, 9), rng.randint(1, 4) if rational else 1)
+    return matrix
+
+
+def to_sympy(matrix):
+    return sp.Matrix([[sp.Rational(v.numerator, v.denominator) for v in row] for row in matrix])
+
+
+@pytest.mark.parametrize("shape", [(1, 1), (5, 5), (8, 12), (12, 8), (20, 20)])
+def test_exact_matches_sympy(shape):
+    rng = random.Random(sum(shape))
+    for density in (0.05, 0.15, 0.3):
+        dense = random_sparse(rng, *shape, density=density)
+        matrix = SparseMatrix.from_dense(dense)
+        expected = to_sympy(dense)
+        expected_rref, expected_pivots = expected.rref()
+
+        assert sparse_matrix.rank(matrix) == expected.rank()
+        if shape[0] == shape[1]:
+            assert sparse_matrix.determinant(matrix) == expected.det()
+        reduced, pivots = sparse_matrix.rref(matrix)
+        assert pivots == expected_pivots
+        assert to_sympy(reduced.to_dense()) == expected_rref
+        nullspace = sparse_matrix.nullspace(matrix)
+        assert len(nullspace) == shape[1] - expected.rank()
+        for vector in nullspace:
+            assert expected * to_sympy([vector]).T == sp.zeros(shape[0], 1)
+        assert sparse_matrix.columnspace(matrix) == [[row[c] for row in dense] for c in expected_pivots]
+
+
+@pytest.mark.parametrize("size", [5, 20, 40])
+def test_float_matches_numpy(size):
+    rng = random.Random(size)
+    dense = random_sparse(rng, size, size, density=0.1)
+    for i in range(size):
+        dense[i][i] += 10
+    array = np.array([[float(v) for v in row] for row in dense])
+    matrix = SparseMatrix.from_array(array)
+    assert not matrix.exact
+    assert sparse_matrix.rank(matrix) == np.linalg.matrix_rank(array)
+    assert sparse_matrix.determinant(matrix) == pytest.approx(np.linalg.det(array), rel=1e-9)
+    reduced, _ = sparse_matrix.rref(matrix)
+    assert np.allclose(reduced.to_dense(), np.eye(size), atol=1e-9)
+
+
+def test_float_rank_deficient():
+    array = np.zeros((6, 6))
+    array[0, 1] = array[1, 2] = 1.0
+    array[2] = array[0] * 0.1 + array[1] * 3.0
+    array[4, 5] = 2.5
+    assert sparse_matrix.rank(SparseMatrix.from_array(array)) == 3
+    assert sparse_matrix.determinant(SparseMatrix.from_array(array)) == 0
+
+
+def test_loading():
+    strings = [["0", "1/2", "0"], ["0.0", "0", "-3"]]
+    matrix = SparseMatrix.from_strings(strings)
+    assert matrix.nnz == 2 and matrix[0, 1] == Fraction(1, 2) and matrix[1, 2] == -3
+    assert SparseMatrix.from_grid(np.array(strings)).to_dense() == matrix.to_dense()
+    integers = SparseMatrix.from_grid(np.array([[0, 2], [0, 0]]))
+    assert integers.exact and integers.to_dense() == [[0, 2], [0, 0]]
+    assert SparseMatrix.from_array(np.array([[0.1, 0.0]]), exact=True)[0, 0] == Fraction(1, 10)
+    assert matrix.to_csr() == ([0, 1, 2], [1, 2], [Fraction(1, 2), Fraction(-3)])
+    with pytest.raises(ValueError):
+        SparseMatrix.from_strings([["x"]])
+
+
+def test_is_sparse_enough():
+    assert is_sparse_enough([["0"] * 10 for _ in range(9)] + [["1"] + ["0"] * 9])
+    assert not is_sparse_enough([["1", "0"], ["0", "1"]])
+    assert is_sparse_enough(np.eye(20))
+    assert not is_sparse_enough(np.ones((3, 3)))
+
+
+def test_markowitz_keeps_arrow_matrix_sparse():
+    # An arrow matrix eliminated in natural order fills in completely; Markowitz pivots on the tips first
+    size = 40
+    dense = [[Fraction(0)] * size for _ in range(size)]
+    for i in range(size):
+        dense[i][i] = Fraction(2)
+        dense[0][i] = dense[i][0] = Fraction(1)
+    dense[0][0] = Fraction(size)
+    matrix = SparseMatrix.from_dense(dense)
+    rank, pivots, value = sparse_matrix.markowitz_eliminate(matrix)
+    assert rank == size and value == to_sympy(dense).det()
+    assert all(row != 0 and column != 0 for row, column in pivots[:-2])
+
+
+def test_float_determinant_outside_the_float_range():
+    value, ratio = sparse_matrix.float_determinant(SparseMatrix.from_array(0.001 * np.eye(200)))
+    assert (value, ratio) == ("1e-600", 1.0)
+    array = -1e4 * np.eye(90)
+    array[0, 1] = 3.0
+    value, _ = sparse_matrix.float_determinant(SparseMatrix.from_array(array))
+    assert value == "1e+360"
+    assert sparse_matrix.determinant(SparseMatrix.from_array(-array[:89, :89])) == "1e+356"
+
+
+def test_sparse_determinant_falls_back_to_exact():
+    rows = [["0"] * 200 for _ in range(200)]
+    for i in range(200):
+        rows[i][i] = "0.001"
+    value, note = dynamic_operations.determinant(rows)
+    assert value == "1e-600" and note.startswith("float64: decimal inputs")
+
+    # Pivot ratio 1e13: float64 cannot be trusted, so the exact answer is shown
+    rows[7][7] = "1e-16"
+    value, note = dynamic_operations.determinant(rows)
+    assert note.startswith("exact: decimal inputs, but pivot ratio 1.0e+13")
+    assert value == Fraction(1, 1000) ** 199 * Fraction(1, 10 ** 16)
+
+    rows[7][7] = "0"
+    value, note = dynamic_operations.determinant(rows)
+    assert value == 0 and note.startswith("exact: decimal inputs, but the matrix is (nearly) singular")
@@ -0,0 +1,82 @@
+import ast
+import json
+import os
+import subprocess
+import sys
+import time
+
+import pytest
+
+import compute_worker
+import lazy_import
+from lazy_import import LazyModule
+
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Imported on first use, never while a window starts
+HEAVY_MODULES = ("sympy", "numpy", "dynamic_operations")
+
+GUI_SCRIPTS = ("DynamicCalculator.py", "DeterminantCalculator.py", "image.py")
+
+
+def startup_imports(script):
+    """The script's top-level import statements (the scripts build their window at import, so are never run here)."""
+    with open(os.path.join(ROOT, script)) as file:
+        tree = ast.parse(file.read())
+    return [ast.unparse(node) for node in tree.body if isinstance(node, (ast.Import, ast.ImportFrom))]
+
+
+def cold_start(statements):
+    """Run the statements in a fresh interpreter; return the heavy modules they loaded."""
+    code = "\n".join([
+        "import json, sys",
+        *statements,
+        f"print(json.dumps([name for name in {HEAVY_MODULES!r} if name in sys.modules]))",
+    ])
+    output = subprocess.run([sys.executable, "-c", code], cwd=ROOT, capture_output=True, text=True, check=True).stdout
+    return json.loads(output)
+
+
+@pytest.mark.parametrize("script", GUI_SCRIPTS)
+def test_window_starts_without_heavy_backends(script):
+    assert cold_start(startup_imports(script)) == []
+
+
+def test_lazy_module_imports_on_first_use():
+    loaded = cold_start([
+        "from lazy_import import LazyModule",
+        "np = LazyModule('numpy')",
+        "assert not np.loaded and 'numpy' not in sys.modules",
+        "assert np.zeros(3).sum() == 0 and np.loaded",
+    ])
+    assert loaded == ["numpy"]
+
+
+def test_warm_up_loads_on_a_thread_after_the_delay():
+    class FakeRoot:
+        def after(self, delay_ms, callback):
+            self.scheduled = delay_ms, callback
+
+    root = FakeRoot()
+    module = LazyModule("json")
+    lazy_import.warm_up(root, module)
+    assert root.scheduled[0] == lazy_import.WARM_UP_DELAY_MS and not module.loaded
+    root.scheduled[1]()
+    deadline = time.monotonic() + 10
+    while not module.loaded and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert module.load() is json and module.dumps([1]) == "[1]"
+
+
+def test_worker_preload_is_answered_as_no_job():
+    worker = compute_worker.BackgroundWorker(root=None)
+    try:
+        worker.preload("dynamic_operations")
+        process, message = worker.messages.get(timeout=30)
+        assert message == ("progress", compute_worker.PRELOAD_JOB_ID, "computing", None)
+        process, (kind, job_id, result, stats) = worker.messages.get(timeout=30)
+        assert (kind, job_id, result) == ("done", compute_worker.PRELOAD_JOB_ID, None)
+        assert not worker.busy
+    finally:
+        worker.shutdown()